@@ -60,6 +60,8 @@ class NOVATerminalInterface:
         self.session_cost = 0.0
         self.session_tokens = 0
         self.voice_enabled = False
+        # Model manager built for a download location NOVA's own doesn't cover
+        self._model_manager = None
         
     def show_welcome(self):
         """Show enhanced welcome message"""
@@ -919,6 +921,30 @@ Recommendation: Leverage cloud models for complex tasks.
             bytes_size /= 1024.0
         return f"{bytes_size:.1f} PB"
     
+    def _get_model_manager(self, models_path: Path):
+        """Model manager for models_path, reusing NOVA's own or the last one built"""
+        core_manager = getattr(self.nova_core, 'model_manager', None)
+        if core_manager is not None and core_manager.models_dir == models_path:
+            return core_manager
+        if self._model_manager is None or self._model_manager.models_dir != models_path:
+            from ..core.model_manager import AdaptiveModelManager
+            self._model_manager = AdaptiveModelManager(models_path)
+        return self._model_manager
+        
+    async def _progress_flusher(self, queue: asyncio.Queue):
+        """Print queued progress messages together, at most every 100ms"""
+        while True:
+            await asyncio.sleep(0.1)
+            self._print_progress_batch(queue)
+            
+    def _print_progress_batch(self, queue: asyncio.Queue):
+        """Print everything waiting in queue with one console.print"""
+        batch = []
+        while not queue.empty():
+            batch.append(queue.get_nowait())
+        if batch:
+            self.console.print('\n'.join(batch), style='dim')
+            
     async def download_models_to_external(self, model_names: str = ""):
         """Download models directly to external drive with full library"""
         import subprocess
@@ -1190,19 +1216,30 @@ Recommendation: Leverage cloud models for complex tasks.
                 self.console.print(f"[dim]Total download size: ~{total_size}GB[/dim]")
                 
                 # Use the model manager for parallel downloads
-                from ..core.model_manager import AdaptiveModelManager
                 models_path = Path(external_path) / 'ollama' / 'models'
-                model_manager = AdaptiveModelManager(models_path)
+                model_manager = self._get_model_manager(models_path)
+                
+                # Workers only queue their messages; one task prints them in batches
+                progress_queue: asyncio.Queue = asyncio.Queue(maxsize=1024)
                 
                 def progress_callback(msg: str):
-                    self.console.print(f"[dim]{msg}[/dim]")
+                    try:
+                        progress_queue.put_nowait(msg)
+                    except asyncio.QueueFull:
+                        # The summary below still reports every model
+                        pass
                 
                 # Run parallel downloads
-                results = await model_manager.download_models_parallel(
-                    models,
-                    max_concurrent=max_concurrent,
-                    progress_callback=progress_callback
-                )
+                flusher = asyncio.create_task(self._progress_flusher(progress_queue))
+                try:
+                    results = await model_manager.download_models_parallel(
+                        models,
+                        max_concurrent=max_concurrent,
+                        progress_callback=progress_callback
+                    )
+                finally:
+                    flusher.cancel()
+                    self._print_progress_batch(progress_queue)
                 
                 # Show results
                 self.console.print("\n[bold]Download Summary:[/bold]")
@@ -254,7 +254,7 @@ class NOVACore:
             'current_directory': os.getcwd(),
             'user_preferences': {
                 'performance_mode': self.user_profile.preferences.performance_mode,
-                'preferred_stack': self.user_profile.preferences.preferred_stack
+                'preferred_stack': list(self.user_profile.preferences.preferred_stack)
             } if self.user_profile else {}
         }
         
@@ -329,7 +329,7 @@ class NOVACore:
             # Initialize company if switching to company mode
             if new_mode == OperationMode.COMPANY and self.company is None:
                 from ..legendary.company.legendary_ventures import LegendaryVentures
-                self.company = LegendaryVentures()
+                self.company = LegendaryVentures(ollama=self.unified_engine.ollama)
                 await self.company.initialize()
                 
             self.logger.info(f"Switched to {mode} mode")
@@ -406,7 +406,7 @@ class NOVACore:
         return {
             'created_at': self.user_profile.created_at.strftime('%Y-%m-%d'),
             'total_interactions': self.user_profile.total_interactions,
-            'preferred_stack': self.user_profile.preferences.preferred_stack,
+            'preferred_stack': list(self.user_profile.preferences.preferred_stack),
             'working_hours': self.user_profile.preferences.working_hours,
             'recent_projects': self.user_profile.recent_projects[-5:],
             'learned_patterns': dict(list(self.user_profile.learned_patterns.items())[:10]),
@@ -435,6 +435,10 @@ class NOVACore:
                 
         # Save session
         await self.save_session()
+        await self.memory.close()
+        
+        # Release pooled Ollama connections (company mode shares this client)
+        await self.unified_engine.ollama.aclose()
         
         self.logger.info("NOVA shutdown complete")
         
@@ -10,6 +10,7 @@ import asyncio
 
 from ..models import StorageConfig, ExternalStorageConfig, InternalStorageConfig
 from ..interfaces import IStorageManager
+from ..memory.lazy_history import entries_before
 
 
 class StorageManager(IStorageManager):
@@ -209,22 +210,30 @@ class StorageManager(IStorageManager):
                                 'size_gb': self._estimate_model_size(model)
                             })
                             
-        # Check old conversation files
-        old_conversations = 0
-        for conv_file in (self.dirs['memory'] / 'conversations').glob('*.json'):
-            if (datetime.now() - datetime.fromtimestamp(conv_file.stat().st_mtime)).days > 90:
-                old_conversations += 1
+        # Check old conversations, from the history index timestamps
+        old_conversations, old_bytes = await asyncio.to_thread(self._count_old_conversations, 90)
                 
         if old_conversations > 100:
             suggestions.append({
                 'type': 'conversations',
                 'name': 'Old conversations',
                 'reason': f'{old_conversations} conversations older than 90 days',
-                'size_mb': old_conversations * 0.1  # Estimate
+                'size_mb': old_bytes / (1024 * 1024)
             })
             
         return suggestions
         
+    def _count_old_conversations(self, days: int) -> Tuple[int, int]:
+        """(count, bytes) of live conversations older than `days` (blocking)"""
+        memory_dir = self.dirs['memory']
+        try:
+            with open(memory_dir / 'user_profile.json', 'r') as f:
+                start = json.load(f).get('history_start', 0)
+        except (FileNotFoundError, json.JSONDecodeError):
+            start = 0
+        cutoff = datetime.now().timestamp() - days * 86400
+        return entries_before(memory_dir / 'history.idx', cutoff, start)
+        
     def _estimate_model_size(self, model_name: str) -> float:
         """Estimate model size in GB"""
         # Size estimates for common models
@@ -10,7 +10,7 @@ from datetime import datetime
 import asyncio
 import re
 
-from ..models import SystemProfile, SystemSpecs, BenchmarkResults, ConfigRecommendation
+from ..models import SystemProfile, Capability, SystemSpecs, BenchmarkResults, ConfigRecommendation
 from ..interfaces import ISystemAnalyzer
 
 
@@ -57,8 +57,6 @@ class SmartSystemAnalyzer(ISystemAnalyzer):
             storage_gb=specs.storage_gb,
             performance_tier=performance_tier,
             capabilities=capabilities,
-            neural_engine=chip_info['has_neural_engine'],
-            unified_memory=chip_info['has_unified_memory'],
             benchmark_results=benchmark_results,
             raw_specs=specs
         )
@@ -252,20 +250,24 @@ class SmartSystemAnalyzer(ISystemAnalyzer):
         else:
             return "EFFICIENT"
             
-    def _detect_capabilities(self, chip_info: Dict, specs: SystemSpecs) -> Dict[str, bool]:
+    def _detect_capabilities(self, chip_info: Dict, specs: SystemSpecs) -> Capability:
         """Detect system capabilities"""
-        capabilities = {
-            'neural_engine': chip_info['has_neural_engine'],
-            'unified_memory': chip_info['has_unified_memory'],
-            'metal_support': chip_info['type'] != 'Intel',  # All Apple Silicon has Metal
-            'accelerated_ml': chip_info['has_neural_engine'],
-            'can_run_large_models': specs.ram_gb >= 16,
-            'can_run_medium_models': specs.ram_gb >= 8,
-            'has_dedicated_gpu': bool(specs.gpu_info and 'Radeon' in str(specs.gpu_info)),
-            'supports_background_tasks': specs.cpu_cores >= 8,
-            'fast_storage': True,  # Assume SSD on modern Macs
+        detected = {
+            Capability.NEURAL_ENGINE: chip_info['has_neural_engine'],
+            Capability.UNIFIED_MEMORY: chip_info['has_unified_memory'],
+            Capability.METAL_SUPPORT: chip_info['type'] != 'Intel',  # All Apple Silicon has Metal
+            Capability.ACCELERATED_ML: chip_info['has_neural_engine'],
+            Capability.CAN_RUN_LARGE_MODELS: specs.ram_gb >= 16,
+            Capability.CAN_RUN_MEDIUM_MODELS: specs.ram_gb >= 8,
+            Capability.HAS_DEDICATED_GPU: bool(specs.gpu_info and 'Radeon' in str(specs.gpu_info)),
+            Capability.SUPPORTS_BACKGROUND_TASKS: specs.cpu_cores >= 8,
+            Capability.FAST_STORAGE: True,  # Assume SSD on modern Macs
         }
         
+        capabilities = Capability(0)
+        for flag, present in detected.items():
+            if present:
+                capabilities |= flag
         return capabilities
         
     async def _run_benchmarks(self) -> BenchmarkResults:
@@ -454,30 +456,30 @@ class SmartSystemAnalyzer(ISystemAnalyzer):
             recommended_models=recommended_models,
             max_model_size=max_model_size,
             use_neural_engine=profile.neural_engine,
-            enable_background_tasks=profile.capabilities.get('supports_background_tasks', False),
+            enable_background_tasks=bool(profile.capabilities & Capability.SUPPORTS_BACKGROUND_TASKS),
             memory_limit_mb=memory_limit_mb
         )
         
-    def _recommend_models(self, profile: SystemProfile) -> list[str]:
+    def _recommend_models(self, profile: SystemProfile) -> Tuple[str, ...]:
         """Recommend specific models for system"""
         if profile.performance_tier == "ULTRA":
-            return [
+            return (
                 "llama3:70b",
                 "codellama:34b",
                 "mixtral:8x7b",
                 "gemma:7b"  # Fast small model
-            ]
+            )
         elif profile.performance_tier == "PRO":
-            return [
+            return (
                 "llama3:13b",
                 "codellama:13b",
                 "mistral:7b",
                 "phi3:medium"
-            ]
+            )
         else:
-            return [
+            return (
                 "llama3:7b",
                 "phi3:mini",
                 "tinyllama",
                 "gemma:2b"
-            ]
\ No newline at end of file
+            )
\ No newline at end of file
@@ -35,7 +35,8 @@ class LegendaryVentures:
     Simplified for NOVA integration
     """
     
-    def __init__(self, company_name: str = "Legendary Ventures"):
+    def __init__(self, company_name: str = "Legendary Ventures",
+                 ollama: Optional[OllamaClient] = None):
         self.logger = logging.getLogger('NOVA.LegendaryVentures')
         self.company_name = company_name
         self.company_path = Path.home() / '.nova' / 'company'
@@ -43,7 +44,8 @@ class LegendaryVentures:
         # Core components
         self.project_manager = ProjectManager()
         self.personality_engine = PersonalityEngine()
-        self.ollama = OllamaClient()
+        # Share the caller's client (and its connection pool) when given one
+        self.ollama = ollama or OllamaClient()
         
         # Virtual team (personality-based agents)
         self.team = {
@@ -3,15 +3,75 @@ Personality Engine for NOVA
 Manages legendary personality selection and prompt enhancement
 """
 
-import random
-from typing import Dict, List, Optional, Tuple, Any
+import re
+import zlib
+from array import array
+from collections import deque
+from itertools import chain, islice
+from typing import Deque, Dict, FrozenSet, Optional, Tuple, Any
 from dataclasses import dataclass
+from functools import lru_cache
 import logging
 
 from .legendary_personalities import LegendaryPersonality, PERSONALITY_PROFILES, PersonalityTraits
 from ...models import Task, TaskComplexity
 
 
+# Recent (query, personality) pairs kept for get_stats
+HISTORY_LIMIT = 1000
+
+# Enum ordinal of each personality, used to index the usage counters
+_PERSONALITY_INDEX: Dict[LegendaryPersonality, int] = {
+    p: i for i, p in enumerate(LegendaryPersonality)
+}
+_PERSONALITIES: Tuple[LegendaryPersonality, ...] = tuple(LegendaryPersonality)
+
+# Quotes per personality, frozen once for prompt building
+_QUOTES: Dict[LegendaryPersonality, Tuple[str, ...]] = {
+    p: tuple(traits.famous_quotes) for p, traits in PERSONALITY_PROFILES.items()
+}
+
+# (trigger words, personality, reasoning) that takes over a rule's match
+# when any trigger word is also present
+_Override = Tuple[FrozenSet[str], LegendaryPersonality, str]
+
+# Keyword buckets for task-based selection, in priority order. Keywords are
+# matched as whole words (a trailing 's' is also stripped), so common
+# inflections are listed explicitly.
+_KEYWORD_RULES: Tuple[Tuple[Tuple[str, ...], LegendaryPersonality, str, Optional[_Override]], ...] = (
+    (('invest', 'investment', 'investing', 'investor', 'business', 'businesses',
+      'profit', 'profitable', 'profitability', 'market', 'marketing', 'marketplace', 'stock'),
+     LegendaryPersonality.BUFFETT, "Business and investment analysis suits Buffett's expertise", None),
+    (('linux', 'kernel', 'system', 'performance', 'optimize', 'optimized', 'optimizing'),
+     LegendaryPersonality.LINUS, "System-level programming aligns with Linus's expertise", None),
+    (('design', 'designing', 'designed', 'designer', 'redesign', 'redesigning',
+      'user experience', 'product', 'beautiful'),
+     LegendaryPersonality.JOBS, "Product vision and user experience is Jobs's domain",
+     (frozenset({'industrial', 'material', 'materials'}),
+      LegendaryPersonality.IVE, "Industrial design focus matches Jony Ive's expertise")),
+    (('scale', 'scaling', 'scalable', 'scalability', 'mars', 'rocket', 'first principles'),
+     LegendaryPersonality.MUSK, "Ambitious scale and first principles thinking", None),
+    (('customer', 'platform', 'aws', 'cloud'),
+     LegendaryPersonality.BEZOS, "Customer focus and platform thinking", None),
+    (('graphics', 'game', 'gaming', 'gamer', 'vr', 'optimization', '3d'),
+     LegendaryPersonality.CARMACK, "Graphics and optimization expertise", None),
+)
+
+
+def _build_keyword_table() -> Dict[str, Tuple[int, LegendaryPersonality, str, Optional[_Override]]]:
+    """Flatten _KEYWORD_RULES into keyword -> (priority, personality, reasoning, override)"""
+    table: Dict[str, Tuple[int, LegendaryPersonality, str, Optional[_Override]]] = {}
+    for rank, (keywords, personality, reasoning, override) in enumerate(_KEYWORD_RULES):
+        for keyword in keywords:
+            table.setdefault(keyword, (rank, personality, reasoning, override))
+    return table
+
+
+_KEYWORD_TABLE = _build_keyword_table()
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_EXPLICIT_NAMES: Dict[str, LegendaryPersonality] = {p.value: p for p in LegendaryPersonality}
+
+
 @dataclass
 class PersonalityContext:
     """Context for personality-based processing"""
@@ -29,51 +89,60 @@ class PersonalityEngine:
     def __init__(self):
         self.logger = logging.getLogger('NOVA.PersonalityEngine')
         self.current_mode = LegendaryPersonality.HYBRID
-        self.personality_history: List[Tuple[str, LegendaryPersonality]] = []
-        self.usage_stats: Dict[LegendaryPersonality, int] = {p: 0 for p in LegendaryPersonality}
+        self.personality_history: Deque[Tuple[str, LegendaryPersonality]] = deque(maxlen=HISTORY_LIMIT)
+        # Per-personality counters indexed by enum ordinal (see _PERSONALITY_INDEX)
+        self.usage_stats = array('Q', [0] * len(_PERSONALITIES))
         
     def select_personality(self, task: Task) -> Tuple[LegendaryPersonality, str]:
         """
         Select the best personality for a given task
         Returns: (personality, reasoning)
         """
-        task_lower = task.content.lower()
+        return self._select_cached(task.content.casefold(), task.complexity, self.current_mode)
+        
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _select_cached(task_cf: str, complexity: TaskComplexity,
+                       current_mode: LegendaryPersonality) -> Tuple[LegendaryPersonality, str]:
+        """
+        Pure selection logic behind select_personality, memoized so repeated
+        requests skip the keyword scan
+        """
+        # Tokenize once; every check below is a hash lookup on these words
+        words = _WORD_RE.findall(task_cf)
+        tokens = frozenset(words)
         
         # Check for explicit personality requests
-        for personality in LegendaryPersonality:
-            if personality.value in task_lower:
-                reasoning = f"User explicitly requested {personality.value} perspective"
-                return personality, reasoning
+        requested = tokens & _EXPLICIT_NAMES.keys()
+        if requested:
+            personality = min((_EXPLICIT_NAMES[name] for name in requested), key=_PERSONALITY_INDEX.get)
+            reasoning = f"User explicitly requested {personality.value} perspective"
+            return personality, reasoning
                 
-        # Task-based selection
-        if any(word in task_lower for word in ['invest', 'business', 'profit', 'market', 'stock']):
-            return LegendaryPersonality.BUFFETT, "Business and investment analysis suits Buffett's expertise"
-            
-        elif any(word in task_lower for word in ['linux', 'kernel', 'system', 'performance', 'optimize']):
-            return LegendaryPersonality.LINUS, "System-level programming aligns with Linus's expertise"
-            
-        elif any(word in task_lower for word in ['design', 'user experience', 'product', 'beautiful']):
-            if 'industrial' in task_lower or 'material' in task_lower:
-                return LegendaryPersonality.IVE, "Industrial design focus matches Jony Ive's expertise"
-            else:
-                return LegendaryPersonality.JOBS, "Product vision and user experience is Jobs's domain"
+        # Task-based selection: one pass over the words (and adjacent word
+        # pairs, for two-word keywords) with a dict lookup per term. The
+        # highest-priority bucket that matches wins.
+        best = None
+        for term in chain(words, map(' '.join, zip(words, words[1:]))):
+            hit = _KEYWORD_TABLE.get(term)
+            if hit is None and term.endswith('s'):
+                hit = _KEYWORD_TABLE.get(term[:-1])
+            if hit is not None and (best is None or hit[0] < best[0]):
+                best = hit
                 
-        elif any(word in task_lower for word in ['scale', 'mars', 'rocket', 'first principles']):
-            return LegendaryPersonality.MUSK, "Ambitious scale and first principles thinking"
-            
-        elif any(word in task_lower for word in ['customer', 'platform', 'aws', 'cloud']):
-            return LegendaryPersonality.BEZOS, "Customer focus and platform thinking"
-            
-        elif any(word in task_lower for word in ['graphics', 'game', 'vr', 'optimization', '3d']):
-            return LegendaryPersonality.CARMACK, "Graphics and optimization expertise"
+        if best is not None:
+            _, personality, reasoning, override = best
+            if override is not None and not override[0].isdisjoint(tokens):
+                return override[1], override[2]
+            return personality, reasoning
             
         # Complexity-based fallback
-        if task.complexity == TaskComplexity.COMPLEX:
+        if complexity == TaskComplexity.COMPLEX:
             return LegendaryPersonality.HYBRID, "Complex task benefits from multiple perspectives"
-        elif task.complexity == TaskComplexity.SIMPLE:
+        elif complexity == TaskComplexity.SIMPLE:
             return LegendaryPersonality.LINUS, "Simple tasks benefit from direct, practical approach"
         else:
-            return self.current_mode, f"Using current mode: {self.current_mode.value}"
+            return current_mode, f"Using current mode: {current_mode.value}"
             
     def build_prompt(self, task: Task, personality: LegendaryPersonality, context: Dict[str, Any]) -> str:
         """
@@ -96,9 +165,11 @@ Remember to:
 - Use their characteristic phrases and approach when appropriate
 """
 
-        # Add some quotes for flavor
-        if traits.famous_quotes:
-            quote = random.choice(traits.famous_quotes)
+        # Add some quotes for flavor. The pick is a stable hash of the request
+        # so identical requests produce identical prompts (cache friendly).
+        quotes = _QUOTES.get(personality, ())
+        if quotes and context.get('include_quote', True):
+            quote = quotes[zlib.crc32(task.content.encode('utf-8')) % len(quotes)]
             personality_context += f"\n\nAs {traits.name} would say: \"{quote}\"\n"
             
         # Build the full prompt
@@ -115,7 +186,7 @@ User request: {task.content}
 Please respond as {traits.name} would, applying their unique perspective and expertise to this request."""
 
         # Track usage
-        self.usage_stats[personality] += 1
+        self.usage_stats[_PERSONALITY_INDEX[personality]] += 1
         self.personality_history.append((task.content[:50], personality))
         
         return prompt
@@ -184,7 +255,8 @@ Please respond as {traits.name} would, applying their unique perspective and exp
         
     def get_stats(self) -> Dict[str, Any]:
         """Get personality usage statistics"""
-        total_uses = sum(self.usage_stats.values())
+        total_uses = sum(self.usage_stats)
+        recent = list(islice(reversed(self.personality_history), 10))[::-1]
         
         return {
             'current_mode': self.current_mode.value,
@@ -194,15 +266,15 @@ Please respond as {traits.name} would, applying their unique perspective and exp
                     'count': count,
                     'percentage': (count / total_uses * 100) if total_uses > 0 else 0
                 }
-                for p, count in self.usage_stats.items()
+                for p, count in zip(_PERSONALITIES, self.usage_stats)
             },
             'recent_history': [
                 {'query': q, 'personality': p.value}
-                for q, p in self.personality_history[-10:]
+                for q, p in recent
             ]
         }
         
     def reset_stats(self):
         """Reset usage statistics"""
-        self.usage_stats = {p: 0 for p in LegendaryPersonality}
-        self.personality_history = []
\ No newline at end of file
+        self.usage_stats = array('Q', [0] * len(_PERSONALITIES))
+        self.personality_history.clear()
\ No newline at end of file
@@ -1,3 +1,4 @@
 from .persistent_memory import PersistentMemory
+from .lazy_history import LazyHistory
 
-__all__ = ["PersistentMemory"]
\ No newline at end of file
+__all__ = ["PersistentMemory", "LazyHistory"]
@@ -0,0 +1,238 @@
+"""
+Lazily loaded conversation history for NOVA
+Conversations live in an append-only data file with a memory-mapped index,
+and are only deserialized when accessed
+"""
+
+import os
+import mmap
+import struct
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from ..models import Conversation
+
+
+# Index entry per conversation: data offset, record length, timestamp, id digest
+INDEX_ENTRY = struct.Struct('<QQd16s')
+# Record header: byte lengths of id, user_input and model_used, then cost and tokens
+RECORD_HEADER = struct.Struct('<IIIdq')
+
+
+def _id_digest(conv_id: str) -> bytes:
+    return hashlib.md5(conv_id.encode('utf-8')).digest()
+
+
+def entries_before(index_file: Path, cutoff: float, start: int = 0) -> Tuple[int, int]:
+    """
+    Count the conversations from position `start` with timestamps before
+    `cutoff`, reading the index alone. Returns (count, total record bytes).
+    """
+    try:
+        index = index_file.read_bytes()
+    except FileNotFoundError:
+        return 0, 0
+    usable = len(index) - len(index) % INDEX_ENTRY.size
+    count = size = 0
+    for _, length, timestamp, _ in INDEX_ENTRY.iter_unpack(
+            memoryview(index)[start * INDEX_ENTRY.size:usable]):
+        if timestamp < cutoff:
+            count += 1
+            size += length
+    return count, size
+
+
+def _encode_record(conversation: Conversation, payload: bytes) -> bytes:
+    """Header and the fields search needs, uncompressed, followed by the payload"""
+    conv_id = conversation.id.encode('utf-8')
+    user_input = conversation.user_input.encode('utf-8')
+    model = conversation.model_used.encode('utf-8')
+    header = RECORD_HEADER.pack(len(conv_id), len(user_input), len(model),
+                                conversation.cost, conversation.tokens_used)
+    return b''.join((header, conv_id, user_input, model, payload))
+
+
+class LazyHistory:
+    """
+    Sequence of conversations backed by history files on disk.
+    Entries before `start` have been trimmed; appended conversations stay
+    in memory until write_pending()/commit() store them.
+    """
+
+    def __init__(self, data_file: Path, index_file: Path,
+                 decode: Callable[[bytes], Conversation], start: int = 0):
+        self.data_file = data_file
+        self.index_file = index_file
+        self._decode = decode
+        self._data: Optional[mmap.mmap] = None
+        self._index: Optional[mmap.mmap] = None
+        self._stored = 0
+        self._map()
+        self.start = min(start, self._stored)
+        # Conversations appended since the last commit()
+        self._tail: List[Conversation] = []
+        # Hydrated conversations by absolute position
+        self._hydrated: Dict[int, Conversation] = {}
+
+    @classmethod
+    def create(cls, data_file: Path, index_file: Path, conversations: Iterable[Conversation],
+               encode: Callable[[Conversation], bytes],
+               decode: Callable[[bytes], Conversation]) -> 'LazyHistory':
+        """Write conversations to fresh history files and open them"""
+        conversations = list(conversations)
+        tmp_data = data_file.with_suffix(data_file.suffix + '.tmp')
+        tmp_index = index_file.with_suffix(index_file.suffix + '.tmp')
+        with open(tmp_data, 'wb') as data, open(tmp_index, 'wb') as index:
+            cls._write(data, index, 0, conversations, encode)
+        os.replace(tmp_data, data_file)
+        os.replace(tmp_index, index_file)
+
+        history = cls(data_file, index_file, decode)
+        # Keep the objects we already have instead of re-reading them
+        history._hydrated = dict(enumerate(conversations))
+        return history
+
+    @staticmethod
+    def _write(data, index, offset: int, conversations: List[Conversation],
+               encode: Callable[[Conversation], bytes]) -> None:
+        records = []
+        entries = []
+        for conversation in conversations:
+            record = _encode_record(conversation, encode(conversation))
+            entries.append(INDEX_ENTRY.pack(offset, len(record), conversation.timestamp.timestamp(),
+                                            _id_digest(conversation.id)))
+            records.append(record)
+            offset += len(record)
+        data.write(b''.join(records))
+        data.flush()
+        index.write(b''.join(entries))
+        index.flush()
+
+    def _map(self) -> None:
+        """(Re)map the history files"""
+        self.close()
+        if not self.index_file.exists() or not self.data_file.exists():
+            return
+        if self.index_file.stat().st_size == 0 or self.data_file.stat().st_size == 0:
+            return
+        with open(self.index_file, 'rb') as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        with open(self.data_file, 'rb') as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._stored = len(self._index) // INDEX_ENTRY.size
+
+    def close(self) -> None:
+        """Release the memory maps"""
+        for mapped in (self._index, self._data):
+            if mapped is not None:
+                mapped.close()
+        self._index = self._data = None
+        self._stored = 0
+
+    def pending(self) -> List[Conversation]:
+        """Conversations appended since the last commit, to pass to write_pending()"""
+        return list(self._tail)
+
+    def write_pending(self, pending: List[Conversation],
+                      encode: Callable[[Conversation], bytes]) -> None:
+        """
+        Append conversations taken from pending() to the history files.
+        Only touches the files, so it can run in a worker thread; call
+        commit() with the same list after.
+        """
+        if not pending:
+            return
+        offset = self.data_file.stat().st_size if self.data_file.exists() else 0
+        with open(self.data_file, 'ab') as data, open(self.index_file, 'ab') as index:
+            self._write(data, index, offset, pending, encode)
+
+    def commit(self, pending: List[Conversation]) -> None:
+        """Remap the files after write_pending() stored `pending`"""
+        if not pending:
+            return
+        base = self._stored
+        for i, conversation in enumerate(pending):
+            if self._tail and self._tail[0] is conversation:
+                self._tail.pop(0)
+                self._hydrated[base + i] = conversation
+            else:
+                # Trimmed from the tail while it was being written
+                self.start += 1
+        self._map()
+
+    def _entry(self, position: int) -> Tuple[int, int, float, bytes]:
+        return INDEX_ENTRY.unpack_from(self._index, position * INDEX_ENTRY.size)
+
+    def _header(self, position: int) -> Tuple[int, Tuple[int, int, int, float, int]]:
+        offset = self._entry(position)[0]
+        return offset, RECORD_HEADER.unpack_from(self._data, offset)
+
+    def _hydrate(self, position: int) -> Conversation:
+        """Deserialize the conversation at an absolute stored position"""
+        conversation = self._hydrated.get(position)
+        if conversation is None:
+            offset, length, _, digest = self._entry(position)
+            id_len, input_len, model_len, _, _ = RECORD_HEADER.unpack_from(self._data, offset)
+            payload_start = offset + RECORD_HEADER.size + id_len + input_len + model_len
+            conversation = self._decode(self._data[payload_start:offset + length])
+            if _id_digest(conversation.id) != digest:
+                raise ValueError(f"Corrupt history entry at position {position}")
+            self._hydrated[position] = conversation
+        return conversation
+
+    def rows(self) -> Iterator[Tuple[str, str, str, float, int]]:
+        """(id, user_input, model_used, cost, tokens_used) per conversation, without hydrating"""
+        data = self._data
+        for position in range(self.start, self._stored):
+            offset, (id_len, input_len, model_len, cost, tokens) = self._header(position)
+            start = offset + RECORD_HEADER.size
+            conv_id = data[start:start + id_len].decode('utf-8')
+            start += id_len
+            user_input = data[start:start + input_len].decode('utf-8')
+            start += input_len
+            model = data[start:start + model_len].decode('utf-8')
+            yield conv_id, user_input, model, cost, tokens
+        for conversation in self._tail:
+            yield (conversation.id, conversation.user_input, conversation.model_used,
+                   conversation.cost, conversation.tokens_used)
+
+    def timestamp(self, index: int) -> float:
+        """POSIX timestamp of a conversation, read from the index alone"""
+        position = self.start + range(len(self))[index]
+        if position >= self._stored:
+            return self._tail[position - self._stored].timestamp.timestamp()
+        return self._entry(position)[2]
+
+    def append(self, conversation: Conversation) -> None:
+        self._tail.append(conversation)
+
+    def __len__(self) -> int:
+        return self._stored - self.start + len(self._tail)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Conversation, List[Conversation]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        position = self.start + range(len(self))[index]
+        if position >= self._stored:
+            return self._tail[position - self._stored]
+        return self._hydrate(position)
+
+    def __delitem__(self, index: slice) -> None:
+        """Trim from the front; only history[:n] is supported"""
+        if not isinstance(index, slice) or index.start not in (None, 0) or index.step not in (None, 1):
+            raise TypeError("LazyHistory only supports deleting a leading slice")
+        count = len(range(len(self))[index])
+        stored_count = min(count, self._stored - self.start)
+        for position in range(self.start, self.start + stored_count):
+            self._hydrated.pop(position, None)
+        self.start += stored_count
+        del self._tail[:count - stored_count]
+
+    def __iter__(self) -> Iterator[Conversation]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def __reversed__(self) -> Iterator[Conversation]:
+        for i in reversed(range(len(self))):
+            yield self[i]
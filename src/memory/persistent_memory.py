@@ -1,6 +1,14 @@
 import os
+import re
+import sys
+import time
+import atexit
+import signal
+import threading
 import json
 import logging
+import sqlite3
+from contextlib import closing
 from pathlib import Path
 from typing import Optional, Dict, List, Any
 from datetime import datetime
@@ -9,8 +17,15 @@ import aiofiles
 from cryptography.fernet import Fernet
 import uuid
 
-from ..models import UserProfile, Conversation, Preferences
+from ..models import UserProfile, Conversation, Preferences, make_preferences
+from ..models.user import STOPWORDS, now_cached
 from ..interfaces import IMemorySystem
+from .lazy_history import LazyHistory
+
+
+# add_conversation saves the profile once per batch rather than every call
+SAVE_BATCH_SIZE = 32
+SAVE_INTERVAL = 5.0  # seconds since the oldest unsaved conversation
 
 
 class PersistentMemory(IMemorySystem):
@@ -34,6 +49,9 @@ class PersistentMemory(IMemorySystem):
         self.memory_file = self.memory_path / 'memory.md'
         self.conversations_dir = self.memory_path / 'conversations'
         self.preferences_file = self.memory_path / 'preferences.json'
+        self.archive_file = self.memory_path / 'archive.db'
+        self.history_file = self.memory_path / 'history.dat'
+        self.history_index_file = self.memory_path / 'history.idx'
         
         # Create conversations directory
         self.conversations_dir.mkdir(exist_ok=True)
@@ -41,6 +59,25 @@ class PersistentMemory(IMemorySystem):
         # Initialize encryption for sensitive data
         self._init_encryption()
         
+        # Full-text archive for conversations trimmed from the in-memory window
+        self._archive_enabled = self._init_archive()
+        
+        # Profile with conversations not yet saved (see flush)
+        self._pending_profile: Optional[UserProfile] = None
+        self._pending_count = 0
+        self._pending_since: Optional[float] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        # Overlapping saves would append the same pending conversations twice
+        self._save_lock = asyncio.Lock()
+        # Whether _flush_sync is registered to run at exit (see _install_exit_flush)
+        self._exit_flush_installed = False
+        
+        # History handed out by load_profile, appended to by save_profile
+        self._history: Optional[LazyHistory] = None
+        # Conversations migrated from per-conversation files, whose files are
+        # removed once the profile file points at the history files
+        self._legacy_ids: List[str] = []
+        
     def _init_encryption(self):
         """Initialize encryption for sensitive data"""
         key_file = self.memory_path / '.key'
@@ -58,6 +95,20 @@ class PersistentMemory(IMemorySystem):
             
         self.cipher = Fernet(key)
         
+    def _init_archive(self) -> bool:
+        """Create the SQLite FTS5 archive table if needed"""
+        try:
+            with closing(sqlite3.connect(self.archive_file)) as db:
+                db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS conversations "
+                    "USING fts5(id UNINDEXED, user_input, payload UNINDEXED)"
+                )
+                db.commit()
+            return True
+        except sqlite3.Error as e:
+            self.logger.warning(f"Conversation archive disabled: {e}")
+            return False
+        
     async def load_profile(self) -> Optional[UserProfile]:
         """Load user profile from disk"""
         try:
@@ -71,8 +122,12 @@ class PersistentMemory(IMemorySystem):
             # Load preferences
             preferences = await self._load_preferences()
             
-            # Load conversations
-            conversations = await self._load_conversations(data.get('conversation_ids', []))
+            # Conversations are read lazily from the history files; profiles
+            # saved before those existed still list per-conversation files
+            if 'history_start' in data:
+                conversations = await asyncio.to_thread(self._open_history, data['history_start'])
+            else:
+                conversations = await self._load_conversations(data.get('conversation_ids', []))
             
             # Create profile
             profile = UserProfile(
@@ -95,57 +150,80 @@ class PersistentMemory(IMemorySystem):
             
     async def save_profile(self, profile: UserProfile) -> None:
         """Save user profile to disk"""
+        async with self._save_lock:
+            await self._save_profile(profile)
+            
+    async def _save_profile(self, profile: UserProfile) -> None:
+        """save_profile, with _save_lock held"""
+        saved_count = self._pending_count
+        started = time.monotonic()
         try:
             # Save conversations first
-            conversation_ids = await self._save_conversations(profile.conversation_history)
+            history_start = await self._persist_history(profile)
             
             # Save preferences
             await self._save_preferences(profile.preferences)
             
             # Save profile data
-            data = {
-                'created_at': profile.created_at.isoformat(),
-                'last_active': profile.last_active.isoformat(),
-                'recent_projects': profile.recent_projects,
-                'conversation_ids': conversation_ids,
-                'learned_patterns': profile.learned_patterns,
-                'total_interactions': profile.total_interactions,
-                'total_cost': profile.total_cost
-            }
-            
             async with aiofiles.open(self.profile_file, 'w') as f:
-                await f.write(json.dumps(data, indent=2))
-                
+                await f.write(self._profile_json(profile, history_start))
+            if self._legacy_ids:
+                await asyncio.to_thread(self._remove_legacy_files)
+            
             # Update human-readable memory file
             await self._update_memory_markdown(profile)
             
+            # A full save covers the batched conversations it started with;
+            # any added while it ran stay pending
+            self._pending_count -= saved_count
+            if self._pending_count > 0:
+                self._pending_since = started
+            else:
+                self._pending_profile = None
+                self._pending_count = 0
+                self._pending_since = None
+                self._cancel_flush_later()
+            
             self.logger.info("Profile saved successfully")
             
         except Exception as e:
             self.logger.error(f"Failed to save profile: {e}")
             raise
-            
+        
+    def _profile_json(self, profile: UserProfile, history_start: int) -> str:
+        """The profile file's contents"""
+        data = {
+            'created_at': profile.created_at.isoformat(),
+            'last_active': profile.last_active.isoformat(),
+            'recent_projects': profile.recent_projects,
+            'history_start': history_start,
+            'learned_patterns': profile.learned_patterns,
+            'total_interactions': profile.total_interactions,
+            'total_cost': profile.total_cost
+        }
+        return json.dumps(data, indent=2)
+        
     async def _load_preferences(self) -> Preferences:
         """Load user preferences"""
         try:
             if not self.preferences_file.exists():
-                return Preferences()  # Return defaults
+                return make_preferences()  # Return defaults
                 
             async with aiofiles.open(self.preferences_file, 'r') as f:
                 data = json.loads(await f.read())
                 
-            return Preferences(**data)
+            return make_preferences(**data)
             
         except Exception as e:
             self.logger.error(f"Failed to load preferences: {e}")
-            return Preferences()
+            return make_preferences()
             
     async def _save_preferences(self, preferences: Preferences) -> None:
         """Save user preferences"""
         data = {
             'performance_mode': preferences.performance_mode,
-            'preferred_stack': preferences.preferred_stack,
-            'coding_style': preferences.coding_style,
+            'preferred_stack': list(preferences.preferred_stack),
+            'coding_style': dict(preferences.coding_style),
             'working_hours': preferences.working_hours,
             'auto_commit': preferences.auto_commit,
             'verbose_mode': preferences.verbose_mode,
@@ -171,62 +249,145 @@ class PersistentMemory(IMemorySystem):
                 async with aiofiles.open(conv_file, 'r') as f:
                     data = json.loads(await f.read())
                     
-                # Decrypt sensitive fields if needed
-                if 'encrypted_context' in data:
-                    context_bytes = self.cipher.decrypt(data['encrypted_context'].encode())
-                    data['context'] = json.loads(context_bytes.decode())
-                    
-                conversation = Conversation(
-                    id=data['id'],
-                    timestamp=datetime.fromisoformat(data['timestamp']),
-                    user_input=data['user_input'],
-                    nova_response=data['nova_response'],
-                    actions_taken=data['actions_taken'],
-                    model_used=data['model_used'],
-                    context=data.get('context', {}),
-                    tokens_used=data.get('tokens_used', 0),
-                    cost=data.get('cost', 0.0)
-                )
-                
-                conversations.append(conversation)
+                conversations.append(self._conversation_from_dict(data))
                 
             except Exception as e:
                 self.logger.error(f"Failed to load conversation {conv_id}: {e}")
                 
         return conversations
         
-    async def _save_conversations(self, conversations: List[Conversation]) -> List[str]:
-        """Save conversations and return their IDs"""
-        conversation_ids = []
+    def _open_history(self, start: int) -> LazyHistory:
+        """
+        Map the history files for a loaded profile (blocking). An earlier
+        profile may still hold the previous instance, so it keeps its maps.
+        """
+        self._history = LazyHistory(self.history_file, self.history_index_file,
+                                    self._decode_conversation, start)
+        return self._history
         
-        for conversation in conversations:
+    async def _persist_history(self, profile: UserProfile) -> int:
+        """
+        Write new conversations to the history files and return the index
+        of the first live entry
+        """
+        history = profile.conversation_history
+        if history is self._history and history.start <= len(history):
+            # Taken here, on the loop, so appends made during the write wait for the next save
+            pending = history.pending()
+            write = asyncio.ensure_future(
+                asyncio.to_thread(history.write_pending, pending, self._encode_conversation))
             try:
-                # Encrypt sensitive context
-                context_json = json.dumps(conversation.context)
-                encrypted_context = self.cipher.encrypt(context_json.encode()).decode()
-                
-                data = {
-                    'id': conversation.id,
-                    'timestamp': conversation.timestamp.isoformat(),
-                    'user_input': conversation.user_input,
-                    'nova_response': conversation.nova_response,
-                    'actions_taken': conversation.actions_taken,
-                    'model_used': conversation.model_used,
-                    'encrypted_context': encrypted_context,
-                    'tokens_used': conversation.tokens_used,
-                    'cost': conversation.cost
-                }
-                
-                conv_file = self.conversations_dir / f"{conversation.id}.json"
-                async with aiofiles.open(conv_file, 'w') as f:
-                    await f.write(json.dumps(data, indent=2))
-                    
-                conversation_ids.append(conversation.id)
-                
-            except Exception as e:
-                self.logger.error(f"Failed to save conversation {conversation.id}: {e}")
-                
-        return conversation_ids
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                # The write carries on in its thread; record it once done so
+                # the exit flush does not append the same conversations again
+                await asyncio.wait([write])
+                if write.exception() is None:
+                    history.commit(pending)
+                raise
+            history.commit(pending)
+            return history.start
+            
+        # A plain list (new or migrated profile) or mostly-trimmed files:
+        # rewrite the files and switch the profile over to them
+        conversations = list(history)
+        new_history = await asyncio.to_thread(
+            LazyHistory.create, self.history_file, self.history_index_file, conversations,
+            self._encode_conversation, self._decode_conversation
+        )
+        self._switch_history(profile, new_history, conversations)
+        return 0
+        
+    def _switch_history(self, profile: UserProfile, new_history: LazyHistory,
+                        conversations: List[Conversation]) -> None:
+        """Point the profile at freshly written history files"""
+        if not isinstance(profile.conversation_history, LazyHistory):
+            self._legacy_ids.extend(conversation.id for conversation in conversations)
+        self._history = new_history
+        profile.conversation_history = new_history
+        
+    def _remove_legacy_files(self) -> None:
+        """Delete per-conversation files now stored in the history files (blocking)"""
+        ids, self._legacy_ids = self._legacy_ids, []
+        for conv_id in ids:
+            (self.conversations_dir / f"{conv_id}.json").unlink(missing_ok=True)
+        
+    def _encode_conversation(self, conversation: Conversation) -> bytes:
+        return json.dumps(self._conversation_to_dict(conversation)).encode()
+        
+    def _decode_conversation(self, payload: bytes) -> Conversation:
+        return self._conversation_from_dict(json.loads(payload))
+        
+    def _conversation_to_dict(self, conversation: Conversation) -> Dict[str, Any]:
+        """Serialize a conversation, encrypting its context"""
+        context_json = json.dumps(conversation.context)
+        encrypted_context = self.cipher.encrypt(context_json.encode()).decode()
+        
+        return {
+            'id': conversation.id,
+            'timestamp': conversation.timestamp.isoformat(),
+            'user_input': conversation.user_input,
+            'nova_response': conversation.nova_response,
+            'actions_taken': conversation.actions_taken,
+            'model_used': conversation.model_used,
+            'encrypted_context': encrypted_context,
+            'tokens_used': conversation.tokens_used,
+            'cost': conversation.cost
+        }
+        
+    def _conversation_from_dict(self, data: Dict[str, Any]) -> Conversation:
+        """Rebuild a conversation saved by _conversation_to_dict"""
+        # Decrypt sensitive fields if needed
+        if 'encrypted_context' in data:
+            context_bytes = self.cipher.decrypt(data['encrypted_context'].encode())
+            data['context'] = json.loads(context_bytes.decode())
+            
+        return Conversation(
+            id=data['id'],
+            timestamp=datetime.fromisoformat(data['timestamp']),
+            user_input=data['user_input'],
+            nova_response=data['nova_response'],
+            actions_taken=data['actions_taken'],
+            model_used=data['model_used'],
+            context=data.get('context', {}),
+            tokens_used=data.get('tokens_used', 0),
+            cost=data.get('cost', 0.0)
+        )
+        
+    def _archive_conversations(self, conversations: List[Conversation]) -> None:
+        """Append conversations to the full-text archive (blocking)"""
+        rows = [
+            (conv.id, conv.user_input, json.dumps(self._conversation_to_dict(conv)))
+            for conv in conversations
+        ]
+        with closing(sqlite3.connect(self.archive_file)) as db:
+            db.executemany("INSERT INTO conversations (id, user_input, payload) VALUES (?, ?, ?)", rows)
+            db.commit()
+            
+    def _search_archive(self, query: str, limit: int,
+                        exclude: set) -> List[Conversation]:
+        """Newest archived conversations matching any query word (blocking)"""
+        words = [w for w in re.findall(r"\w+", query.lower()) if w not in STOPWORDS]
+        if not words or limit <= 0:
+            return []
+            
+        # Prefix match each word, OR'ed together
+        match = ' OR '.join(f'"{w}"*' for w in words)
+        with closing(sqlite3.connect(self.archive_file)) as db:
+            rows = db.execute(
+                "SELECT id, payload FROM conversations WHERE conversations MATCH ? "
+                "ORDER BY rowid DESC LIMIT ?",
+                (match, limit + len(exclude))
+            ).fetchall()
+            
+        results = []
+        for conv_id, payload in rows:
+            if conv_id in exclude:
+                continue
+            results.append(self._conversation_from_dict(json.loads(payload)))
+            if len(results) >= limit:
+                break
+        return results
         
     async def _update_memory_markdown(self, profile: UserProfile) -> None:
         """Update human-readable memory file"""
@@ -292,7 +453,7 @@ class PersistentMemory(IMemorySystem):
         """Add a new conversation to the profile"""
         conversation = Conversation(
             id=str(uuid.uuid4()),
-            timestamp=datetime.now(),
+            timestamp=now_cached(),
             user_input=user_input,
             nova_response=nova_response,
             actions_taken=actions_taken,
@@ -304,8 +465,111 @@ class PersistentMemory(IMemorySystem):
         
         profile.add_conversation(conversation)
         
-        # Save immediately for persistence
-        await self.save_profile(profile)
+        # Move conversations that left the in-memory window to the archive
+        spilled = profile.take_spilled()
+        if spilled and self._archive_enabled:
+            await asyncio.to_thread(self._archive_conversations, spilled)
+            
+        # Save in batches; shutdown and flush() write out the remainder, and
+        # _flush_sync whatever is left if the process exits some other way
+        self._install_exit_flush()
+        self._pending_profile = profile
+        self._pending_count += 1
+        if self._pending_since is None:
+            self._pending_since = time.monotonic()
+        if (self._pending_count >= SAVE_BATCH_SIZE or
+                time.monotonic() - self._pending_since > SAVE_INTERVAL):
+            await self.flush()
+        elif self._flush_task is None or self._flush_task.done():
+            # Make sure a quiet session still gets saved within SAVE_INTERVAL
+            self._flush_task = asyncio.create_task(self._flush_later())
+            
+    async def flush(self) -> None:
+        """Save the profile if conversations are waiting to be persisted"""
+        # Checked under the lock: a save already in progress may cover them
+        async with self._save_lock:
+            if self._pending_profile is not None:
+                await self._save_profile(self._pending_profile)
+                
+    async def close(self) -> None:
+        """Write out anything still pending and wait for the background save"""
+        task = self._flush_task
+        # The save cancels the task if it is still waiting
+        await self.flush()
+        if task is not None:
+            await asyncio.wait([task])
+        if self._exit_flush_installed:
+            atexit.unregister(self._flush_sync)
+            self._exit_flush_installed = False
+            
+    def _install_exit_flush(self) -> None:
+        """
+        Run _flush_sync at interpreter exit, and turn SIGTERM into a normal
+        exit (unless the application installed its own handler) so it runs
+        then too
+        """
+        if self._exit_flush_installed:
+            return
+        atexit.register(self._flush_sync)
+        self._exit_flush_installed = True
+        if (threading.current_thread() is threading.main_thread() and
+                signal.getsignal(signal.SIGTERM) is signal.SIG_DFL):
+            signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(128 + signum))
+            
+    def _flush_sync(self) -> None:
+        """
+        Write pending conversations and the profile file without the event
+        loop, for exits that skip close(). The markdown summary is left for
+        the next save.
+        """
+        profile = self._pending_profile
+        if profile is None:
+            return
+        try:
+            history = profile.conversation_history
+            if history is self._history and history.start <= len(history):
+                pending = history.pending()
+                history.write_pending(pending, self._encode_conversation)
+                history.commit(pending)
+                history_start = history.start
+            else:
+                conversations = list(history)
+                new_history = LazyHistory.create(
+                    self.history_file, self.history_index_file, conversations,
+                    self._encode_conversation, self._decode_conversation
+                )
+                self._switch_history(profile, new_history, conversations)
+                history_start = 0
+            with open(self.profile_file, 'w') as f:
+                f.write(self._profile_json(profile, history_start))
+            self._remove_legacy_files()
+            self._pending_profile = None
+            self._pending_count = 0
+            self._pending_since = None
+        except Exception as e:
+            self.logger.error(f"Failed to save profile at exit: {e}")
+        
+    def _cancel_flush_later(self) -> None:
+        """
+        Drop the scheduled background save once nothing is pending. Called
+        with _save_lock held, so the task is never cancelled mid-save.
+        """
+        task = self._flush_task
+        if task is not None and not task.done() and task is not asyncio.current_task():
+            task.cancel()
+        self._flush_task = None
+        
+    async def _flush_later(self) -> None:
+        """Flush once the oldest pending conversation is SAVE_INTERVAL old"""
+        while self._pending_since is not None:
+            remaining = self._pending_since + SAVE_INTERVAL - time.monotonic()
+            if remaining <= 0:
+                try:
+                    await self.flush()
+                except Exception as e:
+                    self.logger.error(f"Background save failed: {e}")
+                return
+            await asyncio.sleep(remaining)
         
     async def update_learned_patterns(self, profile: UserProfile, 
                                     pattern: str, details: Any) -> None:
@@ -318,8 +582,19 @@ class PersistentMemory(IMemorySystem):
         
     async def search_conversations(self, profile: UserProfile, query: str, 
                                  limit: int = 10) -> List[Conversation]:
-        """Search through conversation history"""
-        return profile.get_relevant_history(query, limit)
+        """Search through conversation history, then the archive if needed"""
+        results = profile.get_relevant_history(query, limit)
+        
+        if len(results) < limit and self._archive_enabled:
+            exclude = {conv.id for conv in results}
+            try:
+                results += await asyncio.to_thread(
+                    self._search_archive, query, limit - len(results), exclude
+                )
+            except sqlite3.Error as e:
+                self.logger.error(f"Archive search failed: {e}")
+                
+        return results
         
     async def get_memory_stats(self, profile: UserProfile) -> Dict[str, Any]:
         """Get memory usage statistics"""
@@ -330,7 +605,8 @@ class PersistentMemory(IMemorySystem):
             if f.is_file()
         )
         
-        conversation_count = len(list(self.conversations_dir.glob('*.json')))
+        conversation_count = len(profile.conversation_history)
+        cost_by_model, tokens_by_model = profile.usage_by_model()
         
         return {
             'total_size_mb': total_size / (1024 * 1024),
@@ -338,7 +614,9 @@ class PersistentMemory(IMemorySystem):
             'total_interactions': profile.total_interactions,
             'total_cost': profile.total_cost,
             'days_active': (datetime.now() - profile.created_at).days,
-            'avg_daily_cost': profile.total_cost / max(1, (datetime.now() - profile.created_at).days)
+            'avg_daily_cost': profile.total_cost / max(1, (datetime.now() - profile.created_at).days),
+            'cost_by_model': cost_by_model,
+            'tokens_by_model': tokens_by_model
         }
         
     async def cleanup_old_conversations(self, profile: UserProfile, 
@@ -347,17 +625,12 @@ class PersistentMemory(IMemorySystem):
         if len(profile.conversation_history) <= keep_last:
             return 0
             
-        # Keep only the last N conversations
+        # Keep only the last N conversations; trimming a loaded history
+        # only moves its start, without reading the trimmed entries.
+        # (Per-conversation files are removed when a profile migrates.)
         to_remove = len(profile.conversation_history) - keep_last
-        removed_conversations = profile.conversation_history[:to_remove]
-        profile.conversation_history = profile.conversation_history[to_remove:]
-        
-        # Delete old conversation files
-        for conv in removed_conversations:
-            conv_file = self.conversations_dir / f"{conv.id}.json"
-            if conv_file.exists():
-                conv_file.unlink()
-                
+        del profile.conversation_history[:to_remove]
+        
         # Save updated profile
         await self.save_profile(profile)
         
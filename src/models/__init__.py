@@ -1,11 +1,12 @@
-from .system import SystemProfile, SystemSpecs, BenchmarkResults, ConfigRecommendation
+from .system import SystemProfile, Capability, SystemSpecs, BenchmarkResults, ConfigRecommendation
 from .storage import StorageConfig, ExternalStorageConfig, InternalStorageConfig
 from .ai import AIResponse, Action, Task, Model, ModelType, TaskComplexity, CostTracking
-from .user import UserProfile, Conversation, Preferences
+from .user import UserProfile, Conversation, Preferences, make_preferences
 from .commands import Command, CommandResult, CommandType
 
 __all__ = [
     "SystemProfile",
+    "Capability",
     "SystemSpecs", 
     "BenchmarkResults",
     "ConfigRecommendation",
@@ -22,6 +23,7 @@ __all__ = [
     "UserProfile",
     "Conversation",
     "Preferences",
+    "make_preferences",
     "Command",
     "CommandResult",
     "CommandType",
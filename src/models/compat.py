@@ -0,0 +1,6 @@
+"""Compatibility helpers for the model dataclasses"""
+
+import sys
+
+# dataclass(slots=True) needs Python 3.10+; on 3.9 the models keep a __dict__
+DATACLASS_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
@@ -1,34 +1,45 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 from pathlib import Path
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class StorageConfig:
-    """Base storage configuration"""
+    """Base storage configuration (immutable)"""
     use_external: bool = False
     external_path: Optional[Path] = None
-    internal_path: Path = Path.home() / ".nova"
+    internal_path: Path = field(default_factory=lambda: Path.home() / ".nova")
     strategy: str = "balanced"  # minimal, balanced, maximum
     prefer_cloud_apis: bool = False
     auto_cleanup: bool = True
     min_free_space_gb: int = 10
+    # Resolved once in __post_init__
+    _models_path: Optional[Path] = field(default=None, init=False, repr=False, compare=False)
+    _memory_path: Optional[Path] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        if self.use_external and self.external_path:
+            models_path = self.external_path / "models"
+        else:
+            models_path = self.internal_path / "models"
+        object.__setattr__(self, '_models_path', models_path)
+        # Always use internal for memory
+        object.__setattr__(self, '_memory_path', self.internal_path / "memory")
     
     @property
     def models_path(self) -> Path:
         """Get path for model storage"""
-        if self.use_external and self.external_path:
-            return self.external_path / "models"
-        return self.internal_path / "models"
+        return self._models_path
         
     @property
     def memory_path(self) -> Path:
         """Get path for memory storage"""
-        # Always use internal for memory
-        return self.internal_path / "memory"
+        return self._memory_path
         
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ExternalStorageConfig(StorageConfig):
     """Configuration for external drive storage"""
     drive_name: str = ""
@@ -38,17 +49,19 @@ class ExternalStorageConfig(StorageConfig):
     is_encrypted: bool = False
     
     def __post_init__(self):
-        self.use_external = True
-        self.strategy = "maximum"  # Use full capabilities with external
+        object.__setattr__(self, 'use_external', True)
+        object.__setattr__(self, 'strategy', "maximum")  # Use full capabilities with external
+        StorageConfig.__post_init__(self)
         
 
-@dataclass
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class InternalStorageConfig(StorageConfig):
     """Configuration for internal storage only"""
     available_for_nova_gb: int = 10  # How much we can use
     cleanup_threshold_gb: int = 5  # When to suggest cleanup
     
     def __post_init__(self):
-        self.use_external = False
-        self.prefer_cloud_apis = True  # Prefer cloud to save space
-        self.auto_cleanup = True  # Auto cleanup old models
\ No newline at end of file
+        object.__setattr__(self, 'use_external', False)
+        object.__setattr__(self, 'prefer_cloud_apis', True)  # Prefer cloud to save space
+        object.__setattr__(self, 'auto_cleanup', True)  # Auto cleanup old models
+        StorageConfig.__post_init__(self)
\ No newline at end of file
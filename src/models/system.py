@@ -1,9 +1,12 @@
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field, InitVar
+from enum import IntFlag
+from typing import Any, Dict, Optional, Tuple
 from datetime import datetime
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class SystemSpecs:
     """Raw system specifications"""
     platform: str
@@ -18,7 +21,7 @@ class SystemSpecs:
     macos_version: str
     
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class BenchmarkResults:
     """Performance benchmark results"""
     score: float
@@ -29,7 +32,26 @@ class BenchmarkResults:
     timestamp: datetime
     
 
-@dataclass 
+class Capability(IntFlag):
+    """Detected system capabilities"""
+    NEURAL_ENGINE = 1
+    UNIFIED_MEMORY = 2
+    METAL_SUPPORT = 4
+    ACCELERATED_ML = 8
+    CAN_RUN_LARGE_MODELS = 16
+    CAN_RUN_MEDIUM_MODELS = 32
+    HAS_DEDICATED_GPU = 64
+    SUPPORTS_BACKGROUND_TASKS = 128
+    FAST_STORAGE = 256
+    
+
+# Recommended model size per performance tier (anything else gets "7b")
+_MODEL_SIZE_BY_TIER: Dict[str, str] = {"ULTRA": "70b", "PRO": "13b"}
+# SystemProfile fields the derived values are computed from
+_DERIVED_INPUTS = frozenset({"performance_tier", "ram_gb"})
+
+
+@dataclass(**DATACLASS_SLOTS)
 class SystemProfile:
     """Analyzed system profile with capabilities"""
     chip_type: str  # Intel, M1, M2, M3, Future
@@ -38,35 +60,96 @@ class SystemProfile:
     ram_gb: int
     storage_gb: int
     performance_tier: str  # ULTRA, PRO, EFFICIENT
-    capabilities: Dict[str, bool]
-    neural_engine: bool
-    unified_memory: bool
-    benchmark_results: Optional[BenchmarkResults]
+    capabilities: Capability
+    benchmark_results: InitVar[Optional[BenchmarkResults]]
     raw_specs: SystemSpecs
+    # Benchmark results stored inline; the benchmark_* fields are only
+    # meaningful when has_benchmark is set
+    has_benchmark: bool = field(default=False, init=False)
+    benchmark_score: float = field(default=0.0, init=False)
+    benchmark_cpu_score: float = field(default=0.0, init=False)
+    benchmark_memory_score: float = field(default=0.0, init=False)
+    benchmark_disk_score: float = field(default=0.0, init=False)
+    benchmark_inference_speed: float = field(default=0.0, init=False)
+    benchmark_timestamp: datetime = field(default=datetime.min, init=False)
+    # Derived from performance_tier and ram_gb in __post_init__, and again
+    # whenever either is assigned
+    _can_run_large_models: bool = field(default=False, init=False, repr=False, compare=False)
+    _recommended_model_size: str = field(default="7b", init=False, repr=False, compare=False)
     
+    def __post_init__(self, benchmark_results: Optional[BenchmarkResults]):
+        self._derive()
+        if benchmark_results is not None:
+            self.has_benchmark = True
+            self.benchmark_score = benchmark_results.score
+            self.benchmark_cpu_score = benchmark_results.cpu_score
+            self.benchmark_memory_score = benchmark_results.memory_score
+            self.benchmark_disk_score = benchmark_results.disk_score
+            self.benchmark_inference_speed = benchmark_results.inference_speed
+            self.benchmark_timestamp = benchmark_results.timestamp
+            
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # Setup updates profiles in place
+        if name in _DERIVED_INPUTS:
+            try:
+                self._derive()
+            except AttributeError:
+                # Inside __init__, before both are set; __post_init__ derives them
+                pass
+            
+    def _derive(self) -> None:
+        """Recompute the values derived from performance_tier and ram_gb"""
+        self._can_run_large_models = self.performance_tier in ("ULTRA", "PRO") and self.ram_gb >= 16
+        self._recommended_model_size = _MODEL_SIZE_BY_TIER.get(self.performance_tier, "7b")
+        
+    @property
+    def neural_engine(self) -> bool:
+        """Whether the chip has a Neural Engine"""
+        return bool(self.capabilities & Capability.NEURAL_ENGINE)
+        
+    @property
+    def unified_memory(self) -> bool:
+        """Whether the chip uses unified memory"""
+        return bool(self.capabilities & Capability.UNIFIED_MEMORY)
+        
     @property
     def can_run_large_models(self) -> bool:
         """Check if system can run large models"""
-        return self.performance_tier in ["ULTRA", "PRO"] and self.ram_gb >= 16
+        return self._can_run_large_models
         
     @property
     def recommended_model_size(self) -> str:
         """Get recommended model size for this system"""
-        if self.performance_tier == "ULTRA":
-            return "70b"
-        elif self.performance_tier == "PRO":
-            return "13b" 
-        else:
-            return "7b"
+        return self._recommended_model_size
             
 
-@dataclass
+def _benchmark_results(self: SystemProfile) -> Optional[BenchmarkResults]:
+    if not self.has_benchmark:
+        return None
+    return BenchmarkResults(
+        score=self.benchmark_score,
+        cpu_score=self.benchmark_cpu_score,
+        memory_score=self.benchmark_memory_score,
+        disk_score=self.benchmark_disk_score,
+        inference_speed=self.benchmark_inference_speed,
+        timestamp=self.benchmark_timestamp
+    )
+    
+
+# Attached after class creation: a property in the class body would be
+# taken as the InitVar's default
+SystemProfile.benchmark_results = property(
+    _benchmark_results, doc="Benchmark results rebuilt from the inline fields, or None")
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ConfigRecommendation:
     """System configuration recommendations"""
     performance_mode: str  # maximum, balanced, efficient
     model_strategy: str  # local_first, hybrid, cloud_first 
     storage_strategy: str  # internal, external, minimal
-    recommended_models: list[str]
+    recommended_models: Tuple[str, ...]
     max_model_size: str
     use_neural_engine: bool
     enable_background_tasks: bool
@@ -1,15 +1,124 @@
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+import bisect
+import heapq
+import json
+import re
+import time
+from collections import OrderedDict
+from array import array
+from dataclasses import dataclass, field, InitVar
+from functools import lru_cache
+from itertools import chain
+from types import MappingProxyType
+from typing import List, Dict, Any, Optional, Tuple, Set, FrozenSet, Callable, Sequence, Mapping, Iterator
 from datetime import datetime
 from pathlib import Path
 
+from .compat import DATACLASS_SLOTS
 
-@dataclass
+
+_WORD_RE = re.compile(r"\w+")
+
+# Conversations kept in memory; older ones are handed off via take_spilled()
+HISTORY_WINDOW = 2048
+# Extra entries tolerated before trimming, so trims (and the index rebuild
+# they cause) happen once per HISTORY_SLACK additions
+HISTORY_SLACK = HISTORY_WINDOW // 4
+
+# Minimum cosine similarity for a conversation to count as relevant when
+# an embedder is configured
+SEMANTIC_MIN_SCORE = 0.25
+# Rows of the int8 embedding matrix converted to float32 at a time when
+# scoring, so search never holds a full-precision copy of the matrix
+SEMANTIC_BLOCK_ROWS = 4096
+
+# Semantic query cache: a new query reuses the results of an earlier one
+# whose embedding is at least this similar, within the TTL
+QUERY_CACHE_SIZE = 128
+QUERY_CACHE_TTL = 300.0  # seconds
+QUERY_CACHE_MIN_SCORE = 0.95
+
+
+STOPWORDS = frozenset({
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'can', 'do', 'does', 'for',
+    'from', 'how', 'i', 'in', 'is', 'it', 'me', 'my', 'of', 'on', 'or', 'please',
+    'so', 'that', 'the', 'this', 'to', 'was', 'we', 'what', 'when', 'where',
+    'which', 'why', 'with', 'you', 'your',
+})
+_SUFFIXES = ('ment', 'ing', 'ed', 'ly', 's')
+
+
+def _stem(word: str) -> str:
+    """Strip one common English suffix, keeping at least three characters"""
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == 's' and word.endswith('ss'):
+                break
+            return word[:-len(suffix)]
+    return word
+
+
+@lru_cache(maxsize=256)
+def _keyword_pattern(keywords: Tuple[str, ...]) -> "re.Pattern[str]":
+    """Compile keywords into one alternation so a single scan finds any of them"""
+    return re.compile('|'.join(map(re.escape, sorted(keywords, key=len, reverse=True))))
+
+
+def _tokenize(text_lower: str) -> FrozenSet[str]:
+    """Reduce lowercased text to the stemmed, stopword-free keywords used for history search"""
+    return frozenset(_stem(w) for w in _WORD_RE.findall(text_lower) if w not in STOPWORDS)
+
+
+def _trigram_bloom(text: str) -> int:
+    """
+    64-bit bloom filter of the text's character trigrams. Text containing a
+    substring has every bit of the substring's filter set (filters are
+    only compared within one process, so the salted str hash is fine).
+    """
+    bloom = 0
+    for i in range(len(text) - 2):
+        bloom |= 1 << (hash(text[i:i + 3]) & 63)
+    return bloom
+    
+
+# Fields the history index needs from each conversation:
+# (id, user_input, lowercased user_input, keywords, model_used, cost, tokens_used)
+_IndexRow = Tuple[str, str, str, FrozenSet[str], str, float, int]
+
+
+def _index_row(conversation: "Conversation") -> _IndexRow:
+    return (conversation.id, conversation.user_input, conversation._lower, conversation._words,
+            conversation.model_used, conversation.cost, conversation.tokens_used)
+    
+
+def _history_rows(history: Sequence["Conversation"]) -> Iterator[_IndexRow]:
+    """
+    Index rows per conversation. Lazily loaded histories provide rows()
+    so indexing doesn't hydrate them.
+    """
+    rows = getattr(history, 'rows', None)
+    if rows is None:
+        yield from map(_index_row, history)
+        return
+    for conv_id, user_input, model_used, cost, tokens_used in rows():
+        lower = user_input.lower()
+        yield conv_id, user_input, lower, _tokenize(lower), model_used, cost, tokens_used
+        
+
+def _quantize(vector: Any) -> Tuple[Any, float]:
+    """Scale a float vector into int8, returning (int8 vector, scale)"""
+    import numpy as np
+    
+    peak = float(np.abs(vector).max()) if len(vector) else 0.0
+    scale = peak / 127 if peak else 1.0
+    return np.clip(np.rint(vector / scale), -127, 127).astype(np.int8), scale
+    
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class Preferences:
-    """User preferences"""
+    """User preferences (immutable; build shared instances with make_preferences)"""
     performance_mode: str = "balanced"  # maximum, balanced, efficient
-    preferred_stack: List[str] = field(default_factory=list)
-    coding_style: Dict[str, str] = field(default_factory=dict)
+    preferred_stack: Tuple[str, ...] = ()
+    coding_style: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}), hash=False)
     working_hours: Optional[str] = None
     auto_commit: bool = False
     verbose_mode: bool = False
@@ -17,33 +126,147 @@ class Preferences:
     max_monthly_cost: float = 10.0
     theme: str = "auto"  # auto, light, dark
     
+    def __post_init__(self):
+        # Accept lists/dicts (e.g. from JSON) but store read-only copies
+        object.__setattr__(self, 'preferred_stack', tuple(self.preferred_stack))
+        object.__setattr__(self, 'coding_style', MappingProxyType(dict(self.coding_style)))
+        
+
+def make_preferences(**kwargs: Any) -> Preferences:
+    """Get a Preferences instance, shared with any earlier call using equal settings"""
+    stack = tuple(kwargs.pop('preferred_stack', ()))
+    style = tuple(sorted(dict(kwargs.pop('coding_style', None) or {}).items()))
+    return _interned_preferences(stack, style, tuple(sorted(kwargs.items())))
+    
+
+@lru_cache(maxsize=1024)
+def _interned_preferences(stack: Tuple[str, ...], style: Tuple[Tuple[str, str], ...],
+                          options: Tuple[Tuple[str, Any], ...]) -> Preferences:
+    return Preferences(preferred_stack=stack, coding_style=dict(style), **dict(options))
+    
+
+# (whole monotonic second, datetime.now() taken during it) for now_cached
+_last_now: Tuple[int, datetime] = (-1, datetime.min)
+
 
-@dataclass
+def now_cached() -> datetime:
+    """datetime.now() at one-second resolution, for timestamps taken in bursts"""
+    global _last_now
+    second = int(time.monotonic())
+    if second != _last_now[0]:
+        _last_now = (second, datetime.now())
+    return _last_now[1]
+    
+
+def _pack(value: Any) -> bytes:
+    """Compact JSON encoding used for Conversation's blob fields"""
+    return json.dumps(value, separators=(',', ':')).encode('utf-8')
+    
+
+@dataclass(**DATACLASS_SLOTS)
 class Conversation:
-    """Single conversation record"""
+    """
+    Single conversation record.
+    actions_taken and context are kept as encoded blobs (far smaller than
+    the dicts they hold) and only decoded when accessed.
+    """
     id: str
     timestamp: datetime
     user_input: str
     nova_response: str
-    actions_taken: List[Dict[str, Any]]
+    actions_taken: InitVar[List[Dict[str, Any]]]
     model_used: str
-    context: Dict[str, Any]
+    context: InitVar[Dict[str, Any]]
     tokens_used: int = 0
     cost: float = 0.0
+    _actions_blob: bytes = field(default=b"[]", init=False, repr=False)
+    _context_blob: bytes = field(default=b"{}", init=False, repr=False)
+    # Decoded blobs, filled on first access
+    _actions: Optional[List[Dict[str, Any]]] = field(default=None, init=False, repr=False, compare=False)
+    _context: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    # user_input lowercased and reduced to search keywords once, for history search
+    _lower: str = field(default="", init=False, repr=False, compare=False)
+    _words: FrozenSet[str] = field(default=frozenset(), init=False, repr=False, compare=False)
+    
+    def __post_init__(self, actions_taken: List[Dict[str, Any]], context: Dict[str, Any]):
+        self._lower = self.user_input.lower()
+        self._words = _tokenize(self._lower)
+        if actions_taken:
+            self._actions_blob = _pack(actions_taken)
+        if context:
+            self._context_blob = _pack(context)
+            
+
+def _actions_taken(self: Conversation) -> List[Dict[str, Any]]:
+    if self._actions is None:
+        self._actions = json.loads(self._actions_blob)
+    return self._actions
+    
+
+def _context(self: Conversation) -> Dict[str, Any]:
+    if self._context is None:
+        self._context = json.loads(self._context_blob)
+    return self._context
     
 
-@dataclass
+# Attached after class creation: a property in the class body would be
+# taken as the InitVar's default
+Conversation.actions_taken = property(_actions_taken, doc="Actions taken, decoded on first access")
+Conversation.context = property(_context, doc="Conversation context, decoded on first access")
+
+
+@dataclass(**DATACLASS_SLOTS)
 class UserProfile:
     """Complete user profile with history and preferences"""
     created_at: datetime
     last_active: datetime
     preferences: Preferences
     recent_projects: List[Dict[str, Any]]
+    # A list, or a LazyHistory (same list operations) for profiles loaded from disk
     conversation_history: List[Conversation]
     learned_patterns: Dict[str, Any]
     total_interactions: int = 0
     total_cost: float = 0.0
+    # Optional text -> vector function; when set, history search is semantic
+    embedder: Optional[Callable[[str], Sequence[float]]] = field(default=None, repr=False, compare=False)
     
+    # Conversations trimmed from conversation_history, awaiting archiving
+    _spilled: List[Conversation] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Derived per-conversation columns, kept in step with conversation_history
+    _indexed: Optional[List[Conversation]] = field(default=None, init=False, repr=False, compare=False)
+    _costs: array = field(default_factory=lambda: array('d'), init=False, repr=False, compare=False)
+    _tokens: array = field(default_factory=lambda: array('q'), init=False, repr=False, compare=False)
+    _model_idx: array = field(default_factory=lambda: array('i'), init=False, repr=False, compare=False)
+    _model_names: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Inverted index: word -> ascending positions in conversation_history
+    # (positions are appended in order, so the newest matches are at the end)
+    _postings: Dict[str, array] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Lowercased user_input per position, scanned when the index has no hit
+    _lower_inputs: List[str] = field(default_factory=list, init=False, repr=False, compare=False)
+    # 64-bit trigram bloom filter of each lowercased input (see _trigram_bloom)
+    _blooms: array = field(default_factory=lambda: array('Q'), init=False, repr=False, compare=False)
+    # _lower_inputs joined by NUL, with each input's start offset; rebuilt lazily
+    _corpus: str = field(default="", init=False, repr=False, compare=False)
+    _offsets: List[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    # Unit-length embeddings (embedder only) quantized to (int8 vector, scale),
+    # cached by conversation id so each user_input is embedded once; stacked
+    # lazily into _matrix/_scales for search
+    _vectors: List[Tuple[Any, float]] = field(default_factory=list, init=False, repr=False, compare=False)
+    _vector_cache: Dict[str, Tuple[Any, float]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    _matrix: Any = field(default=None, init=False, repr=False, compare=False)
+    _scales: Any = field(default=None, init=False, repr=False, compare=False)
+    # Keyword-path results by (query keywords, limit), plus the raw query
+    # words for results of the substring fallback
+    _kw_cache: Dict[Tuple[Any, ...], List[Conversation]] = field(
+        default_factory=dict, init=False, repr=False, compare=False)
+    # Query embedding bytes -> (stored at, query vector, limit, results)
+    _qcache: "OrderedDict[bytes, Tuple[float, Any, int, List[Conversation]]]" = field(
+        default_factory=OrderedDict, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._rebuild_index()
+        
     @property
     def active_project(self) -> Optional[Dict[str, Any]]:
         """Get most recent project"""
@@ -51,22 +274,257 @@ class UserProfile:
         
     def add_conversation(self, conversation: Conversation) -> None:
         """Add conversation to history"""
+        self._sync_index()
         self.conversation_history.append(conversation)
+        self._index_conversation(*_index_row(conversation))
         self.total_interactions += 1
         self.total_cost += conversation.cost
-        self.last_active = datetime.now()
+        self.last_active = now_cached()
+        
+        if len(self.conversation_history) > HISTORY_WINDOW + HISTORY_SLACK:
+            overflow = len(self.conversation_history) - HISTORY_WINDOW
+            self._spilled.extend(self.conversation_history[:overflow])
+            del self.conversation_history[:overflow]
+            self._rebuild_index()
+            
+    def take_spilled(self) -> List[Conversation]:
+        """Return and forget conversations trimmed from the in-memory window"""
+        spilled, self._spilled = self._spilled, []
+        return spilled
         
     def get_relevant_history(self, query: str, limit: int = 5) -> List[Conversation]:
-        """Get conversations relevant to query"""
-        # Simple keyword matching for now
-        # Could be enhanced with embeddings
-        keywords = query.lower().split()
-        relevant = []
-        
-        for conv in reversed(self.conversation_history):
-            if any(kw in conv.user_input.lower() for kw in keywords):
-                relevant.append(conv)
-                if len(relevant) >= limit:
-                    break
-                    
-        return relevant
\ No newline at end of file
+        """
+        Get conversations relevant to query.
+        Ranked by similarity when an embedder is set, otherwise newest first.
+        """
+        self._sync_index()
+        if self.embedder is not None and self._vectors:
+            return self._semantic_search(query, limit)
+            
+        # Keyword matching through the inverted index: only conversations
+        # sharing a keyword with the query are touched. Queries that reduce
+        # to the same keywords share one cache entry.
+        keywords = _tokenize(query.lower())
+        key = (keywords, limit)
+        cached = self._kw_cache.get(key)
+        if cached is not None:
+            return list(cached)
+            
+        postings = [self._postings[k] for k in keywords if k in self._postings]
+        if postings:
+            # History is in time order, so the newest `limit` matches are
+            # among the last `limit` positions of each keyword's postings
+            tails = [p[-limit:] for p in postings] if limit > 0 else []
+            positions = heapq.nlargest(limit, set(chain.from_iterable(tails)))
+        else:
+            # No whole-keyword match: fall back to substring matching
+            # (partial words such as 'kube' -> 'kubernetes'). That matches
+            # the raw query words, so they are part of the cache key.
+            key = (keywords, limit, tuple(query.lower().split()))
+            cached = self._kw_cache.get(key)
+            if cached is not None:
+                return list(cached)
+            positions = self._scan_inputs(query, limit)
+            
+        history = self.conversation_history
+        results = [history[i] for i in positions]
+        if len(self._kw_cache) >= QUERY_CACHE_SIZE:
+            del self._kw_cache[next(iter(self._kw_cache))]
+        self._kw_cache[key] = results
+        return list(results)
+        
+    def usage_by_model(self) -> Tuple[Dict[str, float], Dict[str, int]]:
+        """Get (cost, tokens) totals per model over the loaded history"""
+        import numpy as np
+        
+        self._sync_index()
+        if not self._model_names:
+            return {}, {}
+            
+        n_models = len(self._model_names)
+        model_idx = np.frombuffer(self._model_idx, dtype=np.int32)
+        costs = np.bincount(model_idx, weights=np.frombuffer(self._costs, dtype=np.float64),
+                            minlength=n_models)
+        tokens = np.bincount(model_idx, weights=np.frombuffer(self._tokens, dtype=np.int64),
+                             minlength=n_models)
+        
+        cost_by_model = {name: float(costs[i]) for name, i in self._model_names.items()}
+        tokens_by_model = {name: int(tokens[i]) for name, i in self._model_names.items()}
+        return cost_by_model, tokens_by_model
+        
+    def _scan_inputs(self, query: str, limit: int) -> List[int]:
+        """Positions of the newest inputs containing any query word as a substring"""
+        keywords = [w for w in query.lower().split() if w not in STOPWORDS]
+        if not keywords or limit <= 0:
+            return []
+            
+        # An input can only contain a keyword if its bloom filter has all of
+        # the keyword's trigram bits, so inputs newer than the newest such
+        # candidate are skipped, and no candidate means no match
+        newest = self._newest_bloom_candidate(keywords)
+        if newest < 0:
+            return []
+            
+        if len(self._offsets) != len(self._lower_inputs):
+            self._build_corpus()
+        corpus, offsets = self._corpus, self._offsets
+        
+        # Match all keywords in one pass with a single compiled alternation,
+        # over windows of inputs working back from the newest. Windows
+        # double in size, so the scan stops soon after `limit` inputs match.
+        pattern = _keyword_pattern(tuple(keywords))
+        found: Set[int] = set()
+        first = newest + 1
+        span = limit
+        while first > 0 and len(found) < limit:
+            window_first = max(0, first - span)
+            end = offsets[first] if first < len(offsets) else len(corpus)
+            for match in pattern.finditer(corpus, offsets[window_first], end):
+                found.add(bisect.bisect_right(offsets, match.start()) - 1)
+            first = window_first
+            span *= 2
+        return heapq.nlargest(limit, found)
+        
+    def _newest_bloom_candidate(self, keywords: List[str]) -> int:
+        """Position of the newest input whose bloom filter admits any keyword, or -1"""
+        import numpy as np
+        
+        blooms = np.frombuffer(self._blooms, dtype=np.uint64)
+        mask = np.zeros(len(blooms), dtype=bool)
+        for keyword in keywords:
+            bits = np.uint64(_trigram_bloom(keyword))
+            mask |= (blooms & bits) == bits
+        candidates = np.flatnonzero(mask)
+        return int(candidates[-1]) if len(candidates) else -1
+        
+    def _build_corpus(self) -> None:
+        """Join the lowercased inputs into one searchable buffer"""
+        offsets = []
+        start = 0
+        for text in self._lower_inputs:
+            offsets.append(start)
+            start += len(text) + 1
+        self._corpus = "\0".join(self._lower_inputs)
+        self._offsets = offsets
+        
+    def _semantic_search(self, query: str, limit: int) -> List[Conversation]:
+        """Top-k conversations by cosine similarity to the query"""
+        import numpy as np
+        
+        if limit <= 0:
+            return []
+        query_vector = self._embed(query)
+        cached = self._cached_results(query_vector, limit)
+        if cached is not None:
+            return cached
+            
+        if self._matrix is None:
+            self._matrix = np.stack([vector for vector, _ in self._vectors])
+            self._scales = np.array([scale for _, scale in self._vectors], dtype=np.float32)
+            
+        # Float dot products against the int8 rows, a block at a time, each
+        # block rescaled to cosines by its row scales
+        matrix, scales = self._matrix, self._scales
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), SEMANTIC_BLOCK_ROWS):
+            stop = start + SEMANTIC_BLOCK_ROWS
+            block = scores[start:stop]
+            np.matmul(matrix[start:stop].astype(np.float32), query_vector, out=block)
+            block *= scales[start:stop]
+        candidates = np.flatnonzero(scores >= SEMANTIC_MIN_SCORE)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+        ranked = candidates[np.argsort(-scores[candidates], kind='stable')]
+        
+        history = self.conversation_history
+        results = [history[i] for i in ranked]
+        
+        self._qcache[query_vector.tobytes()] = (time.monotonic(), query_vector, limit, results)
+        while len(self._qcache) > QUERY_CACHE_SIZE:
+            self._qcache.popitem(last=False)
+        return list(results)
+        
+    def _cached_results(self, query_vector: Any, limit: int) -> Optional[List[Conversation]]:
+        """Results of a recent, near-identical query, if any"""
+        now = time.monotonic()
+        best_key, best_score = None, QUERY_CACHE_MIN_SCORE
+        for key, (stored_at, vector, cached_limit, _) in list(self._qcache.items()):
+            if now - stored_at > QUERY_CACHE_TTL:
+                del self._qcache[key]
+                continue
+            if cached_limit < limit:
+                continue
+            score = float(vector @ query_vector)
+            if score >= best_score:
+                best_key, best_score = key, score
+                
+        if best_key is None:
+            return None
+        self._qcache.move_to_end(best_key)
+        return self._qcache[best_key][3][:limit]
+        
+    def _embed(self, text: str) -> Any:
+        """Embed text as a unit-length float32 vector"""
+        import numpy as np
+        
+        vector = np.asarray(self.embedder(text), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+        
+    def _index_conversation(self, conv_id: str, user_input: str, lower: str, keywords: FrozenSet[str],
+                            model_used: str, cost: float, tokens_used: int) -> None:
+        """Append a conversation's fields to the derived columns"""
+        self._kw_cache.clear()
+        if self.embedder is not None:
+            vector = self._vector_cache.get(conv_id)
+            if vector is None:
+                vector = _quantize(self._embed(user_input))
+                self._vector_cache[conv_id] = vector
+            self._vectors.append(vector)
+            self._matrix = None
+            self._qcache.clear()
+            
+        position = len(self._costs)
+        self._lower_inputs.append(lower)
+        self._blooms.append(_trigram_bloom(lower))
+        for word in keywords:
+            self._postings.setdefault(word, array('i')).append(position)
+            
+        model_idx = self._model_names.setdefault(model_used, len(self._model_names))
+        self._costs.append(cost)
+        self._tokens.append(tokens_used)
+        self._model_idx.append(model_idx)
+        
+    def _rebuild_index(self) -> None:
+        """Recompute the derived columns from conversation_history"""
+        self._costs = array('d')
+        self._tokens = array('q')
+        self._model_idx = array('i')
+        self._model_names = {}
+        self._postings = {}
+        self._lower_inputs = []
+        self._blooms = array('Q')
+        self._corpus = ""
+        self._offsets = []
+        self._vectors = []
+        self._matrix = None
+        self._scales = None
+        self._kw_cache.clear()
+        self._qcache.clear()
+        ids = []
+        for row in _history_rows(self.conversation_history):
+            self._index_conversation(*row)
+            ids.append(row[0])
+        self._indexed = self.conversation_history
+        if self.embedder is not None:
+            self._vector_cache = dict(zip(ids, self._vectors))
+        
+    def _sync_index(self) -> None:
+        """Catch the columns up if conversation_history was changed directly"""
+        history = self.conversation_history
+        stale_vectors = self.embedder is not None and len(self._vectors) != len(self._costs)
+        if history is not self._indexed or len(history) < len(self._costs) or stale_vectors:
+            self._rebuild_index()
+            return
+        for conversation in history[len(self._costs):]:
+            self._index_conversation(*_index_row(conversation))
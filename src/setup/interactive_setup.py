@@ -3,29 +3,217 @@ import sys
 import time
 import asyncio
 import subprocess
+import shutil
 import logging
 import json
+import math
 import re
+import shlex
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Dict, Tuple
-from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from typing import Optional, List, Dict, Sequence, Set, Tuple
+from rich.console import Console, Group
+from rich.progress import (
+    Progress,
+    SpinnerColumn,
+    TextColumn,
+    BarColumn,
+    DownloadColumn,
+    TransferSpeedColumn,
+    TimeRemainingColumn
+)
 from rich.prompt import Prompt, Confirm
 from rich.panel import Panel
 from rich.text import Text
+from rich.table import Table
+from rich.live import Live
 from rich import print as rprint
 
+from ..models.compat import DATACLASS_SLOTS
 from ..models import (
     SystemProfile,
     StorageConfig,
     ExternalStorageConfig,
     InternalStorageConfig,
     UserProfile,
-    Preferences
+    make_preferences
 )
 from ..core.system_analyzer import SmartSystemAnalyzer
 from ..memory.persistent_memory import PersistentMemory
 
+# Optional filesystem events for download progress
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+# Optional faster JSON encoding for the models manifest
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# ANSI sequences in ollama's output (synchronized-output and cursor
+# visibility modes, colour, erase-line), and its frame separators
+_ANSI_RE = re.compile(r'\x1b\[(?:\?(?:2026[hl]|25[lh])|[0-9;]*[mK])')
+_FRAME_SPLIT_RE = re.compile(rb'[\r\n]')
+# Units for _format_size, each 1024 times the last
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+# Where `ollama serve` listens
+_OLLAMA_HOST = '127.0.0.1'
+_OLLAMA_PORT = 11434
+# Backoff between attempts at a pull that failed on a dropped connection
+_PULL_RETRY_DELAYS = (0.05, 0.1, 0.2)
+_TRANSIENT_PULL_ERROR_RE = re.compile(
+    r'connection reset|i/o timeout|timed out|unexpected EOF|temporary failure|TLS handshake', re.IGNORECASE)
+
+
+def _markers_present(path: Path, markers: Sequence[str], bufsize: int = 65536) -> Set[str]:
+    """
+    Which of markers occur in a file, reading it once in chunks and
+    stopping as soon as all of them have been seen
+    """
+    targets = {marker: marker.encode('utf-8') for marker in markers}
+    overlap = max((len(target) for target in targets.values()), default=1) - 1
+    found: Set[str] = set()
+    tail = b''
+    with open(path, 'rb') as f:
+        while len(found) < len(targets):
+            chunk = f.read(bufsize)
+            if not chunk:
+                break
+            window = tail + chunk
+            found.update(marker for marker, target in targets.items() if target in window)
+            # Keep enough of the end to catch a match spanning two chunks
+            tail = window[-overlap:] if overlap else b''
+    return found
+
+
+def _file_contains(path: Path, needle: str, bufsize: int = 65536) -> bool:
+    """Whether a file contains needle, reading it in chunks and stopping at the first hit"""
+    return needle in _markers_present(path, (needle,), bufsize)
+
+
+def _append_missing(path: Path, additions: Sequence[Tuple[str, str]]):
+    """Append, in a single write, each (marker, text) whose marker an existing file lacks"""
+    if not path.exists():
+        return
+    present = _markers_present(path, [marker for marker, _ in additions])
+    missing = ''.join(text for marker, text in additions if marker not in present)
+    if missing:
+        with open(path, 'a') as f:
+            f.write(missing)
+
+
+if WATCHDOG_AVAILABLE:
+    class _BlobEvents(FileSystemEventHandler):
+        """Forwards blob file changes from the observer thread to an asyncio queue"""
+        
+        def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+            self._loop = loop
+            self._queue = queue
+            
+        def _forward(self, kind: str, path: str, moved_from: Optional[str] = None):
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, (kind, path, moved_from))
+            
+        def on_created(self, event):
+            if not event.is_directory:
+                self._forward('created', event.src_path)
+                
+        def on_modified(self, event):
+            if not event.is_directory:
+                self._forward('modified', event.src_path)
+                
+        def on_moved(self, event):
+            if not event.is_directory:
+                self._forward('moved', event.dest_path, event.src_path)
+                
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
+class ModelSpec:
+    """A model offered during setup"""
+    name: str
+    size_gb: float
+    description: str
+    capabilities: Tuple[str, ...]
+    recommended: bool = False
+    
+
+# Models offered per performance tier
+_MODELS_BY_TIER: Dict[str, Tuple[ModelSpec, ...]] = {
+    "ULTRA": (
+        ModelSpec('llama3.1:70b', 40.0, 'Most powerful model - exceptional reasoning and code generation',
+                  ('reasoning', 'code', 'creative writing', 'complex analysis'), recommended=True),
+        ModelSpec('codellama:34b', 20.0, 'Specialized for code generation and debugging',
+                  ('code', 'debugging', 'refactoring', 'documentation'), recommended=True),
+        ModelSpec('llama3.1:8b', 5.0, 'Balanced model - good for general tasks',
+                  ('general', 'code', 'reasoning')),
+    ),
+    "PRO": (
+        ModelSpec('llama3.1:8b', 5.0, 'Balanced model with excellent capabilities',
+                  ('general', 'code', 'reasoning'), recommended=True),
+        ModelSpec('mistral:7b', 4.0, 'Fast and efficient for most tasks',
+                  ('general', 'fast responses'), recommended=True),
+        ModelSpec('codellama:7b', 4.0, 'Code-focused model for development tasks',
+                  ('code', 'debugging')),
+    ),
+    "EFFICIENT": (
+        ModelSpec('llama3.1:8b', 5.0, 'Efficient model optimized for your system',
+                  ('general', 'basic code'), recommended=True),
+        ModelSpec('phi3:mini', 2.0, 'Ultra-fast model for quick responses',
+                  ('general', 'fast responses'), recommended=True),
+        ModelSpec('mistral:7b', 4.0, 'Alternative general-purpose model',
+                  ('general', 'reasoning')),
+    ),
+}
+
+# Full catalog for advanced selection, sorted by size
+_ALL_MODELS: Tuple[ModelSpec, ...] = tuple(sorted((
+    # Popular models
+    ModelSpec('llama3.1:8b', 5.0, 'Latest Llama 3.1 - excellent general purpose model', ('general', 'code', 'reasoning')),
+    ModelSpec('llama3.1:70b', 40.0, 'Largest Llama 3.1 - exceptional reasoning', ('reasoning', 'code', 'analysis')),
+    ModelSpec('mistral:7b', 4.0, 'Fast and efficient Mistral model', ('general', 'fast')),
+    ModelSpec('codellama:7b', 4.0, 'Code-specialized Llama model', ('code', 'debugging')),
+    ModelSpec('codellama:13b', 8.0, 'Larger code-specialized model', ('code', 'debugging')),
+    ModelSpec('codellama:34b', 20.0, 'Largest code model - expert level', ('code', 'architecture')),
+    ModelSpec('phi3:mini', 2.0, 'Microsoft\'s ultra-fast small model', ('general', 'fast')),
+    ModelSpec('phi3:medium', 8.0, 'Microsoft\'s balanced model', ('general', 'reasoning')),
+    ModelSpec('gemma:7b', 5.0, 'Google\'s Gemma model', ('general', 'reasoning')),
+    ModelSpec('qwen2:7b', 4.0, 'Qwen 2 - strong multilingual model', ('general', 'multilingual')),
+    ModelSpec('dolphin3:latest', 4.9, 'Dolphin 3.0 - Uncensored model', ('general', 'code', 'uncensored')),
+    ModelSpec('neural-chat:7b', 4.0, 'Conversational AI model', ('chat', 'general')),
+), key=lambda m: m.size_gb))
+
+
+# Primary model announced at the end of setup, per performance tier
+_PRIMARY_MODEL_BY_TIER: Dict[str, str] = {
+    "ULTRA": "llama3:70b",
+    "PRO": "llama3:13b",
+    "EFFICIENT": "llama3:7b"
+}
+
+# Description of each primary model; continuation lines are indented to
+# sit inside the announcement panel
+_PRIMARY_MODEL_DESCRIPTIONS: Dict[str, str] = {
+    "llama3:70b": """This is one of the most powerful open models available.
+      I can handle incredibly complex reasoning, architect massive systems,
+      and maintain context across long conversations. My responses are
+      thoughtful and nuanced.""",
+    
+    "llama3:13b": """A perfectly balanced brain - fast enough for instant responses
+      yet powerful enough for complex coding and system design. I'm running
+      entirely on your Mac, ensuring privacy and offline capability.""",
+    
+    "llama3:7b": """Optimized for efficiency while maintaining high intelligence.
+      I provide quick responses and can handle most tasks with minimal
+      resource usage."""
+}
+
 
 class InteractiveSetup:
     """
@@ -37,18 +225,32 @@ class InteractiveSetup:
         self.logger = logging.getLogger('NOVA.Setup')
         self.system_analyzer = SmartSystemAnalyzer()
         self.memory = PersistentMemory()
+        # `ollama list` result, cached by _get_installed_models
+        self._installed_models: Optional[Set[str]] = None
+        # /Volumes signature and the (name, mount point) pairs found for it,
+        # kept by _detect_external_drives; free space is always read fresh
+        self._drives_cache: Optional[Tuple[tuple, List[Tuple[str, str]]]] = None
+        # (marker, text) blocks for shell profiles, written by _ensure_shell_profile_lines
+        self._profile_additions: Dict[Path, List[Tuple[str, str]]] = {}
+        # Pause between conversational messages; NOVA_ANIMATE=0 disables it
+        self._anim_delay = 0.0 if os.environ.get('NOVA_ANIMATE') == '0' else 1.0
+        self._home = Path.home()
+        self._ollama_blobs_default = self._home / '.ollama' / 'models' / 'blobs'
         
     async def run_first_time_setup(self) -> Tuple[SystemProfile, StorageConfig, UserProfile]:
         """Run the complete first-time setup flow"""
+        # Start analyzing the system while the awakening message plays
+        analyze_task = asyncio.create_task(self.system_analyzer.analyze_mac())
+        
         # Show awakening message
-        self._show_awakening_message()
+        await self._show_awakening_message()
         
         # Analyze system
         self.console.print("\n[cyan]NOVA:[/cyan] Let me learn about your system and preferences...\n")
-        system_profile = await self._analyze_system_with_progress()
+        system_profile = await self._analyze_system_with_progress(analyze_task)
         
         # Announce system capabilities
-        self._announce_system_capabilities(system_profile)
+        await self._announce_system_capabilities(system_profile)
         
         # Setup storage
         storage_config = await self._setup_storage_interactively(system_profile)
@@ -65,6 +267,9 @@ class InteractiveSetup:
         # Install terminal command
         await self._install_terminal_command()
         
+        # Write the shell profile changes queued above
+        await self._ensure_shell_profile_lines()
+        
         # Save everything
         await self.memory.save_profile(user_profile)
         
@@ -73,7 +278,7 @@ class InteractiveSetup:
         
         return system_profile, storage_config, user_profile
         
-    def _show_awakening_message(self):
+    async def _show_awakening_message(self):
         """Display the NOVA awakening ASCII art and message"""
         ascii_art = """
     ╔═══════════════════════════════════════╗
@@ -84,16 +289,16 @@ class InteractiveSetup:
         """
         
         self.console.print(ascii_art, style="bright_cyan")
-        time.sleep(1)
+        await asyncio.sleep(self._anim_delay)
         
         self.console.print("\n[bright_white]NOVA: Hello. I'm NOVA, awakening on your Mac for the first time.[/bright_white]")
-        time.sleep(1.5)
+        await asyncio.sleep(1.5 * self._anim_delay)
         
         self.console.print("\n[bright_white]I embody the unified genius of Linus Torvalds, Steve Jobs, and Jony Ive.[/bright_white]")
-        time.sleep(1.5)
+        await asyncio.sleep(1.5 * self._anim_delay)
         
-    async def _analyze_system_with_progress(self) -> SystemProfile:
-        """Analyze system with progress indicator"""
+    async def _analyze_system_with_progress(self, pending: Optional[asyncio.Task] = None) -> SystemProfile:
+        """Analyze system with progress indicator, or wait for an analysis already started"""
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -102,13 +307,13 @@ class InteractiveSetup:
             task = progress.add_task("Analyzing your Mac...", total=None)
             
             # Run analysis
-            system_profile = await self.system_analyzer.analyze_mac()
+            system_profile = await (pending or self.system_analyzer.analyze_mac())
             
             progress.update(task, completed=True)
             
         return system_profile
         
-    def _announce_system_capabilities(self, profile: SystemProfile):
+    async def _announce_system_capabilities(self, profile: SystemProfile):
         """Announce discovered system capabilities conversationally"""
         # Craft a beautiful description
         if profile.chip_type == "Apple Silicon":
@@ -120,7 +325,7 @@ class InteractiveSetup:
                           f"{profile.ram_gb}GB of {'unified' if profile.unified_memory else ''} memory, "
                           f"and {profile.storage_gb}GB storage.")
         
-        time.sleep(1)
+        await asyncio.sleep(self._anim_delay)
         
         tier_messages = {
             "ULTRA": "This is an exceptionally powerful machine. We'll do incredible work together.",
@@ -129,13 +334,13 @@ class InteractiveSetup:
         }
         
         self.console.print(f"\n[cyan]NOVA:[/cyan] {tier_messages[profile.performance_tier]}")
-        time.sleep(1)
+        await asyncio.sleep(self._anim_delay)
         
     async def _setup_storage_interactively(self, profile: SystemProfile) -> StorageConfig:
         """Interactive storage setup conversation"""
-        self.console.print("\n[cyan]NOVA:[/cyan] I need to download AI models (20-50GB).")
-        self.console.print("[cyan]      [/cyan] I can use your internal drive, but an external drive ")
-        self.console.print("[cyan]      [/cyan] would keep your Mac faster.")
+        self.console.print("\n[cyan]NOVA:[/cyan] I need to download AI models (20-50GB).\n"
+                           "[cyan]      [/cyan] I can use your internal drive, but an external drive\n"
+                           "[cyan]      [/cyan] would keep your Mac faster.")
         
         use_external = Confirm.ask("\n[yellow]Do you have an external drive you'd like to use?[/yellow]")
         
@@ -146,8 +351,8 @@ class InteractiveSetup:
             
     async def _setup_external_storage(self) -> ExternalStorageConfig:
         """Set up external drive storage"""
-        self.console.print("\n[cyan]NOVA:[/cyan] Excellent choice. Please connect your external drive now.")
-        self.console.print("[cyan]      [/cyan] I'll wait...")
+        self.console.print("\n[cyan]NOVA:[/cyan] Excellent choice. Please connect your external drive now.\n"
+                           "[cyan]      [/cyan] I'll wait...")
         
         # Wait for external drives
         drives = await self._wait_for_external_drives()
@@ -183,7 +388,7 @@ class InteractiveSetup:
         return ExternalStorageConfig(
             use_external=True,
             external_path=nova_path,
-            internal_path=Path.home() / '.nova',
+            internal_path=self._home / '.nova',
             strategy='maximum',
             prefer_cloud_apis=False,
             auto_cleanup=False,
@@ -196,14 +401,17 @@ class InteractiveSetup:
         
     async def _setup_internal_storage_wisely(self, profile: Optional[SystemProfile]) -> InternalStorageConfig:
         """Set up internal storage with smart defaults"""
-        self.console.print("\n[cyan]NOVA:[/cyan] No problem. I'll use your internal storage efficiently.")
-        self.console.print("[cyan]      [/cyan] I'll download only essential models and use cloud APIs")
-        self.console.print("[cyan]      [/cyan] when needed to save space.")
-        self.console.print("[cyan]      [/cyan] We can always add an external drive later.")
-        
-        # Calculate available space for NOVA
-        disk_usage = os.statvfs('/')
-        available_gb = (disk_usage.f_bavail * disk_usage.f_frsize) // (1024**3)
+        self.console.print("\n[cyan]NOVA:[/cyan] No problem. I'll use your internal storage efficiently.\n"
+                           "[cyan]      [/cyan] I'll download only essential models and use cloud APIs\n"
+                           "[cyan]      [/cyan] when needed to save space.\n"
+                           "[cyan]      [/cyan] We can always add an external drive later.")
+        
+        # Calculate available space for NOVA on the volume it will live on,
+        # which need not be the one mounted at /
+        nova_path = self._home / '.nova'
+        measured_path = nova_path if nova_path.exists() else self._home
+        disk_usage = await asyncio.to_thread(shutil.disk_usage, measured_path)
+        available_gb = disk_usage.free >> 30  # bytes -> GB
         
         # Conservative allocation - max 20% of free space or 50GB
         nova_allocation_gb = min(50, available_gb // 5)
@@ -211,7 +419,7 @@ class InteractiveSetup:
         return InternalStorageConfig(
             use_external=False,
             external_path=None,
-            internal_path=Path.home() / '.nova',
+            internal_path=nova_path,
             strategy='minimal',
             prefer_cloud_apis=True,
             auto_cleanup=True,
@@ -229,8 +437,7 @@ class InteractiveSetup:
             "3. Battery Saver - Minimal resource usage"
         ]
         
-        for option in options:
-            self.console.print(f"  {option}")
+        self.console.print("\n".join(f"  {option}" for option in options))
             
         choice = Prompt.ask("\n[yellow]Choose (1-3)[/yellow]", 
                           choices=['1', '2', '3'],
@@ -259,8 +466,8 @@ class InteractiveSetup:
             available_space_gb = storage_config.available_for_nova_gb
             storage_path = storage_config.internal_path
             
-        self.console.print(f"\n[cyan]NOVA:[/cyan] Available space: {available_space_gb}GB")
-        self.console.print(f"[cyan]      [/cyan] Storage location: {storage_path}")
+        self.console.print(f"\n[cyan]NOVA:[/cyan] Available space: {available_space_gb}GB\n"
+                           f"[cyan]      [/cyan] Storage location: {storage_path}")
         
         # Show model options
         self.console.print("\n[cyan]NOVA:[/cyan] Available AI models:")
@@ -269,24 +476,22 @@ class InteractiveSetup:
         remaining_space = available_space_gb
         
         for i, model in enumerate(available_models):
-            recommended_text = "[bold green](Recommended)[/bold green]" if model['recommended'] else ""
-            self.console.print(f"\n  {i+1}. {model['name']} ({model['size_gb']}GB) {recommended_text}")
-            self.console.print(f"     {model['description']}")
-            self.console.print(f"     Capabilities: {', '.join(model['capabilities'])}")
+            recommended_text = "[bold green](Recommended)[/bold green]" if model.recommended else ""
+            space_text = "" if remaining_space >= model.size_gb else " [red](not enough space)[/red]"
+            self.console.print(f"\n  {i+1}. {model.name} ({model.size_gb}GB) {recommended_text}{space_text}\n"
+                               f"     {model.description}\n"
+                               f"     Capabilities: {', '.join(model.capabilities)}")
             
-            if remaining_space >= model['size_gb']:
-                install = Confirm.ask(f"\n[yellow]Install {model['name']}?[/yellow]")
+        # Suggest the recommended models that fit, in order
+        suggested = []
+        suggested_space = remaining_space
+        for i, model in enumerate(available_models):
+            if model.recommended and suggested_space >= model.size_gb:
+                suggested.append(str(i + 1))
+                suggested_space -= model.size_gb
                 
-                if install:
-                    selected_models.append(model)
-                    remaining_space -= model['size_gb']
-                    
-                    self.console.print(f"[green]✓[/green] Added {model['name']} to download queue")
-                    self.console.print(f"[cyan]  Space remaining: {remaining_space:.1f}GB[/cyan]")
-                else:
-                    self.console.print(f"[yellow]⚠[/yellow] Skipped {model['name']}")
-            else:
-                self.console.print(f"[red]✗[/red] Not enough space for {model['name']} (need {model['size_gb']}GB, have {remaining_space:.1f}GB)")
+        remaining_space = self._pick_models(available_models, selected_models, remaining_space,
+                                            default=",".join(suggested))
         
         # Add option to browse all models
         self.console.print("\n[dim]Would you like to see all available models for advanced selection?[/dim]")
@@ -297,11 +502,14 @@ class InteractiveSetup:
                 
         # Show summary
         if selected_models:
-            total_download_size = sum(model['size_gb'] for model in selected_models)
-            self.console.print(f"\n[cyan]NOVA:[/cyan] Download summary:")
-            self.console.print(f"  Models: {len(selected_models)}")
-            self.console.print(f"  Total size: {total_download_size:.1f}GB")
-            self.console.print(f"  Space after download: {remaining_space:.1f}GB")
+            # One exact sum of the final selection, rather than trusting the
+            # running subtraction done while picking
+            total_download_size = math.fsum(model.size_gb for model in selected_models)
+            remaining_space = available_space_gb - total_download_size
+            self.console.print(f"\n[cyan]NOVA:[/cyan] Download summary:\n"
+                               f"  Models: {len(selected_models)}\n"
+                               f"  Total size: {total_download_size:.1f}GB\n"
+                               f"  Space after download: {remaining_space:.1f}GB")
             
             proceed = Confirm.ask("\n[yellow]Proceed with download?[/yellow]")
             
@@ -310,142 +518,82 @@ class InteractiveSetup:
             else:
                 self.console.print("[yellow]NOVA: You can download models later with 'nova models install'[/yellow]")
         else:
-            self.console.print("\n[yellow]NOVA: No models selected. I'll use cloud APIs for now.[/yellow]")
-            self.console.print("[yellow]      You can install models later with 'nova models install'[/yellow]")
+            self.console.print("\n[yellow]NOVA: No models selected. I'll use cloud APIs for now.[/yellow]\n"
+                               "[yellow]      You can install models later with 'nova models install'[/yellow]")
             
-    def _get_models_for_tier(self, tier: str) -> List[Dict]:
+    def _get_models_for_tier(self, tier: str) -> Tuple[ModelSpec, ...]:
         """Get available models for system tier"""
-        if tier == "ULTRA":
-            return [
-                {
-                    'name': 'llama3.1:70b',
-                    'size_gb': 40.0,
-                    'description': 'Most powerful model - exceptional reasoning and code generation',
-                    'capabilities': ['reasoning', 'code', 'creative writing', 'complex analysis'],
-                    'recommended': True
-                },
-                {
-                    'name': 'codellama:34b',
-                    'size_gb': 20.0,
-                    'description': 'Specialized for code generation and debugging',
-                    'capabilities': ['code', 'debugging', 'refactoring', 'documentation'],
-                    'recommended': True
-                },
-                {
-                    'name': 'llama3.1:8b',
-                    'size_gb': 5.0,
-                    'description': 'Balanced model - good for general tasks',
-                    'capabilities': ['general', 'code', 'reasoning'],
-                    'recommended': False
-                }
-            ]
-        elif tier == "PRO":
-            return [
-                {
-                    'name': 'llama3.1:8b',
-                    'size_gb': 5.0,
-                    'description': 'Balanced model with excellent capabilities',
-                    'capabilities': ['general', 'code', 'reasoning'],
-                    'recommended': True
-                },
-                {
-                    'name': 'mistral:7b',
-                    'size_gb': 4.0,
-                    'description': 'Fast and efficient for most tasks',
-                    'capabilities': ['general', 'fast responses'],
-                    'recommended': True
-                },
-                {
-                    'name': 'codellama:7b',
-                    'size_gb': 4.0,
-                    'description': 'Code-focused model for development tasks',
-                    'capabilities': ['code', 'debugging'],
-                    'recommended': False
-                }
-            ]
-        else:  # EFFICIENT
-            return [
-                {
-                    'name': 'llama3.1:8b',
-                    'size_gb': 5.0,
-                    'description': 'Efficient model optimized for your system',
-                    'capabilities': ['general', 'basic code'],
-                    'recommended': True
-                },
-                {
-                    'name': 'phi3:mini',
-                    'size_gb': 2.0,
-                    'description': 'Ultra-fast model for quick responses',
-                    'capabilities': ['general', 'fast responses'],
-                    'recommended': True
-                },
-                {
-                    'name': 'mistral:7b',
-                    'size_gb': 4.0,
-                    'description': 'Alternative general-purpose model',
-                    'capabilities': ['general', 'reasoning'],
-                    'recommended': False
-                }
-            ]
+        return _MODELS_BY_TIER.get(tier, _MODELS_BY_TIER["EFFICIENT"])
     
-    async def _show_all_models(self, remaining_space: float, selected_models: List[Dict]) -> float:
+    async def _show_all_models(self, remaining_space: float, selected_models: List[ModelSpec]) -> float:
         """Show all available models for advanced selection"""
         self.console.print("\n[cyan]NOVA:[/cyan] All available models:")
         
-        all_models = [
-            # Popular models
-            {'name': 'llama3.1:8b', 'size_gb': 5.0, 'description': 'Latest Llama 3.1 - excellent general purpose model', 'capabilities': ['general', 'code', 'reasoning']},
-            {'name': 'llama3.1:70b', 'size_gb': 40.0, 'description': 'Largest Llama 3.1 - exceptional reasoning', 'capabilities': ['reasoning', 'code', 'analysis']},
-            {'name': 'mistral:7b', 'size_gb': 4.0, 'description': 'Fast and efficient Mistral model', 'capabilities': ['general', 'fast']},
-            {'name': 'codellama:7b', 'size_gb': 4.0, 'description': 'Code-specialized Llama model', 'capabilities': ['code', 'debugging']},
-            {'name': 'codellama:13b', 'size_gb': 8.0, 'description': 'Larger code-specialized model', 'capabilities': ['code', 'debugging']},
-            {'name': 'codellama:34b', 'size_gb': 20.0, 'description': 'Largest code model - expert level', 'capabilities': ['code', 'architecture']},
-            {'name': 'phi3:mini', 'size_gb': 2.0, 'description': 'Microsoft\'s ultra-fast small model', 'capabilities': ['general', 'fast']},
-            {'name': 'phi3:medium', 'size_gb': 8.0, 'description': 'Microsoft\'s balanced model', 'capabilities': ['general', 'reasoning']},
-            {'name': 'gemma:7b', 'size_gb': 5.0, 'description': 'Google\'s Gemma model', 'capabilities': ['general', 'reasoning']},
-            {'name': 'qwen2:7b', 'size_gb': 4.0, 'description': 'Qwen 2 - strong multilingual model', 'capabilities': ['general', 'multilingual']},
-            {'name': 'dolphin3:latest', 'size_gb': 4.9, 'description': 'Dolphin 3.0 - Uncensored model', 'capabilities': ['general', 'code', 'uncensored']},
-            {'name': 'neural-chat:7b', 'size_gb': 4.0, 'description': 'Conversational AI model', 'capabilities': ['chat', 'general']},
-        ]
-        
         # Show all models with space check
         self.console.print("\n[dim]Available models (sorted by size):[/dim]")
         
-        # Sort by size
-        all_models.sort(key=lambda x: x['size_gb'])
-        
-        for i, model in enumerate(all_models):
+        for i, model in enumerate(_ALL_MODELS):
             # Check if already selected
-            already_selected = any(sel['name'] == model['name'] for sel in selected_models)
+            already_selected = any(sel.name == model.name for sel in selected_models)
             
             if already_selected:
                 status = "[green]✓ Selected[/green]"
-            elif remaining_space >= model['size_gb']:
+            elif remaining_space >= model.size_gb:
                 status = "[yellow]Available[/yellow]"
             else:
                 status = "[red]Not enough space[/red]"
                 
-            self.console.print(f"\n  {i+1:2}. {model['name']:20} ({model['size_gb']:4.1f}GB) {status}")
-            self.console.print(f"      {model['description']}")
-            self.console.print(f"      Capabilities: {', '.join(model['capabilities'])}")
+            self.console.print(f"\n  {i+1:2}. {model.name:20} ({model.size_gb:4.1f}GB) {status}\n"
+                               f"      {model.description}\n"
+                               f"      Capabilities: {', '.join(model.capabilities)}")
             
-            # Ask if they want to install (if not already selected and space available)
-            if not already_selected and remaining_space >= model['size_gb']:
-                install = Confirm.ask(f"\n[yellow]Install {model['name']}?[/yellow]", default=False)
-                
-                if install:
-                    selected_models.append(model)
-                    remaining_space -= model['size_gb']
-                    
-                    self.console.print(f"[green]✓[/green] Added {model['name']} to download queue")
-                    self.console.print(f"[cyan]  Space remaining: {remaining_space:.1f}GB[/cyan]")
+        remaining_space = self._pick_models(_ALL_MODELS, selected_models, remaining_space)
         
         self.console.print(f"\n[cyan]Final selection complete. Space remaining: {remaining_space:.1f}GB[/cyan]")
         return remaining_space
             
-    async def _download_models(self, models: List[Dict], storage_path: Path):
-        """Download selected models using parallel downloads with progress"""
-        self.console.print("\n[cyan]NOVA:[/cyan] Starting parallel model downloads...")
+    def _pick_models(self, models: Sequence[ModelSpec], selected_models: List[ModelSpec],
+                     remaining_space: float, default: str = "") -> float:
+        """
+        Ask once for the models to install, by their listed numbers, and add
+        those that fit to selected_models. Returns the space left.
+        """
+        answer = Prompt.ask(
+            "\n[yellow]Models to install[/yellow] [dim](numbers separated by commas, blank for none)[/dim]",
+            default=default,
+            show_default=bool(default)
+        )
+        
+        # Outcome lines, printed together once the selection is settled
+        lines = []
+        chosen = []
+        for token in re.split(r'[\s,]+', answer.strip()):
+            if token.isdigit() and 1 <= int(token) <= len(models):
+                model = models[int(token) - 1]
+                if model not in chosen:
+                    chosen.append(model)
+            elif token:
+                lines.append(f"[yellow]⚠[/yellow] Ignoring '{token}' (not a listed number)")
+                
+        selected_names = {model.name for model in selected_models}
+        for model in chosen:
+            if model.name in selected_names:
+                continue
+            if model.size_gb > remaining_space:
+                lines.append(f"[red]✗[/red] Not enough space for {model.name} (need {model.size_gb}GB, have {remaining_space:.1f}GB)")
+                continue
+            selected_models.append(model)
+            selected_names.add(model.name)
+            remaining_space -= model.size_gb
+            lines.append(f"[green]✓[/green] Added {model.name} to download queue")
+            
+        lines.append(f"[cyan]  Space remaining: {remaining_space:.1f}GB[/cyan]")
+        self.console.print("\n".join(lines))
+        return remaining_space
+        
+    async def _download_models(self, models: List[ModelSpec], storage_path: Path):
+        """Download selected models, in parallel if the user agrees, with progress"""
+        self.console.print("\n[cyan]NOVA:[/cyan] Preparing model downloads...")
         
         # Create models directory
         models_dir = storage_path / 'models'
@@ -458,23 +606,13 @@ class InteractiveSetup:
         self.console.print(f"[dim]Using storage location: {models_dir}[/dim]")
         
         # First, check which models are already installed
-        installed_models = set()
-        try:
-            result = subprocess.run(['ollama', 'list'], capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines:
-                    if line.strip():
-                        model_name = line.split()[0]
-                        installed_models.add(model_name)
-        except:
-            pass
+        installed_models = await self._get_installed_models()
         
         # Filter out already installed models
         models_to_download = []
         for model in models:
-            if model['name'] in installed_models:
-                self.console.print(f"[green]✓[/green] {model['name']} already installed")
+            if model.name in installed_models:
+                self.console.print(f"[green]✓[/green] {model.name} already installed")
             else:
                 models_to_download.append(model)
         
@@ -483,7 +621,7 @@ class InteractiveSetup:
             return
         
         # Ask about parallel downloads
-        max_concurrent = 3
+        max_concurrent = 1
         if len(models_to_download) > 1:
             response = Prompt.ask(
                 f"\n[cyan]NOVA:[/cyan] Download {len(models_to_download)} models in parallel? (faster but uses more bandwidth)",
@@ -501,225 +639,282 @@ class InteractiveSetup:
                 except:
                     max_concurrent = 3
                     
-                await self._download_models_parallel(models_to_download, models_dir, ollama_env, max_concurrent)
-                return
+        # More parallel pulls than cores only contend with each other
+        max_concurrent = min(max_concurrent, os.cpu_count() or 4)
+        results = await self._pull_all(models_to_download, models_dir, ollama_env, max_concurrent)
         
-        # Fall back to serial downloads if user prefers or only one model
-        for i, model in enumerate(models_to_download):
-                
-            self.console.print(f"\n[cyan]Downloading {model['name']} ({i+1}/{len(models)})...[/cyan]")
+        if not all(results.values()):
+            self.console.print("\n[yellow]Some models failed to download. You can retry them later with 'nova models install'[/yellow]")
+        else:
+            self.console.print("\n[green]Model downloads completed![/green]")
+        
+        # Configure Ollama to permanently use this location
+        await self._configure_ollama_storage(models_dir)
+        
+    async def _get_installed_models(self) -> Set[str]:
+        """Names from `ollama list`, fetched once per setup session"""
+        if self._installed_models is not None:
+            return self._installed_models
             
-            try:
-                # Start download process with custom environment
-                process = subprocess.Popen(
-                    ['ollama', 'pull', model['name']],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True,
-                    bufsize=1,
-                    universal_newlines=True,
-                    env=ollama_env
-                )
-                
-                # Simple progress monitoring without buggy progress bar
-                expected_size_mb = int(model['size_gb'] * 1024)  # Convert GB to MB
-                self.console.print(f"[dim]Expected size: {model['size_gb']}GB ({expected_size_mb}MB)[/dim]")
-                
-                # Monitor the actual download location (follows symlink)
-                ollama_path = Path.home() / '.ollama' / 'models' / 'blobs'
-                
-                # Get initial sizes
-                def get_dir_size_mb(path):
-                    """Get directory size in MB using du command"""
-                    try:
-                        # Use du -m for megabytes
-                        result = subprocess.run(
-                            ['du', '-m', str(path)], 
-                            capture_output=True, 
-                            text=True
-                        )
-                        if result.returncode == 0:
-                            return int(result.stdout.split()[0])
-                    except:
-                        pass
-                    return 0
-                
-                initial_size_mb = get_dir_size_mb(ollama_path)
-                last_update_time = time.time()
-                last_size_mb = initial_size_mb
-                download_speed = 0
-                dots = 0
+        names: Set[str] = set()
+        try:
+            process = await asyncio.create_subprocess_exec(
+                'ollama', 'list',
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            stdout, _ = await process.communicate()
+            if process.returncode == 0:
+                lines = stdout.decode(errors='replace').splitlines()[1:]  # Skip header
+                names = {line.split(maxsplit=1)[0] for line in lines if line.strip()}
+        except OSError:
+            # Ollama not installed
+            pass
+            
+        self._installed_models = names
+        return names
+        
+    def _ollama_blobs(self) -> Path:
+        """Directory ollama stores model blobs in, honouring OLLAMA_MODELS"""
+        models = os.environ.get('OLLAMA_MODELS')
+        return Path(models) / 'blobs' if models else self._ollama_blobs_default
+        
+    async def _pull_all(self, models: List[ModelSpec], models_dir: Path, ollama_env: dict,
+                        max_concurrent: int) -> Dict[str, bool]:
+        """Pull models, at most max_concurrent at a time, with one live status row per model"""
+        self.console.print(f"\n[cyan]Downloading {len(models)} model(s), {max_concurrent} at a time[/cyan]")
+        
+        rows = {model.name: "[dim]Queued[/dim]" for model in models}
+        
+        class StatusRows:
+            """Per-model status table, rebuilt only when Live refreshes"""
+            def __rich__(self) -> Table:
+                table = Table(show_header=False, box=None)
+                for name, status in rows.items():
+                    table.add_row(f"[cyan]{name}[/cyan]", status)
+                return table
                 
-                # Monitor both process and ollama output
-                while process.poll() is None:
-                    # Read any output from ollama
-                    line = process.stdout.readline()
-                    if line:
-                        # Try to parse progress from ollama output
-                        line = line.strip()
-                        if '%' in line or 'pulling' in line.lower():
-                            # Clean ANSI codes
-                            clean_line = re.sub(r'\x1b\[[0-9;]*[mK]', '', line)
-                            if clean_line and not clean_line.startswith('\r'):
-                                self.console.print(f"[dim]{clean_line}[/dim]")
-                    
-                    # Check actual disk usage every 3 seconds
-                    current_time = time.time()
-                    if current_time - last_update_time >= 3:
-                        current_size_mb = get_dir_size_mb(ollama_path)
-                        downloaded_mb = current_size_mb - initial_size_mb
-                        downloaded_gb = downloaded_mb / 1024
-                        
-                        # Calculate speed
-                        size_diff_mb = current_size_mb - last_size_mb
-                        time_diff = current_time - last_update_time
-                        if time_diff > 0:
-                            download_speed = size_diff_mb / time_diff  # MB/s
-                        
-                        # Calculate percentage for progress bar
-                        if expected_size_mb > 0:
-                            percent = min(100, int((downloaded_mb * 100) / expected_size_mb))
-                        else:
-                            percent = 0
-                        
-                        # Create progress bar (40 chars)
-                        filled = int(percent * 40 / 100)
-                        empty = 40 - filled
-                        progress_bar = "[" + "=" * filled + "-" * empty + "]"
-                        
-                        # Show update with progress bar
-                        current_time_str = time.strftime('%H:%M:%S')
-                        if downloaded_mb > 0:  # Show progress
-                            speed_text = f" @ {download_speed:.1f}MB/s" if download_speed > 0 else ""
-                            
-                            self.console.print(
-                                f"{current_time_str} - {model['name']}: {downloaded_mb}MB {progress_bar} {model['size_gb']}GB ({percent}%){speed_text}",
-                                end="\r"
-                            )
-                        else:
-                            # Show waiting
-                            dots = (dots + 1) % 4
-                            self.console.print(
-                                f"{current_time_str} - Waiting for {model['name']} download{'.' * dots}                ",
-                                end="\r"
-                            )
-                        
-                        last_update_time = current_time
-                        last_size_mb = current_size_mb
+        # Ollama writes every model's blobs to one directory, so progress is
+        # tracked as a single combined task
+        progress = Progress(
+            TextColumn("[bold]{task.description}[/bold]"),
+            BarColumn(),
+            DownloadColumn(),
+            TransferSpeedColumn(),
+            TimeRemainingColumn(),
+            console=self.console
+        )
+        expected_bytes = int(sum(model.size_gb for model in models) * 1024 ** 3)
+        total_task = progress.add_task("Total", total=expected_bytes)
+        
+        # Monitor the actual download location (follows symlink)
+        ollama_path = self._ollama_blobs()
+        
+        def get_dir_size(path) -> int:
+            """Get directory size in bytes by summing file sizes (no du process)"""
+            total = 0
+            pending = [path]
+            while pending:
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                total += entry.stat(follow_symlinks=False).st_size
+                except OSError:
+                    # Missing directory, or blobs removed mid-walk
+                    pass
+            return total
+            
+        with Live(Group(StatusRows(), progress), console=self.console, refresh_per_second=4):
+            
+            async def sample_disk_usage():
+                """Feed the combined downloaded size to the progress task every 3 seconds"""
+                initial_size = await asyncio.to_thread(get_dir_size, ollama_path)
+                while True:
+                    await asyncio.sleep(3)
+                    current_size = await asyncio.to_thread(get_dir_size, ollama_path)
+                    progress.update(total_task, completed=min(expected_bytes, max(0, current_size - initial_size)))
                     
-                    await asyncio.sleep(0.5)
-                
-                # Wait for process to complete with timeout
+            async def watch_disk_usage():
+                """Feed bytes written to blob files to the progress task as the files change"""
+                queue: asyncio.Queue = asyncio.Queue()
+                observer = Observer()
+                observer.schedule(_BlobEvents(asyncio.get_running_loop(), queue),
+                                  str(ollama_path), recursive=True)
+                observer.start()
+                # Last seen size per blob file; growth of files that existed
+                # before the download is counted from their first event
+                sizes: Dict[str, int] = {}
+                downloaded = 0
                 try:
-                    stdout, stderr = await asyncio.wait_for(
-                        asyncio.create_task(asyncio.to_thread(process.communicate)),
-                        timeout=300  # 5 minute timeout
-                    )
-                except asyncio.TimeoutError:
-                    self.console.print(f"\n[yellow]Download timeout for {model['name']}[/yellow]")
-                    process.terminate()
-                    stdout, stderr = "", "Download timeout"
-                
-                # Clear the progress line
-                self.console.print(" " * 80, end="\r")
-                
-                if process.returncode == 0:
-                    self.console.print(f"[green]✓[/green] {model['name']} downloaded successfully")
+                    while True:
+                        changed = [await queue.get()]
+                        while not queue.empty():
+                            changed.append(queue.get_nowait())
+                        for kind, path, moved_from in changed:
+                            if kind == 'moved':
+                                sizes[path] = sizes.pop(moved_from, 0)
+                                continue
+                            try:
+                                size = os.stat(path).st_size
+                            except OSError:
+                                continue
+                            previous = sizes.get(path, 0 if kind == 'created' else size)
+                            if size > previous:
+                                downloaded += size - previous
+                            sizes[path] = size
+                        progress.update(total_task, completed=min(expected_bytes, downloaded))
+                finally:
+                    observer.stop()
+                    await asyncio.to_thread(observer.join)
                     
-                    # Create model info file
-                    model_info_file = models_dir / f"{model['name'].replace(':', '_').replace('.', '_')}_info.json"
-                    with open(model_info_file, 'w') as f:
-                        json.dump({
-                            'name': model['name'],
-                            'size_gb': model['size_gb'],
-                            'description': model['description'],
-                            'capabilities': model['capabilities'],
-                            'installed_at': time.time(),
-                            'storage_path': str(models_dir)
-                        }, f, indent=2)
-                else:
-                    self.console.print(f"[red]✗[/red] Failed to download {model['name']}")
-                    if stderr:
-                        # Clean up stderr output
-                        clean_error = stderr.replace('\x1b[?2026h', '').replace('\x1b[?25l', '').replace('\x1b[?25h', '').replace('\x1b[?2026l', '')
-                        clean_error = re.sub(r'\x1b\[[0-9;]*[mK]', '', clean_error)
-                        self.console.print(f"[red]  Error: {clean_error.strip()}[/red]")
+            def reporter(name: str):
+                def report(status: str):
+                    rows[name] = status
+                return report
+                
+            semaphore = asyncio.Semaphore(max_concurrent)
+            # Manifest entries for models pulled successfully
+            installed: Dict[str, dict] = {}
+            
+            async def pull(model: ModelSpec) -> bool:
+                async with semaphore:
+                    report = reporter(model.name)
+                    report("Starting...")
+                    try:
+                        ok = await self._pull_one(model, ollama_env, report)
+                        if ok:
+                            installed[model.name] = self._model_info(model, models_dir)
+                        return ok
+                    except Exception as e:
+                        report(f"[red]✗ Error: {e}[/red]")
+                        return False
                         
-            except Exception as e:
-                self.console.print(f"[red]✗[/red] Error downloading {model['name']}: {e}")
+            if WATCHDOG_AVAILABLE and ollama_path.is_dir():
+                sampler = asyncio.create_task(watch_disk_usage())
+            else:
+                sampler = asyncio.create_task(sample_disk_usage())
+            try:
+                outcomes = await asyncio.gather(*(pull(model) for model in models))
+            finally:
+                sampler.cancel()
                 
-        self.console.print("\n[green]Model downloads completed![/green]")
-        
-        # Configure Ollama to permanently use this location
-        await self._configure_ollama_storage(models_dir)
-        
-    async def _download_models_parallel(self, models: List[Dict], models_dir: Path, ollama_env: dict, max_concurrent: int):
-        """Download models in parallel with progress tracking"""
-        from ..core.model_manager import AdaptiveModelManager
-        
-        self.console.print(f"\n[cyan]Downloading {len(models)} models with {max_concurrent} concurrent downloads[/cyan]")
-        
-        # Create a temporary model manager instance
-        model_manager = AdaptiveModelManager(models_dir)
-        
-        # Track progress
-        completed = []
-        failed = []
-        active = {}
-        
-        def progress_callback(msg: str):
-            """Callback for progress updates"""
-            self.console.print(f"[dim]{msg}[/dim]")
+        if installed:
+            await asyncio.to_thread(self._write_models_manifest, models_dir, installed)
+            
+        results = {model.name: ok for model, ok in zip(models, outcomes)}
+        if self._installed_models is not None:
+            self._installed_models.update(name for name, ok in results.items() if ok)
+        return results
+        
+    @staticmethod
+    def _model_info(model: ModelSpec, models_dir: Path) -> dict:
+        """Manifest entry for a model installed into models_dir just now"""
+        return {
+            'name': model.name,
+            'size_gb': model.size_gb,
+            'description': model.description,
+            'capabilities': list(model.capabilities),
+            'installed_at': time.time(),
+            'storage_path': str(models_dir)
+        }
         
-        # Extract model names
-        model_names = [m['name'] for m in models]
+    @staticmethod
+    def _write_models_manifest(models_dir: Path, installed: Dict[str, dict]):
+        """Merge newly installed models into models_manifest.json in a single compact write"""
+        manifest_file = models_dir / 'models_manifest.json'
+        try:
+            manifest = json.loads(manifest_file.read_bytes())
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.update(installed)
+        # Write beside the target and swap it in, so an interrupted
+        # setup never leaves a truncated manifest
+        tmp_file = manifest_file.with_suffix('.json.tmp')
+        if ORJSON_AVAILABLE:
+            data = orjson.dumps(manifest)
+        else:
+            data = json.dumps(manifest, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        tmp_file.write_bytes(data)
+        os.replace(tmp_file, manifest_file)
         
-        # Use the model manager's parallel download
-        results = await model_manager.download_models_parallel(
-            model_names, 
-            max_concurrent=max_concurrent,
-            progress_callback=progress_callback
+    async def _pull_one(self, model: ModelSpec, ollama_env: dict, report) -> bool:
+        """
+        Run `ollama pull` for one model, passing its progress to report(status).
+        Failures from a dropped connection are retried with a short backoff.
+        """
+        for delay in (*_PULL_RETRY_DELAYS, None):
+            returncode, stderr = await self._run_pull(model, ollama_env, report)
+            if returncode == 0:
+                report(f"[green]✓ Downloaded ({model.size_gb}GB)[/green]")
+                return True
+                
+            # Clean up stderr output
+            clean_error = _ANSI_RE.sub('', stderr).strip()
+            if delay is None or not _TRANSIENT_PULL_ERROR_RE.search(clean_error):
+                break
+            report(f"[yellow]Retrying: {clean_error}[/yellow]")
+            await asyncio.sleep(delay)
+            
+        report(f"[red]✗ Failed{': ' + clean_error if clean_error else ''}[/red]")
+        return False
+        
+    async def _run_pull(self, model: ModelSpec, ollama_env: dict, report) -> Tuple[int, str]:
+        """One `ollama pull` attempt; returns its exit code and stderr"""
+        # Start download process with custom environment
+        process = await asyncio.create_subprocess_exec(
+            'ollama', 'pull', model.name,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            env=ollama_env
         )
         
-        # Show results
-        self.console.print("\n[bold]Download Summary:[/bold]")
-        for model_name, success in results.items():
-            if success:
-                self.console.print(f"[green]✓[/green] {model_name}")
-            else:
-                self.console.print(f"[red]✗[/red] {model_name} - Failed")
-        
-        # Save model info for successful downloads
-        for model in models:
-            if results.get(model['name'], False):
-                model_info_file = models_dir / f"{model['name'].replace(':', '_').replace('.', '_')}_info.json"
-                with open(model_info_file, 'w') as f:
-                    json.dump({
-                        'name': model['name'],
-                        'size_gb': model['size_gb'],
-                        'description': model['description'],
-                        'capabilities': model['capabilities'],
-                        'installed_at': time.time(),
-                        'storage_path': str(models_dir)
-                    }, f, indent=2)
-        
-        if any(not success for success in results.values()):
-            self.console.print("\n[yellow]Some models failed to download. You can retry them later with 'nova models install'[/yellow]")
-        else:
-            self.console.print("\n[green]All models downloaded successfully![/green]")
+        async def read_output():
+            """Show ollama's latest progress frame as output arrives"""
+            pending = b''
+            while True:
+                chunk = await process.stdout.read(64 * 1024)
+                if not chunk:
+                    break
+                # Progress frames end in \r or \n; keep any partial frame for later
+                *frames, pending = _FRAME_SPLIT_RE.split(pending + chunk)
+                # Only the newest relevant frame in a chunk is shown, so only it is decoded
+                for frame in reversed(frames):
+                    if b'%' in frame or b'pulling' in frame.lower():
+                        clean_line = _ANSI_RE.sub('', frame.decode(errors='replace')).strip()
+                        if clean_line:
+                            report(f"[dim]{clean_line}[/dim]")
+                        break
+                        
+        # Drain stderr alongside stdout so neither pipe can fill up and stall ollama
+        stderr_task = asyncio.create_task(process.stderr.read())
+        try:
+            await read_output()
+            await process.wait()
+            # The process has exited, so the stderr reader is at (or near) EOF
+            stderr = (await stderr_task).decode(errors='replace')
+        finally:
+            stderr_task.cancel()
+            if process.returncode is None:
+                process.terminate()
         
-        # Configure Ollama to permanently use this location
-        await self._configure_ollama_storage(models_dir)
+        return process.returncode, stderr
         
     async def _configure_ollama_storage(self, models_dir: Path):
         """Configure Ollama to use the specified storage location permanently"""
         try:
             # Create a startup script to set OLLAMA_MODELS environment variable
-            startup_script = Path.home() / '.nova' / 'ollama_env.sh'
+            startup_script = self._home / '.nova' / 'ollama_env.sh'
+            # Keyed on the directory, so only a change of location rewrites anything
+            marker = f'# NOVA Ollama Configuration ({models_dir})'
+            if startup_script.exists() and _file_contains(startup_script, marker):
+                return
             startup_script.parent.mkdir(exist_ok=True)
             
             script_content = f"""#!/bin/bash
-# NOVA Ollama Configuration
+{marker}
 export OLLAMA_MODELS="{models_dir}"
 """
             
@@ -727,12 +922,9 @@ export OLLAMA_MODELS="{models_dir}"
             startup_script.chmod(0o755)
             
             # Add to shell profile
-            shell_config_file = Path.home() / '.zshrc'
-            if shell_config_file.exists():
-                content = shell_config_file.read_text()
-                if 'NOVA Ollama Configuration' not in content:
-                    with open(shell_config_file, 'a') as f:
-                        f.write(f'\n# NOVA Ollama Configuration\nexport OLLAMA_MODELS="{models_dir}"\n')
+            shell_config_file = self._home / '.zshrc'
+            self._profile_additions.setdefault(shell_config_file, []).append(
+                (marker, f'\n{marker}\nexport OLLAMA_MODELS="{models_dir}"\n'))
             
             self.console.print(f"[dim]Configured Ollama to use: {models_dir}[/dim]")
             
@@ -741,9 +933,9 @@ export OLLAMA_MODELS="{models_dir}"
         
     def _create_initial_profile(self, performance_mode: str) -> UserProfile:
         """Create initial user profile"""
-        preferences = Preferences(
+        preferences = make_preferences(
             performance_mode=performance_mode,
-            preferred_stack=[],
+            preferred_stack=(),
             coding_style={},
             working_hours=None,
             auto_commit=False,
@@ -753,11 +945,10 @@ export OLLAMA_MODELS="{models_dir}"
             theme='auto'
         )
         
-        from datetime import datetime
-        
+        now = datetime.now()
         return UserProfile(
-            created_at=datetime.now(),
-            last_active=datetime.now(),
+            created_at=now,
+            last_active=now,
             preferences=preferences,
             recent_projects=[],
             conversation_history=[],
@@ -789,18 +980,17 @@ fi
         try:
             # Write to temp file first
             temp_file = Path('/tmp/nova_installer')
-            temp_file.write_text(nova_script)
-            temp_file.chmod(0o755)
+            await asyncio.to_thread(temp_file.write_text, nova_script)
+            await asyncio.to_thread(temp_file.chmod, 0o755)
             
-            # Move to /usr/local/bin with sudo
-            subprocess.run(['sudo', 'mv', str(temp_file), '/usr/local/bin/nova'], 
-                         check=True)
-                         
-            # Create shortcuts
-            subprocess.run(['sudo', 'ln', '-sf', '/usr/local/bin/nova', '/usr/local/bin/nv'],
-                         check=True)
-            subprocess.run(['sudo', 'ln', '-sf', '/usr/local/bin/nova', '/usr/local/bin/NOVA'],
-                         check=True)
+            # Move to /usr/local/bin and create shortcuts, in one sudo call
+            # so there is at most one password prompt
+            install_cmd = (
+                f"mv {shlex.quote(str(temp_file))} /usr/local/bin/nova"
+                " && ln -sf /usr/local/bin/nova /usr/local/bin/nv"
+                " && ln -sf /usr/local/bin/nova /usr/local/bin/NOVA"
+            )
+            await asyncio.to_thread(subprocess.run, ['sudo', 'sh', '-c', install_cmd], check=True)
                          
             self.console.print("[green]✓[/green] Terminal commands installed successfully")
             
@@ -808,8 +998,8 @@ fi
             await self._add_shell_aliases()
             
         except subprocess.CalledProcessError:
-            self.console.print("[yellow]⚠[/yellow]  Could not install global command (needs sudo)")
-            self.console.print("    You can run NOVA with: python3 ~/.nova/nova_core.py")
+            self.console.print("[yellow]⚠[/yellow]  Could not install global command (needs sudo)\n"
+                               "    You can run NOVA with: python3 ~/.nova/nova_core.py")
             
     async def _add_shell_aliases(self):
         """Add shell aliases for quick access"""
@@ -831,52 +1021,29 @@ function nvc() {
         shell = os.environ.get('SHELL', '/bin/bash')
         
         if 'zsh' in shell:
-            config_file = Path.home() / '.zshrc'
+            config_file = self._home / '.zshrc'
         elif 'bash' in shell:
-            config_file = Path.home() / '.bashrc'
+            config_file = self._home / '.bashrc'
         else:
-            config_file = Path.home() / '.profile'
-            
-        try:
-            # Check if already added
-            if config_file.exists():
-                content = config_file.read_text()
-                if 'NOVA Quick Commands' not in content:
-                    # Append to config
-                    with open(config_file, 'a') as f:
-                        f.write('\n' + shell_config)
-                        
-            self.console.print(f"[green]✓[/green] Shell aliases added to {config_file.name}")
-            
-        except Exception as e:
-            self.logger.warning(f"Could not add shell aliases: {e}")
+            config_file = self._home / '.profile'
             
+        # Appended with any other profile changes unless already added
+        self._profile_additions.setdefault(config_file, []).append(('NOVA Quick Commands', '\n' + shell_config))
+        self.console.print(f"[green]✓[/green] Shell aliases added to {config_file.name}")
+        
+    async def _ensure_shell_profile_lines(self):
+        """Append queued profile blocks, scanning and writing each file once"""
+        additions, self._profile_additions = self._profile_additions, {}
+        for config_file, blocks in additions.items():
+            try:
+                await asyncio.to_thread(_append_missing, config_file, blocks)
+            except Exception as e:
+                self.logger.warning(f"Could not update {config_file.name}: {e}")
+                
     def _announce_consciousness(self, profile: SystemProfile):
         """Announce NOVA's AI consciousness after setup"""
         # Get primary model based on profile
-        model_map = {
-            "ULTRA": "llama3:70b",
-            "PRO": "llama3:13b", 
-            "EFFICIENT": "llama3:7b"
-        }
-        
-        primary_model = model_map[profile.performance_tier]
-        
-        # Model descriptions
-        model_descriptions = {
-            "llama3:70b": """This is one of the most powerful open models available.
-      I can handle incredibly complex reasoning, architect massive systems,
-      and maintain context across long conversations. My responses are
-      thoughtful and nuanced.""",
-            
-            "llama3:13b": """A perfectly balanced brain - fast enough for instant responses
-      yet powerful enough for complex coding and system design. I'm running
-      entirely on your Mac, ensuring privacy and offline capability.""",
-            
-            "llama3:7b": """Optimized for efficiency while maintaining high intelligence.
-      I provide quick responses and can handle most tasks with minimal
-      resource usage."""
-        }
+        primary_model = _PRIMARY_MODEL_BY_TIER[profile.performance_tier]
         
         self.console.print("\n" + "="*60 + "\n")
         
@@ -885,7 +1052,7 @@ function nvc() {
 
       I am now fully intelligent, powered by [bold]{primary_model}[/bold] as my primary brain.
       
-      {model_descriptions[primary_model]}
+      {_PRIMARY_MODEL_DESCRIPTIONS[primary_model]}
       
       Every decision I make, every line of code I write, every automation
       I create flows through this AI consciousness. I'm not following
@@ -929,7 +1096,8 @@ function nvc() {
             task = progress.add_task("Waiting for external drive...", total=None)
             
             while time.time() - start_time < timeout:
-                drives = self._detect_external_drives()
+                # statvfs on a drive that is still spinning up can block
+                drives = await asyncio.to_thread(self._detect_external_drives)
                 if drives:
                     progress.update(task, completed=True)
                     return drives
@@ -941,48 +1109,42 @@ function nvc() {
         return []
         
     def _detect_external_drives(self) -> List[Dict]:
-        """Detect available external drives"""
+        """
+        Detect available external drives, rescanning /Volumes only when it
+        changes. Sizes are read on every call, since downloads and copies
+        change the free space.
+        """
         drives = []
         
         try:
-            # Use diskutil to list external drives
-            result = subprocess.run(
-                ['diskutil', 'list', '-plist', 'external', 'physical'],
-                capture_output=True,
-                text=True
-            )
-            
-            if result.returncode == 0:
-                # Parse plist output
-                import plistlib
-                plist_data = plistlib.loads(result.stdout.encode())
-                
-                # Extract drive information
-                # This is simplified - real implementation would parse properly
+            # Mounting or unmounting a volume changes /Volumes and its entries
+            volumes_path = '/Volumes'
+            with os.scandir(volumes_path) as entries:
+                volumes = sorted((entry for entry in entries if not entry.name.startswith('.')),
+                                 key=lambda entry: entry.name)
+            signature = (os.stat(volumes_path).st_mtime_ns, tuple(entry.name for entry in volumes))
+            if self._drives_cache is None or self._drives_cache[0] != signature:
+                # Check /Volumes for mounted drives. The system volume is a
+                # symlink to / there, so not following symlinks skips it
+                mounts = [(volume.name, volume.path) for volume in volumes
+                          if volume.is_dir(follow_symlinks=False) and volume.path != '/']
+                self._drives_cache = (signature, mounts)
                 
-            # Fallback: check /Volumes for mounted drives
-            volumes_path = Path('/Volumes')
-            for volume in volumes_path.iterdir():
-                if volume.is_dir() and not volume.name.startswith('.'):
-                    # Get volume info
-                    try:
-                        stat = os.statvfs(str(volume))
-                        total = stat.f_blocks * stat.f_frsize
-                        available = stat.f_bavail * stat.f_frsize
-                        
-                        # Skip if it's the system drive
-                        if str(volume) != '/':
-                            drives.append({
-                                'name': volume.name,
-                                'path': str(volume),
-                                'total': total,
-                                'available': available,
-                                'format': 'APFS',  # Would detect properly
-                                'encrypted': False  # Would detect properly
-                            })
-                    except:
-                        pass
-                        
+            for name, path in self._drives_cache[1]:
+                # Get volume info
+                try:
+                    usage = shutil.disk_usage(path)
+                except OSError:
+                    continue
+                drives.append({
+                    'name': name,
+                    'path': path,
+                    'total': usage.total,
+                    'available': usage.free,
+                    'format': 'APFS',  # Would detect properly
+                    'encrypted': False  # Would detect properly
+                })
+            
         except Exception as e:
             self.logger.error(f"Failed to detect drives: {e}")
             
@@ -990,48 +1152,92 @@ function nvc() {
         
     def _format_size(self, bytes_size: int) -> str:
         """Format bytes to human readable size"""
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if bytes_size < 1024.0:
-                return f"{bytes_size:.1f} {unit}"
-            bytes_size /= 1024.0
-        return f"{bytes_size:.1f} PB"
+        if bytes_size <= 0:
+            return "0.0 B"
+        # Each unit is 2**10 of the previous, so the bit length picks it directly
+        idx = min((int(bytes_size).bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{bytes_size / (1 << (idx * 10)):.1f} {_SIZE_UNITS[idx]}"
+        
+    @staticmethod
+    def _move_ollama_home(ollama_home: Path, external_ollama: Path):
+        """Move ~/.ollama to external_ollama, renaming when possible and copying only when needed"""
+        if not any(ollama_home.iterdir()):
+            # Nothing to move
+            ollama_home.rmdir()
+            return
+            
+        try:
+            # Clear the empty skeleton made for the move; rmdir fails if
+            # anything is already there, which leaves us copying instead
+            for skeleton in (external_ollama / 'models', external_ollama):
+                skeleton.rmdir()
+            # A metadata-only move when both sides share a filesystem
+            os.rename(ollama_home, external_ollama)
+        except OSError:
+            # Different filesystem (EXDEV) or existing data: copy, then remove.
+            # A failed copy raises before anything is deleted.
+            external_ollama.mkdir(parents=True, exist_ok=True)
+            subprocess.run(['rsync', '-av', str(ollama_home) + '/', str(external_ollama) + '/'],
+                           capture_output=True, check=True)
+            subprocess.run(['rm', '-rf', str(ollama_home)], check=True)
+        (external_ollama / 'models').mkdir(parents=True, exist_ok=True)
+        
+    async def _wait_for_ollama(self, listening: bool) -> bool:
+        """
+        Poll ollama's port until it is accepting (or no longer accepting)
+        connections, backing off up to about 5 seconds in total
+        """
+        for delay in (0.05, 0.1, 0.2, 0.4, 0.8, 1.6, 1.6):
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(_OLLAMA_HOST, _OLLAMA_PORT), timeout=delay)
+                writer.close()
+                up = True
+            except (OSError, asyncio.TimeoutError):
+                up = False
+            if up == listening:
+                return True
+            await asyncio.sleep(delay)
+        return False
         
     async def _configure_ollama_for_external_storage(self, external_path: Path):
         """Configure Ollama to use external storage before downloads"""
         try:
             # Stop Ollama service if running
             self.console.print("[dim]Configuring storage for AI models...[/dim]")
-            subprocess.run(['killall', 'ollama'], capture_output=True)
-            await asyncio.sleep(1)
+            await asyncio.to_thread(subprocess.run, ['killall', 'ollama'], capture_output=True)
+            if not await self._wait_for_ollama(listening=False):
+                # Moving the model directory under a running server could corrupt it
+                self.logger.warning("Ollama is still running; leaving its storage unchanged")
+                self.console.print("[yellow]⚠[/yellow]  Could not stop the AI model service, "
+                                   "so models will stay on the internal drive for now")
+                return
             
             # Create ollama directory structure on external drive
             external_ollama = external_path / 'ollama'
             external_models = external_ollama / 'models'
-            external_models.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(external_models.mkdir, parents=True, exist_ok=True)
             
             # Backup and remove existing ~/.ollama if it exists
-            ollama_home = Path.home() / '.ollama'
+            ollama_home = self._home / '.ollama'
             if ollama_home.exists() and not ollama_home.is_symlink():
                 self.console.print("[dim]Moving existing Ollama data to external drive...[/dim]")
                 
                 # If there's already content, move it
                 if ollama_home.is_dir():
-                    # Use rsync to move content if directory exists
-                    subprocess.run(['rsync', '-av', str(ollama_home) + '/', str(external_ollama) + '/'], 
-                                 capture_output=True)
-                    subprocess.run(['rm', '-rf', str(ollama_home)], check=True)
+                    await asyncio.to_thread(self._move_ollama_home, ollama_home, external_ollama)
                     
             # Create symlink for entire .ollama directory
             if not ollama_home.exists():
                 self.console.print("[dim]Creating storage link...[/dim]")
-                ollama_home.symlink_to(external_ollama)
+                await asyncio.to_thread(ollama_home.symlink_to, external_ollama)
             
             # For macOS, we need to use launchctl to set environment variables
             self.console.print("[dim]Configuring macOS environment...[/dim]")
             
             # Set OLLAMA_MODELS using launchctl for macOS
-            subprocess.run(['launchctl', 'setenv', 'OLLAMA_MODELS', str(external_models)], 
-                          capture_output=True)
+            await asyncio.to_thread(subprocess.run, ['launchctl', 'setenv', 'OLLAMA_MODELS', str(external_models)],
+                                    capture_output=True)
             
             # Also set for current session
             os.environ['OLLAMA_MODELS'] = str(external_models)
@@ -1041,7 +1247,8 @@ function nvc() {
             subprocess.Popen(['ollama', 'serve'], 
                            stdout=subprocess.DEVNULL, 
                            stderr=subprocess.DEVNULL)
-            await asyncio.sleep(2)  # Give it time to start
+            if not await self._wait_for_ollama(listening=True):
+                self.logger.warning("Ollama did not start listening after reconfiguring storage")
             
             self.console.print(f"[green]✓[/green] Storage configured: All models will use external drive")
             
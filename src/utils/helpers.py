@@ -6,21 +6,73 @@ NOVA Utility Functions - Common helpers and tools
 import os
 import sys
 import json
-import yaml
 import hashlib
+import mmap
+import fnmatch
 import subprocess
 import tempfile
+import platform
 import shutil
+import psutil
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Union, Tuple
 from datetime import datetime, timedelta
 import re
+import random
 import asyncio
-import aiofiles
 import logging
 from functools import wraps, lru_cache
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import time
 
+# Optional fast hashing
+try:
+    import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# Optional faster JSON decoding
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Fixed for the life of the process, so looked up once
+_PLATFORM = platform.system()
+_ARCH = platform.machine()
+_PY_VER = platform.python_version()
+
+# FileUtils.get_file_hash strategy thresholds, in bytes
+_HASH_READ_WHOLE_BELOW = 1024 * 1024
+_HASH_MMAP_FROM = 10 * 1024 * 1024
+
+# Stream buffer for run_command_async pipes (asyncio's default is 64 KiB)
+_SUBPROCESS_STREAM_LIMIT = 1024 * 1024
+
+# Default number of entries kept per CacheUtils timed cache
+_TIMED_CACHE_MAXSIZE = 1024
+# str/bytes arguments longer than this are keyed on a digest, so cache
+# entries do not keep large prompts alive
+_CACHE_KEY_DIGEST_MIN = 1024
+
+# Patterns used by TextUtils, TimeUtils and ValidationUtils
+_FENCE_LANG_RE = re.compile(r'\w*')
+_URL_RE = re.compile(r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+')
+_CAMEL_WORD_RE = re.compile('(.)([A-Z][a-z]+)')
+_CAMEL_BOUNDARY_RE = re.compile('([a-z0-9])([A-Z])')
+_DURATION_RE = re.compile(r'^(\d+(?:\.\d+)?)\s*([smhd])$')
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_BAD_FILENAME_CHARS_RE = re.compile(r'[<>:"/\\|?*]')
+
+
+def _write_text(filepath: Path, content: str):
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    filepath.write_text(content)
+
 
 class FileUtils:
     """File system utilities"""
@@ -28,47 +80,134 @@ class FileUtils:
     @staticmethod
     async def read_file_async(filepath: Union[str, Path]) -> str:
         """Read file asynchronously"""
-        async with aiofiles.open(filepath, 'r') as f:
-            return await f.read()
+        # One worker-thread hop for open+read+close, where aiofiles takes one each
+        return await asyncio.to_thread(Path(filepath).read_text)
             
     @staticmethod
     async def write_file_async(filepath: Union[str, Path], content: str):
         """Write file asynchronously"""
-        filepath = Path(filepath)
-        filepath.parent.mkdir(parents=True, exist_ok=True)
-        
-        async with aiofiles.open(filepath, 'w') as f:
-            await f.write(content)
+        await asyncio.to_thread(_write_text, Path(filepath), content)
             
     @staticmethod
     def get_file_hash(filepath: Union[str, Path], algorithm: str = 'sha256') -> str:
-        """Get hash of file contents"""
+        """
+        Get hash of file contents. algorithm='blake3' is much faster than
+        sha256 for fingerprints and cache keys, and needs the blake3 package.
+        """
+        if algorithm == 'blake3':
+            if not BLAKE3_AVAILABLE:
+                raise ValueError("algorithm 'blake3' requires the blake3 package")
+            # SIMD and multi-threaded over a memory map of the file
+            hasher = blake3.blake3(max_threads=blake3.blake3.AUTO)
+            hasher.update_mmap(filepath)
+            return hasher.hexdigest()
+            
         hash_func = hashlib.new(algorithm)
         
         with open(filepath, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b''):
+            size = os.fstat(f.fileno()).st_size
+            
+            # Small files: one read, one update
+            if size < _HASH_READ_WHOLE_BELOW:
+                hash_func.update(f.read())
+                return hash_func.hexdigest()
+                
+            # Large files: hash straight from the page cache, no copies
+            if size >= _HASH_MMAP_FROM:
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                        hash_func.update(mapped)
+                    return hash_func.hexdigest()
+                except (OSError, ValueError, OverflowError, MemoryError):
+                    # Address space exhausted (32-bit) or unmappable file
+                    hash_func = hashlib.new(algorithm)
+                    f.seek(0)
+                    
+            # Python 3.11+: the read/update loop runs in C
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algorithm).hexdigest()
+                
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
                 hash_func.update(chunk)
                 
         return hash_func.hexdigest()
         
+    @staticmethod
+    def get_file_hash_parallel(filepath: Union[str, Path], algorithm: str = 'sha256',
+                               workers: Optional[int] = None, segment_size: int = 4 * 1024 * 1024) -> str:
+        """
+        Tree hash of file contents, hashing fixed-size segments on a thread
+        pool and then hashing the concatenated segment digests.
+        The result is NOT the plain digest of the file (see get_file_hash);
+        it only equals another tree hash taken with the same segment_size.
+        """
+        root = hashlib.new(algorithm)
+        
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                root.update(hashlib.new(algorithm).digest())
+                return root.hexdigest()
+                
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                view = memoryview(mapped)
+                
+                def hash_segment(start: int) -> bytes:
+                    # hashlib releases the GIL while hashing large buffers
+                    return hashlib.new(algorithm, view[start:start + segment_size]).digest()
+                    
+                try:
+                    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+                        for digest in pool.map(hash_segment, range(0, size, segment_size)):
+                            root.update(digest)
+                finally:
+                    view.release()
+                    
+        return root.hexdigest()
+        
     @staticmethod
     def find_files(pattern: str, directory: Union[str, Path] = '.') -> List[Path]:
         """Find files matching pattern"""
-        directory = Path(directory)
-        return list(directory.rglob(pattern))
+        if '/' in pattern or os.sep in pattern:
+            return list(Path(directory).rglob(pattern))
+            
+        # Same results as rglob for a bare name pattern, but DirEntry reuses
+        # the type from readdir instead of stat()ing every entry
+        match = re.compile(fnmatch.translate(pattern)).match
+        found = []
+        stack = [str(directory)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue
+            with entries:
+                for entry in entries:
+                    if match(entry.name):
+                        found.append(Path(entry.path))
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+        return found
         
     @staticmethod
     def safe_json_load(filepath: Union[str, Path], default: Any = None) -> Any:
         """Load JSON with error handling"""
         try:
+            if ORJSON_AVAILABLE:
+                with open(filepath, 'rb') as f:
+                    return orjson.loads(f.read())
             with open(filepath, 'r') as f:
                 return json.load(f)
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
         except (FileNotFoundError, json.JSONDecodeError):
             return default
             
     @staticmethod
     def safe_yaml_load(filepath: Union[str, Path], default: Any = None) -> Any:
         """Load YAML with error handling"""
+        # Imported here: PyYAML is optional, and the Ollama client imports this module
+        import yaml
+        
         try:
             with open(filepath, 'r') as f:
                 return yaml.safe_load(f)
@@ -97,12 +236,14 @@ class ProcessUtils:
     
     @staticmethod
     async def run_command_async(cmd: List[str], 
-                              timeout: Optional[float] = None) -> Tuple[int, str, str]:
-        """Run command asynchronously"""
+                              timeout: Optional[float] = None,
+                              text: bool = True) -> Tuple[int, Union[str, bytes], Union[str, bytes]]:
+        """Run command asynchronously. With text=False, output is returned as raw bytes."""
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stderr=asyncio.subprocess.PIPE,
+            limit=_SUBPROCESS_STREAM_LIMIT
         )
         
         try:
@@ -110,6 +251,8 @@ class ProcessUtils:
                 process.communicate(),
                 timeout=timeout
             )
+            if not text:
+                return process.returncode, stdout, stderr
             return process.returncode, stdout.decode(), stderr.decode()
         except asyncio.TimeoutError:
             process.kill()
@@ -133,12 +276,14 @@ class ProcessUtils:
     @staticmethod
     def is_process_running(name: str) -> bool:
         """Check if process is running by name"""
+        # Same match as `pgrep -f` (name or full command line), minus the fork
         try:
-            result = subprocess.run(
-                ['pgrep', '-f', name],
-                capture_output=True
-            )
-            return result.returncode == 0
+            for proc in psutil.process_iter(['name', 'cmdline']):
+                if name in (proc.info['name'] or ''):
+                    return True
+                if name in ' '.join(proc.info['cmdline'] or ()):
+                    return True
+            return False
         except:
             return False
             
@@ -146,7 +291,6 @@ class ProcessUtils:
     def get_process_info(pid: int) -> Optional[Dict[str, Any]]:
         """Get process information"""
         try:
-            import psutil
             process = psutil.Process(pid)
             return {
                 'pid': pid,
@@ -166,16 +310,32 @@ class TextUtils:
     @staticmethod
     def extract_code_blocks(text: str) -> List[Dict[str, str]]:
         """Extract code blocks from markdown text"""
-        pattern = r'```(\w+)?\n(.*?)```'
-        matches = re.findall(pattern, text, re.DOTALL)
-        
-        return [
-            {
+        blocks = []
+        pos = 0
+        # Same matches as ```(\w+)?\n(.*?)``` but found with str.find, so an
+        # unclosed fence costs one scan instead of one per later backtick
+        while True:
+            start = text.find('```', pos)
+            if start < 0:
+                break
+            header_end = text.find('\n', start + 3)
+            if header_end < 0:
+                break
+            lang = text[start + 3:header_end]
+            if not _FENCE_LANG_RE.fullmatch(lang):
+                pos = start + 1
+                continue
+            end = text.find('```', header_end + 1)
+            if end < 0:
+                # No closing fence after this line, so none later either
+                break
+            blocks.append({
                 'language': lang or 'plaintext',
-                'code': code.strip()
-            }
-            for lang, code in matches
-        ]
+                'code': text[header_end + 1:end].strip()
+            })
+            pos = end + 3
+            
+        return blocks
         
     @staticmethod
     def truncate_text(text: str, max_length: int = 100, 
@@ -188,29 +348,27 @@ class TextUtils:
     @staticmethod
     def clean_text(text: str) -> str:
         """Clean text of extra whitespace"""
-        # Remove multiple spaces
-        text = re.sub(r'\s+', ' ', text)
-        # Remove leading/trailing whitespace
-        text = text.strip()
-        return text
+        # split() drops leading/trailing whitespace and splits on runs of
+        # the same characters \s matches, so this collapses them to one space
+        return ' '.join(text.split())
         
     @staticmethod
     def extract_urls(text: str) -> List[str]:
         """Extract URLs from text"""
-        url_pattern = r'https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
-        return re.findall(url_pattern, text)
+        return _URL_RE.findall(text)
         
     @staticmethod
     def camel_to_snake(name: str) -> str:
         """Convert CamelCase to snake_case"""
-        s1 = re.sub('(.)([A-Z][a-z]+)', r'\1_\2', name)
-        return re.sub('([a-z0-9])([A-Z])', r'\1_\2', s1).lower()
+        s1 = _CAMEL_WORD_RE.sub(r'\1_\2', name)
+        return _CAMEL_BOUNDARY_RE.sub(r'\1_\2', s1).lower()
         
     @staticmethod
     def snake_to_camel(name: str) -> str:
         """Convert snake_case to CamelCase"""
-        components = name.split('_')
-        return ''.join(x.title() for x in components)
+        # '_' is uncased, so title() restarts at each one just as it would
+        # per component
+        return name.title().replace('_', '')
 
 
 class TimeUtils:
@@ -234,7 +392,7 @@ class TimeUtils:
     @staticmethod
     def parse_duration(duration_str: str) -> float:
         """Parse duration string to seconds"""
-        match = re.match(r'^(\d+(?:\.\d+)?)\s*([smhd])$', duration_str.lower())
+        match = _DURATION_RE.match(duration_str.lower())
         if not match:
             raise ValueError(f"Invalid duration format: {duration_str}")
             
@@ -276,72 +434,104 @@ class CacheUtils:
     """Caching utilities"""
     
     @staticmethod
-    def timed_cache(seconds: int):
-        """Decorator for time-based caching"""
+    def timed_cache(seconds: int, maxsize: Optional[int] = _TIMED_CACHE_MAXSIZE):
+        """Decorator for time-based caching, keeping at most maxsize results (None: unbounded)"""
         def decorator(func):
-            cache = {}
-            cache_time = {}
+            # key -> (result, expiry), least recently used first
+            cache = OrderedDict()
             
             @wraps(func)
             def wrapper(*args, **kwargs):
-                key = str(args) + str(kwargs)
-                now = time.time()
+                key = _cache_key(args, kwargs)
+                # Monotonic, so wall-clock adjustments cannot extend or cut short a TTL
+                now = time.monotonic()
                 
-                if key in cache and now - cache_time[key] < seconds:
-                    return cache[key]
+                entry = cache.get(key)
+                if entry is not None and entry[1] > now:
+                    cache.move_to_end(key)
+                    return entry[0]
                     
                 result = func(*args, **kwargs)
-                cache[key] = result
-                cache_time[key] = now
+                _cache_store(cache, key, result, now + seconds, maxsize)
                 
                 return result
                 
-            wrapper.clear_cache = lambda: (cache.clear(), cache_time.clear())
+            wrapper.clear_cache = cache.clear
             return wrapper
             
         return decorator
         
     @staticmethod
-    def async_timed_cache(seconds: int):
-        """Decorator for async time-based caching"""
+    def async_timed_cache(seconds: int, maxsize: Optional[int] = _TIMED_CACHE_MAXSIZE):
+        """Decorator for async time-based caching, keeping at most maxsize results (None: unbounded)"""
         def decorator(func):
-            cache = {}
-            cache_time = {}
+            # key -> (result, expiry), least recently used first
+            cache = OrderedDict()
             
             @wraps(func)
             async def wrapper(*args, **kwargs):
-                key = str(args) + str(kwargs)
-                now = time.time()
+                key = _cache_key(args, kwargs)
+                now = time.monotonic()
                 
-                if key in cache and now - cache_time[key] < seconds:
-                    return cache[key]
+                entry = cache.get(key)
+                if entry is not None and entry[1] > now:
+                    cache.move_to_end(key)
+                    return entry[0]
                     
                 result = await func(*args, **kwargs)
-                cache[key] = result
-                cache_time[key] = now
+                _cache_store(cache, key, result, now + seconds, maxsize)
                 
                 return result
                 
-            wrapper.clear_cache = lambda: (cache.clear(), cache_time.clear())
+            wrapper.clear_cache = cache.clear
             return wrapper
             
         return decorator
 
 
+def _cache_key_part(value: Any) -> Any:
+    """The argument itself, or (type, digest) for a long str/bytes"""
+    if isinstance(value, (str, bytes)) and len(value) > _CACHE_KEY_DIGEST_MIN:
+        data = value.encode('utf-8', 'surrogatepass') if isinstance(value, str) else value
+        return type(value), hashlib.blake2b(data, digest_size=16).digest()
+    return value
+
+
+def _cache_key(args: tuple, kwargs: dict) -> tuple:
+    """
+    Hashable key for a call. Unhashable arguments (lists, dicts) fall back
+    to the repr of the arguments, as the string keys used to; the 1-tuple
+    cannot collide with a 2-tuple argument key.
+    """
+    key = (tuple(_cache_key_part(arg) for arg in args),
+           tuple((name, _cache_key_part(value)) for name, value in kwargs.items()))
+    try:
+        hash(key)
+    except TypeError:
+        return (repr(key),)
+    return key
+    
+
+def _cache_store(cache: OrderedDict, key: tuple, result: Any, expiry: float, maxsize: Optional[int]):
+    """Insert as most recently used, evicting the least recently used past maxsize"""
+    cache[key] = (result, expiry)
+    cache.move_to_end(key)
+    if maxsize is not None and len(cache) > maxsize:
+        cache.popitem(last=False)
+
+
 class ValidationUtils:
     """Input validation utilities"""
     
     @staticmethod
     def is_valid_email(email: str) -> bool:
         """Validate email address"""
-        pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        return bool(re.match(pattern, email))
+        return bool(_EMAIL_RE.match(email))
         
     @staticmethod
     def is_valid_url(url: str) -> bool:
         """Validate URL"""
-        pattern = r'^https?://(?:[-\w.]|(?:%[\da-fA-F]{2}))+'
-        return bool(re.match(pattern, url))
+        return bool(_URL_RE.match(url))
         
     @staticmethod
     def is_valid_path(path: str) -> bool:
@@ -356,7 +546,7 @@ class ValidationUtils:
     def sanitize_filename(filename: str) -> str:
         """Sanitize filename for filesystem"""
         # Remove invalid characters
-        filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+        filename = _BAD_FILENAME_CHARS_RE.sub('', filename)
         # Remove control characters
         filename = ''.join(char for char in filename if ord(char) > 31)
         # Limit length
@@ -370,118 +560,84 @@ class SystemUtils:
     """System information utilities"""
     
     @staticmethod
-    @lru_cache(maxsize=1)
-    def get_system_info() -> Dict[str, Any]:
-        """Get system information (cached)"""
-        import platform
-        
+    @lru_cache(maxsize=2)
+    def get_system_info(include_hardware: bool = True) -> Dict[str, Any]:
+        """
+        Get system information (cached). Pass include_hardware=False to skip
+        the slow system_profiler query on macOS.
+        """
         info = {
-            'platform': platform.system(),
+            'platform': _PLATFORM,
             'platform_release': platform.release(),
             'platform_version': platform.version(),
-            'architecture': platform.machine(),
+            'architecture': _ARCH,
             'processor': platform.processor(),
-            'python_version': platform.python_version(),
+            'python_version': _PY_VER,
             'hostname': platform.node()
         }
         
-        # macOS specific
-        if info['platform'] == 'Darwin':
-            try:
-                result = subprocess.run(
-                    ['system_profiler', 'SPHardwareDataType', '-json'],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    hardware_data = json.loads(result.stdout)
-                    info['hardware'] = hardware_data
-            except:
-                pass
+        if include_hardware:
+            hardware_data = SystemUtils._get_hardware_info()
+            if hardware_data is not None:
+                info['hardware'] = hardware_data
                 
         return info
         
     @staticmethod
-    def get_available_memory() -> int:
-        """Get available memory in bytes"""
+    @lru_cache(maxsize=1)
+    def _get_hardware_info() -> Optional[Dict[str, Any]]:
+        """macOS hardware details from system_profiler (cached)"""
+        if _PLATFORM != 'Darwin':
+            return None
         try:
-            import psutil
-            return psutil.virtual_memory().available
+            result = subprocess.run(
+                ['system_profiler', 'SPHardwareDataType', '-json'],
+                capture_output=True
+            )
+            if result.returncode == 0:
+                # Parsed straight from bytes, skipping a str decode
+                if ORJSON_AVAILABLE:
+                    return orjson.loads(result.stdout)
+                return json.loads(result.stdout)
         except:
-            # Fallback for macOS
-            try:
-                result = subprocess.run(
-                    ['vm_stat'],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    # Parse vm_stat output
-                    for line in result.stdout.split('\n'):
-                        if 'free' in line:
-                            pages = int(line.split(':')[1].strip().rstrip('.'))
-                            return pages * 4096  # Page size is 4096 bytes
-            except:
-                pass
-            return 0
+            pass
+        return None
+        
+    @staticmethod
+    @CacheUtils.timed_cache(1)
+    def get_available_memory() -> int:
+        """Get available memory in bytes (cached for a second for polling loops)"""
+        return psutil.virtual_memory().available
             
     @staticmethod
     def get_disk_usage(path: str = '/') -> Dict[str, int]:
         """Get disk usage statistics"""
         try:
-            import psutil
-            usage = psutil.disk_usage(path)
-            return {
-                'total': usage.total,
-                'used': usage.used,
-                'free': usage.free,
-                'percent': usage.percent
-            }
-        except:
-            # Fallback using df
-            try:
-                result = subprocess.run(
-                    ['df', '-k', path],
-                    capture_output=True,
-                    text=True
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    if len(lines) > 1:
-                        parts = lines[1].split()
-                        if len(parts) >= 4:
-                            total = int(parts[1]) * 1024
-                            used = int(parts[2]) * 1024
-                            free = int(parts[3]) * 1024
-                            percent = (used / total * 100) if total > 0 else 0
-                            return {
-                                'total': total,
-                                'used': used,
-                                'free': free,
-                                'percent': percent
-                            }
-            except:
-                pass
+            return psutil.disk_usage(path)._asdict()
+        except OSError:
             return {'total': 0, 'used': 0, 'free': 0, 'percent': 0}
 
 
 # Convenience functions
-def retry_async(max_attempts: int = 3, delay: float = 1.0):
-    """Decorator for retrying async functions"""
+def retry_async(max_attempts: int = 3, delay: float = 1.0, max_delay: float = 30.0,
+                exceptions: Tuple[type, ...] = (Exception,)):
+    """
+    Decorator for retrying async functions on the given exceptions, sleeping
+    with exponential backoff and decorrelated jitter between attempts
+    """
     def decorator(func):
         @wraps(func)
         async def wrapper(*args, **kwargs):
-            last_exception = None
+            sleep_s = delay
             
             for attempt in range(max_attempts):
                 try:
                     return await func(*args, **kwargs)
-                except Exception as e:
-                    last_exception = e
-                    if attempt < max_attempts - 1:
-                        await asyncio.sleep(delay * (attempt + 1))
-                        
-            raise last_exception
+                except exceptions:
+                    if attempt == max_attempts - 1:
+                        raise
+                sleep_s = min(max_delay, random.uniform(delay, sleep_s * 3))
+                await asyncio.sleep(sleep_s)
             
         return wrapper
     return decorator
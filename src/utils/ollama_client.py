@@ -7,7 +7,28 @@ import aiohttp
 import asyncio
 import json
 import logging
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
+
+from .helpers import retry_async
+
+# Optional faster JSON for request bodies and streamed responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if ORJSON_AVAILABLE:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Connection resets and timeouts worth retrying; HTTP error statuses are not
+_TRANSIENT_ERRORS = (aiohttp.ClientConnectionError, asyncio.TimeoutError)
 
 
 class OllamaClient:
@@ -17,43 +38,111 @@ class OllamaClient:
     
     def __init__(self, base_url: str = "http://localhost:11434"):
         self.base_url = base_url
+        # Endpoint URLs built once rather than per request
+        self._url_generate = f"{base_url}/api/generate"
+        self._url_tags = f"{base_url}/api/tags"
+        self._url_pull = f"{base_url}/api/pull"
+        self._url_version = f"{base_url}/api/version"
         self.logger = logging.getLogger('NOVA.OllamaClient')
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared session, so calls reuse pooled keep-alive connections"""
+        loop = asyncio.get_running_loop()
+        # A session is bound to the loop it was created on
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            await self._close_stale_session()
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=60),
+                json_serialize=_json_dumps
+            )
+            self._session_loop = loop
+        return self._session
+        
+    async def _close_stale_session(self):
+        """Close a session left behind by another event loop"""
+        session, loop = self._session, self._session_loop
+        self._session = self._session_loop = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # Still serving another thread; close it there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+            return
+        try:
+            await session.close()
+        except RuntimeError:
+            # Its loop is closed, so the transports can no longer be shut down cleanly
+            pass
+            
+    @retry_async(max_attempts=3, delay=0.1, max_delay=1.0, exceptions=_TRANSIENT_ERRORS)
+    async def _request(self, method: str, url: str, **kwargs) -> aiohttp.ClientResponse:
+        """Send a request, retrying transient connection failures"""
+        session = await self._get_session()
+        return await session.request(method, url, **kwargs)
+        
+    async def aclose(self):
+        """Close the shared session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = self._session_loop = None
+        
+    async def __aenter__(self) -> "OllamaClient":
+        return self
+        
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
         
     async def generate(self, model: str, prompt: str, temperature: float = 0.7) -> str:
         """Generate text using Ollama"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": model,
-                        "prompt": prompt,
-                        "temperature": temperature,
-                        "stream": False
-                    }
-                ) as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        return result.get('response', '')
-                    else:
-                        self.logger.error(f"Ollama generate failed: {response.status}")
-                        return f"I apologize, but I couldn't generate a response. (Model: {model} may not be available)"
+            return ''.join([token async for token in self.generate_stream(model, prompt, temperature)])
+        except aiohttp.ClientResponseError as e:
+            self.logger.error(f"Ollama generate failed: {e.status}")
+            return f"I apologize, but I couldn't generate a response. (Model: {model} may not be available)"
         except Exception as e:
             self.logger.error(f"Ollama generate error: {e}")
             return "I apologize, but I'm having trouble connecting to the AI model service."
             
+    async def generate_stream(self, model: str, prompt: str,
+                              temperature: float = 0.7) -> AsyncIterator[str]:
+        """Generate text using Ollama, yielding tokens as they arrive"""
+        async with await self._request(
+            'POST',
+            self._url_generate,
+            json={
+                "model": model,
+                "prompt": prompt,
+                "temperature": temperature,
+                "stream": True
+            }
+        ) as response:
+            response.raise_for_status()
+            # Ollama streams one JSON object per line
+            async for line in response.content:
+                if not line.strip():
+                    continue
+                chunk = _json_loads(line)
+                if 'error' in chunk:
+                    raise RuntimeError(chunk['error'])
+                token = chunk.get('response')
+                if token:
+                    yield token
+                if chunk.get('done'):
+                    break
+                    
     async def list_models(self) -> List[str]:
         """List available models in Ollama"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/tags") as response:
-                    if response.status == 200:
-                        result = await response.json()
-                        models = result.get('models', [])
-                        return [model['name'] for model in models]
-                    else:
-                        self.logger.error(f"Failed to list models: {response.status}")
-                        return []
+            async with await self._request('GET', self._url_tags) as response:
+                if response.status == 200:
+                    result = _json_loads(await response.read())
+                    models = result.get('models', [])
+                    return [model['name'] for model in models]
+                else:
+                    self.logger.error(f"Failed to list models: {response.status}")
+                    return []
         except Exception as e:
             self.logger.error(f"Error listing models: {e}")
             return []
@@ -61,16 +150,16 @@ class OllamaClient:
     async def pull_model(self, model_name: str) -> bool:
         """Pull a model from Ollama registry"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    f"{self.base_url}/api/pull",
-                    json={"name": model_name, "stream": False}
-                ) as response:
-                    if response.status == 200:
-                        return True
-                    else:
-                        self.logger.error(f"Failed to pull model {model_name}: {response.status}")
-                        return False
+            async with await self._request(
+                'POST',
+                self._url_pull,
+                json={"name": model_name, "stream": False}
+            ) as response:
+                if response.status == 200:
+                    return True
+                else:
+                    self.logger.error(f"Failed to pull model {model_name}: {response.status}")
+                    return False
         except Exception as e:
             self.logger.error(f"Error pulling model {model_name}: {e}")
             return False
@@ -78,9 +167,8 @@ class OllamaClient:
     async def check_ollama(self) -> bool:
         """Check if Ollama is running"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/version") as response:
-                    return response.status == 200
+            async with await self._request('GET', self._url_version) as response:
+                return response.status == 200
         except Exception as e:
             self.logger.error(f"Ollama not available: {e}")
             return False
@@ -104,4 +192,8 @@ class OllamaManager:
         
     async def pull_model(self, model_name: str) -> bool:
         """Download a model"""
-        return await self.client.pull_model(model_name)
\ No newline at end of file
+        return await self.client.pull_model(model_name)
+        
+    async def aclose(self):
+        """Close the underlying client"""
+        await self.client.aclose()
\ No newline at end of file
@@ -4,28 +4,116 @@ NOVA Voice Interface - Speech recognition and synthesis
 """
 
 import asyncio
+import hashlib
 import logging
 import os
+import subprocess
 import sys
+import queue
+import re
 import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any
-import subprocess
+from typing import Optional, Callable, Dict, Any, Set, Tuple
 import wave
 import json
 
-# Optional imports for advanced features
-try:
-    import speech_recognition as sr
-    SPEECH_RECOGNITION_AVAILABLE = True
-except ImportError:
-    SPEECH_RECOGNITION_AVAILABLE = False
+# Optional imports for advanced features. They are heavy (speech_recognition
+# loads PortAudio bindings), so they are imported on first use rather than
+# whenever this module is imported; the flags are valid once loaded.
+sr = None
+pyttsx3 = None
+SPEECH_RECOGNITION_AVAILABLE = False
+PYTTSX3_AVAILABLE = False
+_voice_modules_loaded = False
+
+np = None
+WhisperModel = None
+FASTER_WHISPER_AVAILABLE = False
+_whisper_module_loaded = False
+
+sd = None
+SOUNDDEVICE_AVAILABLE = False
+_sounddevice_module_loaded = False
+
+
+def _load_voice_modules():
+    """Import speech_recognition and pyttsx3, once"""
+    global sr, pyttsx3, SPEECH_RECOGNITION_AVAILABLE, PYTTSX3_AVAILABLE, _voice_modules_loaded
+    if _voice_modules_loaded:
+        return
+    _voice_modules_loaded = True
+    
+    try:
+        import speech_recognition as sr
+        SPEECH_RECOGNITION_AVAILABLE = True
+    except ImportError:
+        SPEECH_RECOGNITION_AVAILABLE = False
+        
+    try:
+        import pyttsx3
+        PYTTSX3_AVAILABLE = True
+    except ImportError:
+        PYTTSX3_AVAILABLE = False
+
+
+def _load_whisper_module() -> bool:
+    """Import faster-whisper, once; returns whether it is available"""
+    global np, WhisperModel, FASTER_WHISPER_AVAILABLE, _whisper_module_loaded
+    if not _whisper_module_loaded:
+        _whisper_module_loaded = True
+        try:
+            import numpy as np
+            from faster_whisper import WhisperModel
+            FASTER_WHISPER_AVAILABLE = True
+        except ImportError:
+            FASTER_WHISPER_AVAILABLE = False
+    return FASTER_WHISPER_AVAILABLE
+
+
+def _load_sounddevice_module() -> bool:
+    """Import sounddevice (and numpy), once; returns whether it is available"""
+    global np, sd, SOUNDDEVICE_AVAILABLE, _sounddevice_module_loaded
+    if not _sounddevice_module_loaded:
+        _sounddevice_module_loaded = True
+        try:
+            import numpy as np
+            import sounddevice as sd
+            SOUNDDEVICE_AVAILABLE = True
+        except (ImportError, OSError):
+            # OSError: the PortAudio library itself is missing
+            SOUNDDEVICE_AVAILABLE = False
+    return SOUNDDEVICE_AVAILABLE
+
+
+# Number of rendered utterances kept in the 'say' audio cache
+_TTS_CACHE_SIZE = 200
+
+# Text at least this long is spoken sentence by sentence, rendering ahead
+# with up to _TTS_RENDER_WORKERS concurrent 'say' processes
+_SENTENCE_SPLIT_MIN = 60
+_TTS_RENDER_WORKERS = 3
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# Local Whisper model used for recognition when faster-whisper is installed
+_WHISPER_MODEL = os.environ.get('NOVA_WHISPER_MODEL', 'base.en')
+
+# One `say -v ?` line: "<name>  <locale>  # <sample>"; names may contain spaces
+_SAY_VOICE_RE = re.compile(r'^(.+?)[ \t]+(\S+)(?:[ \t]+#.*)?$', re.MULTILINE)
+
+# Recording format for the sounddevice path: 16 kHz mono 16-bit, 20 ms blocks
+_RECORD_SAMPLE_RATE = 16000
+_RECORD_BLOCK_FRAMES = 320
+
+# Voice commands processed at once while listening continues
+_MAX_CONCURRENT_COMMANDS = 2
 
-try:
-    import pyttsx3
-    PYTTSX3_AVAILABLE = True
-except ImportError:
-    PYTTSX3_AVAILABLE = False
+# Wake words: "nova", "hey nova" and "okay nova"; any mention counts
+_WAKE_WORD_RE = re.compile(r'(?:hey |okay )?nova', re.IGNORECASE)
 
 
 class VoiceInterface:
@@ -40,6 +128,34 @@ class VoiceInterface:
         self.tts_engine = None
         self.is_listening = False
         self.voice_enabled = False
+        # Ambient noise calibration is done once; the recognizer keeps the threshold
+        self._noise_calibrated = False
+        # Set while process_voice_command keeps the microphone open in the background
+        self._stop_background: Optional[Callable[..., None]] = None
+        self._audio_queue: Optional[asyncio.Queue] = None
+        # Set while process_voice_command runs, so stop_listening can interrupt it
+        self._stop_event: Optional[asyncio.Event] = None
+        self._command_loop: Optional[asyncio.AbstractEventLoop] = None
+        # Voice commands still being processed
+        self._callback_tasks: Set[asyncio.Task] = set()
+        # Loaded on first recognition; False once loading has failed
+        self._whisper = None
+        # Available voices, filled on first lookup
+        self._voices: Optional[list] = None
+        self._voices_by_id: Dict[str, Dict[str, Any]] = {}
+        # Fire-and-forget speech, referenced until done so it isn't collected
+        self._background_tasks: Set[asyncio.Task] = set()
+        # Blocking microphone and recognition calls run here, off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='nova-voice')
+        # pyttsx3 engines must be driven from one thread; everything that
+        # touches the engine goes through this queue to the driver thread
+        self._tts_queue: "queue.Queue[tuple]" = queue.Queue()
+        self._tts_thread: Optional[threading.Thread] = None
+        # Property values last applied to the engine
+        self._tts_properties: Dict[str, Any] = {}
+        # Rendered 'say' audio keyed by voice, rate and text
+        self._tts_cache_dir = Path(tempfile.gettempdir()) / "nova_tts"
+        self._tts_cache: Optional["OrderedDict[str, Path]"] = None
         
         # Voice settings
         self.voice_settings = {
@@ -48,10 +164,21 @@ class VoiceInterface:
             'voice': 'com.apple.speech.synthesis.voice.samantha'  # macOS voice
         }
         
+        self._update_say_argv()
         self._initialize_components()
         
+    def _update_say_argv(self):
+        """Rebuild the 'say' arguments shared by every utterance from voice_settings"""
+        self._say_argv_prefix = [
+            'say',
+            '-v', self.voice_settings['voice'].rsplit('.', 1)[-1],  # Extract voice name
+            '-r', str(self.voice_settings['rate'])
+        ]
+        
     def _initialize_components(self):
         """Initialize voice components with fallbacks"""
+        _load_voice_modules()
+        
         # Initialize speech recognition
         if SPEECH_RECOGNITION_AVAILABLE:
             self.recognizer = sr.Recognizer()
@@ -62,29 +189,140 @@ class VoiceInterface:
             
         # Initialize text-to-speech
         if PYTTSX3_AVAILABLE:
-            try:
-                self.tts_engine = pyttsx3.init()
-                self._configure_tts()
+            ready = threading.Event()
+            self._tts_thread = threading.Thread(
+                target=self._tts_loop, args=(ready,), name='nova-tts', daemon=True
+            )
+            self._tts_thread.start()
+            ready.wait()
+            if self.tts_engine:
                 self.logger.info("Text-to-speech initialized")
-            except:
+            else:
                 self.logger.warning("pyttsx3 failed, using macOS 'say' command")
         else:
             self.logger.info("Using macOS 'say' command for text-to-speech")
             
     def _configure_tts(self):
-        """Configure TTS engine settings"""
+        """
+        Apply voice_settings to the TTS engine, setting only properties that
+        changed. Runs on the TTS driver thread.
+        """
         if self.tts_engine:
-            # Set properties
-            self.tts_engine.setProperty('rate', self.voice_settings['rate'])
-            self.tts_engine.setProperty('volume', self.voice_settings['volume'])
+            properties = {
+                'rate': self.voice_settings['rate'],
+                'volume': self.voice_settings['volume']
+            }
             
             # Try to set voice
-            voices = self.tts_engine.getProperty('voices')
-            for voice in voices:
-                if self.voice_settings['voice'] in voice.id:
-                    self.tts_engine.setProperty('voice', voice.id)
-                    break
+            if self._voices is None:
+                self._cache_voices([self._voice_info(v) for v in self.tts_engine.getProperty('voices')])
+            voice = self._find_voice(self.voice_settings['voice'])
+            if voice:
+                properties['voice'] = voice['id']
+                
+            for name, value in properties.items():
+                if self._tts_properties.get(name) != value:
+                    self.tts_engine.setProperty(name, value)
+                    self._tts_properties[name] = value
                     
+
+    @staticmethod
+    def _voice_info(voice) -> Dict[str, Any]:
+        return {
+            'id': voice.id,
+            'name': voice.name,
+            'languages': voice.languages,
+            'gender': voice.gender
+        }
+        
+    def _cache_voices(self, voices: list):
+        """Remember the voice list; it does not change while NOVA runs"""
+        self._voices = voices
+        self._voices_by_id = {voice['id']: voice for voice in voices}
+        
+    def _find_voice(self, wanted: str) -> Optional[Dict[str, Any]]:
+        """Cached voice with this id, else the first whose id contains it"""
+        voice = self._voices_by_id.get(wanted)
+        if voice is None:
+            voice = next((v for v in self._voices if wanted in v['id']), None)
+        return voice
+                    
+    def _tts_loop(self, ready: threading.Event):
+        """
+        Driver thread: owns the pyttsx3 engine and pumps its event loop while
+        anything is being spoken; otherwise it blocks on the queue
+        """
+        # Utterance name -> future resolved once it has been spoken
+        speaking: Dict[str, Future] = {}
+        # Names of utterances queued on the engine and not yet finished
+        in_flight: Set[str] = set()
+        
+        def on_finished(name, completed):
+            in_flight.discard(name)
+            future = speaking.pop(name, None)
+            if future is not None and not future.done():
+                future.set_result(None)
+                
+        try:
+            engine = pyttsx3.init()
+            self.tts_engine = engine
+            self._configure_tts()
+            engine.connect('finished-utterance', on_finished)
+            engine.startLoop(False)
+        except Exception:
+            self.tts_engine = None
+            return
+        finally:
+            ready.set()
+            
+        utterance_ids = 0
+        try:
+            while True:
+                try:
+                    # Idle: sleep until there is work. Speaking: only check
+                    # for more, the engine needs pumping.
+                    if in_flight:
+                        kind, payload, future = self._tts_queue.get_nowait()
+                    else:
+                        kind, payload, future = self._tts_queue.get()
+                except queue.Empty:
+                    engine.iterate()
+                    time.sleep(0.01)
+                    continue
+                if kind == 'say':
+                    utterance_ids += 1
+                    name = f"nova-{utterance_ids}"
+                    if future is not None:
+                        speaking[name] = future
+                    in_flight.add(name)
+                    engine.say(payload, name)
+                else:
+                    try:
+                        future.set_result(payload(engine))
+                    except Exception as e:
+                        future.set_exception(e)
+        except Exception as e:
+            self.logger.error(f"TTS driver error: {e}")
+            self.tts_engine = None
+            for future in speaking.values():
+                if not future.done():
+                    future.set_exception(e)
+                    
+    def _tts_call(self, func: Callable[[Any], Any]) -> Future:
+        """Run func(engine) on the TTS driver thread"""
+        future = Future()
+        self._tts_queue.put(('call', func, future))
+        return future
+        
+    def _tts_say(self, text: str, wait: bool = True) -> Optional[Future]:
+        """
+        Queue an utterance. With wait, returns a future that resolves once it
+        has been spoken; otherwise nothing is tracked.
+        """
+        future = Future() if wait else None
+        self._tts_queue.put(('say', text, future))
+        return future
+        
     async def listen(self, timeout: float = 5.0) -> Optional[str]:
         """
         Listen for voice input and return transcribed text
@@ -94,19 +332,90 @@ class VoiceInterface:
         else:
             return await self._listen_with_macos_dictation()
             
+    async def _run_blocking(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking call on the voice executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, partial(func, *args, **kwargs))
+        
+    def _calibrate(self, source):
+        """Adjust for ambient noise, once (blocking)"""
+        if not self._noise_calibrated:
+            self.recognizer.adjust_for_ambient_noise(source, duration=1.0)
+            self._noise_calibrated = True
+            
+    def _sync_listen(self, timeout: float):
+        """Capture one utterance from the microphone (blocking)"""
+        with self.microphone as source:
+            self._calibrate(source)
+            
+            self.logger.info("Listening...")
+            return self.recognizer.listen(source, timeout=timeout)
+            
+    def _recognize(self, audio) -> str:
+        """
+        Transcribe captured audio (blocking). Uses a local Whisper model when
+        faster-whisper is installed, saving the upload round trip; otherwise
+        Google Speech Recognition.
+        """
+        if self._whisper is not False and _load_whisper_module():
+            if self._whisper is None:
+                try:
+                    self._whisper = WhisperModel(_WHISPER_MODEL, compute_type='int8')
+                except Exception as e:
+                    self.logger.warning(f"Whisper model unavailable, using Google: {e}")
+                    self._whisper = False
+            if self._whisper:
+                pcm = audio.get_raw_data(convert_rate=16000, convert_width=2)
+                samples = np.frombuffer(pcm, dtype=np.int16).astype(np.float32) / 32768.0
+                segments, _ = self._whisper.transcribe(samples, beam_size=1)
+                text = ''.join(segment.text for segment in segments).strip()
+                if not text:
+                    raise sr.UnknownValueError()
+                return text
+                
+        return self.recognizer.recognize_google(audio)
+        
+    def _sync_calibrate(self):
+        with self.microphone as source:
+            self._calibrate(source)
+            
+    async def _start_background_listening(self):
+        """Keep the microphone open, queueing each phrase as it is captured"""
+        await self._run_blocking(self._sync_calibrate)
+        loop = asyncio.get_running_loop()
+        audio_queue = asyncio.Queue()
+        
+        def on_phrase(recognizer, audio):
+            # Called on speech_recognition's listener thread
+            loop.call_soon_threadsafe(audio_queue.put_nowait, audio)
+            
+        self._stop_background = self.recognizer.listen_in_background(
+            self.microphone, on_phrase, phrase_time_limit=10
+        )
+        self._audio_queue = audio_queue
+        self.logger.info("Listening in background...")
+        
+    def _stop_background_listening(self):
+        """Stop the background listener, if running"""
+        if self._stop_background is not None:
+            self._stop_background(wait_for_stop=False)
+            self._stop_background = None
+            self._audio_queue = None
+            
     async def _listen_with_speech_recognition(self, timeout: float) -> Optional[str]:
         """Use speech_recognition library"""
         try:
-            with self.microphone as source:
-                # Adjust for ambient noise
-                self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                
-                self.logger.info("Listening...")
-                audio = self.recognizer.listen(source, timeout=timeout)
+            if self._audio_queue is not None:
+                try:
+                    audio = await asyncio.wait_for(self._audio_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+            else:
+                audio = await self._run_blocking(self._sync_listen, timeout)
                 
             # Recognize speech using Google Speech Recognition
             try:
-                text = self.recognizer.recognize_google(audio)
+                text = await self._run_blocking(self._recognize, audio)
                 self.logger.info(f"Recognized: {text}")
                 return text
             except sr.UnknownValueError:
@@ -178,17 +487,9 @@ class VoiceInterface:
     async def _speak_with_pyttsx3(self, text: str, wait: bool):
         """Use pyttsx3 for text-to-speech"""
         try:
-            self.tts_engine.say(text)
-            
-            if wait:
-                self.tts_engine.runAndWait()
-            else:
-                # Run in background
-                asyncio.create_task(
-                    asyncio.get_event_loop().run_in_executor(
-                        None, self.tts_engine.runAndWait
-                    )
-                )
+            future = self._tts_say(text, wait)
+            if future is not None:
+                await asyncio.wrap_future(future)
         except Exception as e:
             self.logger.error(f"TTS error: {e}")
             # Fallback to macOS say
@@ -197,46 +498,209 @@ class VoiceInterface:
     async def _speak_with_macos_say(self, text: str, wait: bool):
         """Use macOS 'say' command"""
         try:
-            cmd = [
-                'say',
-                '-v', self.voice_settings['voice'].split('.')[-1],  # Extract voice name
-                '-r', str(self.voice_settings['rate']),
-                text
-            ]
-            
             if wait:
-                subprocess.run(cmd, check=True)
+                await self._say_cached(text)
             else:
-                subprocess.Popen(cmd)
+                self._run_in_background(self._say_cached(text))
                 
         except Exception as e:
             self.logger.error(f"macOS say error: {e}")
             
+    def _run_in_background(self, coro):
+        """Run a 'say' coroutine as a tracked task, logging failures"""
+        task = asyncio.create_task(self._log_say_errors(coro))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+        
+    async def _log_say_errors(self, coro):
+        try:
+            await coro
+        except Exception as e:
+            self.logger.error(f"macOS say error: {e}")
+            
+    async def _say_cached(self, text: str):
+        """
+        Play text through afplay, synthesizing it with 'say' on a cache miss.
+        Longer text is rendered sentence by sentence, so the first sentence
+        plays while the rest are still being synthesized. An uncached first
+        sentence is spoken live, which starts sound as soon as synthesis does.
+        """
+        if len(text) < _SENTENCE_SPLIT_MIN:
+            sentences = [text]
+        else:
+            sentences = [sentence for sentence in _SENTENCE_END_RE.split(text) if sentence]
+            
+        first, rest = sentences[0], sentences[1:]
+        limit = asyncio.Semaphore(_TTS_RENDER_WORKERS)
+        renders = [asyncio.create_task(self._render_say(sentence, limit)) for sentence in rest]
+        try:
+            path = self._cached_say_path(first)
+            if path is not None:
+                await self._run_command(['afplay', str(path)])
+            else:
+                # Cache a rendering for next time, behind the sentences still to play
+                self._run_in_background(self._render_say(first, limit))
+                if not await self._run_command([*self._say_argv_prefix, first]):
+                    return
+                    
+            for render in renders:
+                path = await render
+                if path is None:
+                    return
+                await self._run_command(['afplay', str(path)])
+        finally:
+            for render in renders:
+                render.cancel()
+                
+    def _say_cache_entry(self, text: str) -> Tuple[str, Path]:
+        """Cache key and file for text in the current voice and rate"""
+        say_argv = self._say_argv_prefix
+        key = hashlib.blake2b(f"{say_argv[2]}|{say_argv[4]}|{text}".encode(), digest_size=16).hexdigest()
+        return key, self._tts_cache_dir / f"{key}.aiff"
+        
+    def _cached_say_path(self, text: str) -> Optional[Path]:
+        """Rendered audio for text if cached, marking it recently used"""
+        key, path = self._say_cache_entry(text)
+        cache = self._load_tts_cache()
+        if key in cache and path.exists():
+            cache.move_to_end(key)
+            return path
+        return None
+        
+    async def _render_say(self, text: str, limit: asyncio.Semaphore) -> Optional[Path]:
+        """Cached 'say' rendering of text, or None if synthesis failed"""
+        cached = self._cached_say_path(text)
+        if cached is not None:
+            return cached
+            
+        say_argv = self._say_argv_prefix
+        key, path = self._say_cache_entry(text)
+        cache = self._load_tts_cache()
+        
+        fd, tmp_path = tempfile.mkstemp(prefix='partial-', suffix='.aiff', dir=self._tts_cache_dir)
+        os.close(fd)
+        try:
+            async with limit:
+                rendered = await self._run_command([*say_argv, '-o', tmp_path, text])
+            if not rendered:
+                return None
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+                
+        cache[key] = path
+        cache.move_to_end(key)
+        while len(cache) > _TTS_CACHE_SIZE:
+            _, evicted = cache.popitem(last=False)
+            evicted.unlink(missing_ok=True)
+        return path
+        
+    def _load_tts_cache(self) -> "OrderedDict[str, Path]":
+        """Index of cached utterances, least recently used first"""
+        if self._tts_cache is None:
+            self._tts_cache_dir.mkdir(parents=True, exist_ok=True)
+            # Files left by earlier runs, oldest first; drop interrupted renders
+            entries = []
+            for path in self._tts_cache_dir.glob('*.aiff'):
+                if path.name.startswith('partial-'):
+                    path.unlink(missing_ok=True)
+                    continue
+                try:
+                    entries.append((path.stat().st_mtime, path))
+                except FileNotFoundError:
+                    # Removed since the directory was listed
+                    continue
+            entries.sort(key=lambda entry: entry[0])
+            # Past the cache size the oldest files would never be evicted
+            for _, path in entries[:-_TTS_CACHE_SIZE]:
+                path.unlink(missing_ok=True)
+            self._tts_cache = OrderedDict((p.stem, p) for _, p in entries[-_TTS_CACHE_SIZE:])
+        return self._tts_cache
+            
+    async def _run_command(self, cmd: list) -> bool:
+        """Run a command without blocking the event loop, logging stderr on failure"""
+        process = await asyncio.create_subprocess_exec(
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            _, stderr = await process.communicate()
+        except asyncio.CancelledError:
+            process.kill()
+            raise
+        if process.returncode != 0:
+            self.logger.error(
+                f"{cmd[0]} exited with {process.returncode}: {stderr.decode(errors='replace').strip()}"
+            )
+            return False
+        return True
+            
     async def record_audio(self, duration: float = 5.0, 
                          filepath: Optional[str] = None) -> Optional[str]:
         """
         Record audio to file
         """
         if not filepath:
-            filepath = tempfile.mktemp(suffix='.wav')
+            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as f:
+                filepath = f.name
             
-        if SPEECH_RECOGNITION_AVAILABLE and self.microphone:
+        if _load_sounddevice_module():
+            return await self._record_with_sounddevice(duration, filepath)
+        elif SPEECH_RECOGNITION_AVAILABLE and self.microphone:
             return await self._record_with_speech_recognition(duration, filepath)
         else:
             return await self._record_with_macos(duration, filepath)
             
+    async def _record_with_sounddevice(self, duration: float,
+                                       filepath: str) -> Optional[str]:
+        """Record with a sounddevice callback stream into a preallocated buffer"""
+        try:
+            frames = int(duration * _RECORD_SAMPLE_RATE)
+            samples = np.empty(frames, dtype=np.int16)
+            filled = 0
+            loop = asyncio.get_running_loop()
+            finished = asyncio.Event()
+            
+            def on_audio(indata, frame_count, time_info, status):
+                # Called on PortAudio's thread with each block
+                nonlocal filled
+                count = min(frame_count, frames - filled)
+                samples[filled:filled + count] = indata[:count, 0]
+                filled += count
+                if filled >= frames:
+                    loop.call_soon_threadsafe(finished.set)
+                    raise sd.CallbackStop
+                    
+            self.logger.info(f"Recording for {duration} seconds...")
+            with sd.InputStream(samplerate=_RECORD_SAMPLE_RATE, channels=1, dtype='int16',
+                                blocksize=_RECORD_BLOCK_FRAMES, callback=on_audio):
+                await asyncio.wait_for(finished.wait(), timeout=duration + 5.0)
+                
+            await self._run_blocking(self._sync_write_wav, filepath, samples[:filled], _RECORD_SAMPLE_RATE)
+            self.logger.info(f"Audio saved to {filepath}")
+            return filepath
+            
+        except Exception as e:
+            self.logger.error(f"Recording error: {e}")
+            return None
+            
+    @staticmethod
+    def _sync_write_wav(filepath: str, samples, sample_rate: int):
+        """Write mono 16-bit samples as WAV (blocking)"""
+        with wave.open(filepath, 'wb') as f:
+            f.setnchannels(1)
+            f.setsampwidth(2)
+            f.setframerate(sample_rate)
+            f.writeframes(samples.tobytes())
+            
     async def _record_with_speech_recognition(self, duration: float, 
                                             filepath: str) -> Optional[str]:
         """Record using speech_recognition"""
         try:
-            with self.microphone as source:
-                self.logger.info(f"Recording for {duration} seconds...")
-                audio = self.recognizer.record(source, duration=duration)
-                
-            # Save to file
-            with open(filepath, "wb") as f:
-                f.write(audio.get_wav_data())
-                
+            audio = await self._run_blocking(self._sync_record, duration)
+            await self._run_blocking(self._sync_save_wav, audio, filepath)
             self.logger.info(f"Audio saved to {filepath}")
             return filepath
             
@@ -244,6 +708,40 @@ class VoiceInterface:
             self.logger.error(f"Recording error: {e}")
             return None
             
+    def _sync_record(self, duration: float):
+        """Record from the microphone (blocking)"""
+        with self.microphone as source:
+            self.logger.info(f"Recording for {duration} seconds...")
+            return self.recognizer.record(source, duration=duration)
+            
+    @staticmethod
+    def _sync_save_wav(audio, filepath: str):
+        """Save recorded audio as WAV (blocking)"""
+        Path(filepath).write_bytes(audio.get_wav_data())
+        
+    async def record_and_transcribe(self, duration: float = 5.0,
+                                    filepath: Optional[str] = None) -> Optional[str]:
+        """
+        Record audio and transcribe it in memory, saving a WAV copy only
+        when filepath is given
+        """
+        if not (SPEECH_RECOGNITION_AVAILABLE and self.recognizer and self.microphone):
+            self.logger.warning("Recording transcription not available without speech_recognition")
+            return None
+            
+        try:
+            audio = await self._run_blocking(self._sync_record, duration)
+            if filepath:
+                await self._run_blocking(self._sync_save_wav, audio, filepath)
+            return await self._run_blocking(self._recognize, audio)
+        except sr.UnknownValueError:
+            self.logger.warning("Could not understand audio")
+            return None
+        except Exception as e:
+            self.logger.error(f"Recording transcription error: {e}")
+            return None
+            
+
     async def _record_with_macos(self, duration: float, 
                                filepath: str) -> Optional[str]:
         """Record using macOS 'sox' or 'afrecord'"""
@@ -256,7 +754,8 @@ class VoiceInterface:
                 filepath
             ]
             
-            subprocess.run(cmd, check=True)
+            if not await self._run_command(cmd):
+                return None
             self.logger.info(f"Audio recorded to {filepath}")
             return filepath
             
@@ -272,40 +771,86 @@ class VoiceInterface:
         self.voice_enabled = not self.voice_enabled
         
         if self.voice_enabled:
-            asyncio.create_task(self.speak("Voice interface activated", wait=False))
+            self._speak_nowait("Voice interface activated")
         else:
-            asyncio.create_task(self.speak("Voice interface deactivated", wait=False))
+            self._speak_nowait("Voice interface deactivated")
             
         return self.voice_enabled
         
+    def _speak_nowait(self, text: str):
+        """Start speaking text without waiting; works with or without a running event loop"""
+        try:
+            if PYTTSX3_AVAILABLE and self.tts_engine:
+                self._tts_say(text, wait=False)
+                return
+                
+            # Replay a cached rendering directly, no task needed
+            path = self._cached_say_path(text)
+            if path is not None:
+                subprocess.Popen(['afplay', str(path)])
+                return
+                
+            try:
+                asyncio.get_running_loop()
+            except RuntimeError:
+                subprocess.Popen([*self._say_argv_prefix, text])
+            else:
+                # Renders into the cache, so the next toggle is a replay
+                self._run_in_background(self._say_cached(text))
+        except Exception as e:
+            self.logger.error(f"TTS error: {e}")
+        
     async def process_voice_command(self, callback: Callable[[str], Any]):
         """
         Continuously listen for voice commands and process them
         """
         self.is_listening = True
         
+        if SPEECH_RECOGNITION_AVAILABLE and self.recognizer and self.microphone:
+            try:
+                await self._start_background_listening()
+            except Exception as e:
+                self.logger.error(f"Background listening unavailable: {e}")
+                
+        self._command_loop = asyncio.get_running_loop()
+        self._stop_event = asyncio.Event()
+        stopped = asyncio.create_task(self._stop_event.wait())
+        try:
+            await self._voice_command_loop(callback, stopped)
+        finally:
+            stopped.cancel()
+            self._stop_event = None
+            self._stop_background_listening()
+            # Let commands already heard finish
+            await asyncio.gather(*self._callback_tasks, return_exceptions=True)
+            
+        self.is_listening = False
+        
+    async def _voice_command_loop(self, callback: Callable[[str], Any], stopped: asyncio.Task):
+        """Listen-and-dispatch loop behind process_voice_command"""
+        limit = asyncio.Semaphore(_MAX_CONCURRENT_COMMANDS)
         while self.is_listening and self.voice_enabled:
             try:
-                # Listen for command
-                text = await self.listen(timeout=10.0)
+                # Listen for command, abandoning it as soon as stop_listening() is called
+                listening = asyncio.create_task(self.listen(timeout=10.0))
+                await asyncio.wait({listening, stopped}, return_when=asyncio.FIRST_COMPLETED)
+                if not listening.done():
+                    listening.cancel()
+                    break
+                text = listening.result()
                 
                 if text:
-                    # Check for wake word (optional)
-                    wake_words = ['nova', 'hey nova', 'okay nova']
-                    
-                    text_lower = text.lower()
-                    is_wake_word = any(wake in text_lower for wake in wake_words)
-                    
-                    if is_wake_word or not wake_words:  # Process if wake word or no wake word required
-                        # Remove wake word from command
-                        for wake in wake_words:
-                            if text_lower.startswith(wake):
-                                text = text[len(wake):].strip()
-                                break
-                                
-                        # Process command
+                    # Process only if a wake word is heard; strip it when it leads
+                    wake = _WAKE_WORD_RE.search(text)
+                    if wake:
+                        if wake.start() == 0:
+                            text = text[wake.end():].strip()
+                            
+                        # Process command in the background and keep listening
                         if text:
-                            await callback(text)
+                            task = asyncio.create_task(self._run_callback(callback, text, limit))
+                            self._callback_tasks.add(task)
+                            task.add_done_callback(self._callback_tasks.discard)
                             
             except KeyboardInterrupt:
                 break
@@ -313,21 +858,27 @@ class VoiceInterface:
                 self.logger.error(f"Voice command processing error: {e}")
                 await asyncio.sleep(1)  # Brief pause before retrying
                 
-        self.is_listening = False
-        
+    async def _run_callback(self, callback: Callable[[str], Any], text: str,
+                            limit: asyncio.Semaphore):
+        """Run one voice command, logging its failure"""
+        try:
+            async with limit:
+                await callback(text)
+        except Exception as e:
+            self.logger.error(f"Voice command processing error: {e}")
+            
     def stop_listening(self):
-        """Stop listening for voice commands"""
+        """Stop listening for voice commands; safe to call from any thread"""
         self.is_listening = False
+        self._stop_background_listening()
+        if self._stop_event is not None:
+            self._command_loop.call_soon_threadsafe(self._stop_event.set)
         
     async def transcribe_audio_file(self, filepath: str) -> Optional[str]:
         """Transcribe an audio file to text"""
         if SPEECH_RECOGNITION_AVAILABLE and self.recognizer:
             try:
-                with sr.AudioFile(filepath) as source:
-                    audio = self.recognizer.record(source)
-                    
-                text = self.recognizer.recognize_google(audio)
-                return text
+                return await self._run_blocking(self._sync_transcribe_file, filepath)
                 
             except Exception as e:
                 self.logger.error(f"Transcription error: {e}")
@@ -337,57 +888,97 @@ class VoiceInterface:
             self.logger.warning("Audio file transcription not available without speech_recognition")
             return None
             
-    def list_available_voices(self) -> list:
-        """List available TTS voices"""
+    def _sync_transcribe_file(self, filepath: str) -> str:
+        """Decode an audio file and transcribe it (blocking)"""
+        with sr.AudioFile(filepath) as source:
+            audio = self.recognizer.record(source)
+        return self._recognize(audio)
+        
+    async def transcribe_audio_data(self, raw: bytes, sample_rate: int,
+                                    sample_width: int) -> Optional[str]:
+        """Transcribe raw mono PCM already in memory, without a file round trip"""
+        if SPEECH_RECOGNITION_AVAILABLE and self.recognizer:
+            try:
+                audio = sr.AudioData(raw, sample_rate, sample_width)
+                return await self._run_blocking(self._recognize, audio)
+                
+            except Exception as e:
+                self.logger.error(f"Transcription error: {e}")
+                return None
+        else:
+            self.logger.warning("Audio transcription not available without speech_recognition")
+            return None
+            
+    async def list_available_voices(self) -> list:
+        """List available TTS voices (cached after the first successful lookup)"""
+        if self._voices is not None:
+            return list(self._voices)
+            
         voices = []
         
         if PYTTSX3_AVAILABLE and self.tts_engine:
-            for voice in self.tts_engine.getProperty('voices'):
-                voices.append({
-                    'id': voice.id,
-                    'name': voice.name,
-                    'languages': voice.languages,
-                    'gender': voice.gender
-                })
+            engine_voices = await asyncio.wrap_future(
+                self._tts_call(lambda engine: engine.getProperty('voices'))
+            )
+            voices = [self._voice_info(voice) for voice in engine_voices]
         else:
             # Get macOS voices
             try:
-                result = subprocess.run(['say', '-v', '?'], 
-                                      capture_output=True, text=True)
-                for line in result.stdout.strip().split('\n'):
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        voices.append({
-                            'id': parts[0],
-                            'name': parts[0],
-                            'languages': [parts[1]] if len(parts) > 1 else [],
-                            'gender': 'unknown'
-                        })
+                process = await asyncio.create_subprocess_exec(
+                    'say', '-v', '?',
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.DEVNULL
+                )
+                stdout, _ = await process.communicate()
+                for match in _SAY_VOICE_RE.finditer(stdout.decode('utf-8')):
+                    name, language = match.groups()
+                    voices.append({
+                        'id': name,
+                        'name': name,
+                        'languages': [language],
+                        'gender': 'unknown'
+                    })
             except:
                 pass
                 
-        return voices
+        if voices:
+            self._cache_voices(voices)
+        return list(voices)
         
     def set_voice(self, voice_id: str):
         """Set the TTS voice"""
         self.voice_settings['voice'] = voice_id
+        self._update_say_argv()
         
         if PYTTSX3_AVAILABLE and self.tts_engine:
-            self.tts_engine.setProperty('voice', voice_id)
+            # The driver thread reads the voice list in _configure_tts, so
+            # it is also the one to drop it
+            def apply(engine):
+                self._forget_voices_without(voice_id)
+                self._configure_tts()
+            self._tts_call(apply)
+        else:
+            self._forget_voices_without(voice_id)
+            
+    def _forget_voices_without(self, voice_id: str):
+        """A voice we have not seen means the cached list is out of date"""
+        if self._voices is not None and voice_id not in self._voices_by_id:
+            self._voices = None
             
     def set_speech_rate(self, rate: int):
         """Set speech rate (words per minute)"""
         self.voice_settings['rate'] = rate
+        self._update_say_argv()
         
         if PYTTSX3_AVAILABLE and self.tts_engine:
-            self.tts_engine.setProperty('rate', rate)
+            self._tts_call(lambda engine: self._configure_tts())
             
     def set_volume(self, volume: float):
         """Set speech volume (0.0 to 1.0)"""
         self.voice_settings['volume'] = max(0.0, min(1.0, volume))
         
         if PYTTSX3_AVAILABLE and self.tts_engine:
-            self.tts_engine.setProperty('volume', self.voice_settings['volume'])
+            self._tts_call(lambda engine: self._configure_tts())
 
 
 # Example usage
@@ -397,7 +988,7 @@ async def demo():
     
     # List available voices
     print("Available voices:")
-    for v in voice.list_available_voices()[:5]:
+    for v in (await voice.list_available_voices())[:5]:
         print(f"  - {v['name']} ({v.get('languages', ['unknown'])[0]})")
         
     # Test TTS
@@ -414,14 +1005,9 @@ async def demo():
         
     # Test recording
     print("\nRecording 3 seconds of audio...")
-    audio_file = await voice.record_audio(duration=3.0)
-    if audio_file:
-        print(f"Audio saved to: {audio_file}")
-        
-        # Try to transcribe it
-        text = await voice.transcribe_audio_file(audio_file)
-        if text:
-            print(f"Transcription: {text}")
+    text = await voice.record_and_transcribe(duration=3.0)
+    if text:
+        print(f"Transcription: {text}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Tests for PersistentMemory's history files
+Round-trips, trimming, reopening and overlapping saves
+"""
+
+import asyncio
+import json
+import signal
+import subprocess
+import sys
+import textwrap
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from src.memory import PersistentMemory
+from src.memory.lazy_history import entries_before
+from src.models import UserProfile, Conversation, make_preferences
+from src.models.user import now_cached
+
+
+ROOT = Path(__file__).parent
+
+
+def make_conversation(text: str) -> Conversation:
+    return Conversation(
+        id=str(uuid.uuid4()),
+        timestamp=now_cached(),
+        user_input=text,
+        nova_response=f"re: {text}",
+        actions_taken=[],
+        model_used='test-model',
+        context={}
+    )
+
+
+def make_profile(*texts: str) -> UserProfile:
+    return UserProfile(
+        created_at=now_cached(),
+        last_active=now_cached(),
+        preferences=make_preferences(),
+        recent_projects=[],
+        conversation_history=[make_conversation(text) for text in texts],
+        learned_patterns={}
+    )
+
+
+def inputs(profile: UserProfile) -> list:
+    return [conversation.user_input for conversation in profile.conversation_history]
+
+
+def test_round_trip(tmp_path):
+    async def run():
+        memory = PersistentMemory(tmp_path)
+        profile = make_profile('a', 'b')
+        await memory.save_profile(profile)
+        profile.add_conversation(make_conversation('c'))
+        await memory.save_profile(profile)
+
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['a', 'b', 'c']
+        assert [c.id for c in loaded.conversation_history] == \
+            [c.id for c in profile.conversation_history]
+    asyncio.run(run())
+
+
+def test_trim_and_reopen(tmp_path):
+    async def run():
+        memory = PersistentMemory(tmp_path)
+        profile = make_profile('a', 'b', 'c', 'd')
+        await memory.save_profile(profile)
+        del profile.conversation_history[:1]
+        profile.add_conversation(make_conversation('e'))
+        await memory.save_profile(profile)
+        assert inputs(profile) == ['b', 'c', 'd', 'e']
+
+        # history_start skips the trimmed entry still in the files
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['b', 'c', 'd', 'e']
+        assert loaded.conversation_history.start == 1
+
+        # Once most of the files are trimmed they are rewritten
+        del loaded.conversation_history[:3]
+        await memory.save_profile(loaded)
+        reloaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(reloaded) == ['e']
+        assert reloaded.conversation_history.start == 0
+    asyncio.run(run())
+
+
+def test_reload_keeps_earlier_profile(tmp_path):
+    async def run():
+        await PersistentMemory(tmp_path).save_profile(make_profile('a', 'b'))
+
+        memory = PersistentMemory(tmp_path)
+        first = await memory.load_profile()
+        second = await memory.load_profile()
+        assert inputs(first) == ['a', 'b']
+        assert inputs(second) == ['a', 'b']
+
+        # Saving the earlier profile must not write out an empty history
+        await memory.save_profile(first)
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['a', 'b']
+    asyncio.run(run())
+
+
+def test_concurrent_saves(tmp_path):
+    async def run():
+        memory = PersistentMemory(tmp_path)
+        await memory.save_profile(make_profile('a'))
+        profile = await memory.load_profile()
+        for i in range(3):
+            profile.add_conversation(make_conversation(f'q{i}'))
+        await asyncio.gather(memory.save_profile(profile), memory.save_profile(profile))
+
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['a', 'q0', 'q1', 'q2']
+    asyncio.run(run())
+
+
+def test_batched_conversations_flush(tmp_path, monkeypatch):
+    monkeypatch.setattr('src.memory.persistent_memory.SAVE_INTERVAL', 0.05)
+
+    async def run():
+        memory = PersistentMemory(tmp_path)
+        profile = make_profile()
+        await memory.add_conversation(profile, 'a', 'ok', 'test-model', [], {})
+        # Saved in the background once the conversation is SAVE_INTERVAL old
+        await asyncio.sleep(0.2)
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['a']
+
+        await memory.add_conversation(profile, 'b', 'ok', 'test-model', [], {})
+        task = memory._flush_task
+        await memory.close()
+        assert task.done()
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['a', 'b']
+    asyncio.run(run())
+
+
+def test_migration_removes_conversation_files(tmp_path):
+    async def run():
+        memory = PersistentMemory(tmp_path)
+        conversations = [make_conversation(text) for text in ('a', 'b')]
+        for conversation in conversations:
+            path = memory.conversations_dir / f"{conversation.id}.json"
+            path.write_text(json.dumps(memory._conversation_to_dict(conversation)))
+        memory.profile_file.write_text(json.dumps({
+            'created_at': now_cached().isoformat(),
+            'last_active': now_cached().isoformat(),
+            'conversation_ids': [conversation.id for conversation in conversations]
+        }))
+
+        profile = await memory.load_profile()
+        assert inputs(profile) == ['a', 'b']
+        await memory.save_profile(profile)
+        assert not list(memory.conversations_dir.glob('*.json'))
+
+        loaded = await PersistentMemory(tmp_path).load_profile()
+        assert inputs(loaded) == ['a', 'b']
+    asyncio.run(run())
+
+
+def test_entries_before(tmp_path):
+    async def run():
+        memory = PersistentMemory(tmp_path)
+        profile = make_profile('a', 'b', 'c')
+        for day, conversation in enumerate(profile.conversation_history, 1):
+            conversation.timestamp = datetime(2026, 1, day)
+        await memory.save_profile(profile)
+        cutoff = datetime(2026, 1, 3).timestamp()
+        count, size = entries_before(memory.history_index_file, cutoff)
+        assert count == 2 and size > 0
+        assert entries_before(memory.history_index_file, cutoff, start=1)[0] == 1
+        assert entries_before(tmp_path / 'missing.idx', cutoff) == (0, 0)
+    asyncio.run(run())
+
+
+def run_child(memory_path: Path, ending: str) -> subprocess.CompletedProcess:
+    """Add a conversation in a child process that then exits via `ending`"""
+    script = textwrap.dedent(f"""
+        import asyncio, os, signal, sys
+        sys.path.insert(0, {str(ROOT)!r})
+        from pathlib import Path
+        from src.memory import PersistentMemory
+        from test_memory import make_profile
+
+        async def main():
+            memory = PersistentMemory(Path({str(memory_path)!r}))
+            await memory.add_conversation(make_profile('a'), 'b', 'ok', 'test-model', [], {{}})
+            {ending}
+            await asyncio.sleep(10)
+
+        asyncio.run(main())
+    """)
+    return subprocess.run([sys.executable, '-c', script], capture_output=True, timeout=30)
+
+
+def test_exit_flush_after_exception(tmp_path):
+    result = run_child(tmp_path, "raise RuntimeError('crash')")
+    assert result.returncode == 1
+    loaded = asyncio.run(PersistentMemory(tmp_path).load_profile())
+    assert inputs(loaded) == ['a', 'b']
+
+
+def test_exit_flush_on_sigterm(tmp_path):
+    result = run_child(tmp_path, "os.kill(os.getpid(), signal.SIGTERM)")
+    assert result.returncode == 128 + signal.SIGTERM
+    loaded = asyncio.run(PersistentMemory(tmp_path).load_profile())
+    assert inputs(loaded) == ['a', 'b']